@@ -1,28 +1,52 @@
 from qtlayoutbuilder.lib import file_utils
 from qtlayoutbuilder.lib.builder import Builder
+from qtlayoutbuilder.lib.compiledlayout import CompiledLayout
+from qtlayoutbuilder.lib.inputparser import InputParser
 from qtlayoutbuilder.lib.original_file_rewriter import OriginalFileReWriter
 from qtlayoutbuilder.lib.reformatter import ReFormatter
 
 
-def build_from_file(file_path, auto_format_and_overwrite=True):
+def build_from_file(file_path, auto_format_and_overwrite=True, finder=None,
+                    weak_references=False, profiler=None,
+                    memory_report=None):
     """
     Builds a QtLayout and QtWidget hierarchy based on the input text provided
     in the input file specified.
+    When auto_format_and_overwrite is False, and a compiled file (see
+    compile_file()) that is up to date with the input file exists alongside
+    it, the build is done from the compiled file instead.
     :param file_path:  Full path of input file.
     :param auto_format_and_overwrite: Set this to False to prevent the builder
     from automatically reformatting and overwriting the input file.
+    :param finder: Optionally, a WidgetAndLayoutFinder to reuse across builds
+    for finding the objects cited with ?Type.
+    :param weak_references: See LayoutsCreatedAccessor.
+    :param profiler: Optionally, a BuildProfiler to record what each Qt class
+    costs to make and add.
+    :param memory_report: Optionally, a BuildMemoryReport to fill in with the
+    memory the build accounts for.
     :raises LayoutError:
     :return: A LayoutsCreatedAccessor object.
     """
+    if not auto_format_and_overwrite:
+        compiled = CompiledLayout.open_if_fresh(file_path)
+        if compiled is not None:
+            with compiled:
+                layouts_created = Builder.instantiate(
+                    compiled, file_path, finder, profiler, memory_report)
+            return LayoutsCreatedAccessor(layouts_created, weak_references)
     one_big_string = file_utils.get_file_contents_as_a_string(file_path)
-    layouts_created = Builder.build(one_big_string, file_path)
+    layouts_created = Builder.build(one_big_string, file_path, finder,
+                                    profiler, memory_report)
     if auto_format_and_overwrite:
         re_formatted = ReFormatter.format(one_big_string)
         OriginalFileReWriter.overwrite_original(file_path, re_formatted)
-    return LayoutsCreatedAccessor(layouts_created)
+    return LayoutsCreatedAccessor(layouts_created, weak_references)
 
 
-def build_from_multi_line_string(one_big_string, auto_format_and_write_to=''):
+def build_from_multi_line_string(one_big_string, auto_format_and_write_to='',
+                                 finder=None, weak_references=False,
+                                 profiler=None, memory_report=None):
     """
     Builds a QtLayout and QtWidget hierarchy based on the input text provided
     in the (multi-line) input string provided.
@@ -30,39 +54,134 @@ def build_from_multi_line_string(one_big_string, auto_format_and_write_to=''):
     :param auto_format_and_write_to: Set this to a non-empty file pathname to
     make the builder automatically reformat the input and write the formatted
     input to that file.
+    :param finder: Optionally, a WidgetAndLayoutFinder to reuse across builds
+    for finding the objects cited with ?Type.
+    :param weak_references: See LayoutsCreatedAccessor.
+    :param profiler: Optionally, a BuildProfiler to record what each Qt class
+    costs to make and add.
+    :param memory_report: Optionally, a BuildMemoryReport to fill in with the
+    memory the build accounts for.
     :raises LayoutError:
     :return: A LayoutsCreatedAccessor object.
     """
-    layouts_created = Builder.build(one_big_string, 'No input file used')
+    layouts_created = Builder.build(
+        one_big_string, 'No input file used', finder, profiler,
+        memory_report)
     if auto_format_and_write_to:
         re_formatted = ReFormatter.format(one_big_string)
         with open(auto_format_and_write_to, 'w') as output_file:
             output_file.write(re_formatted)
-    return LayoutsCreatedAccessor(layouts_created)
+    return LayoutsCreatedAccessor(layouts_created, weak_references)
+
+
+def compile_file(file_path):
+    """
+    Compiles the input file specified into the builder's binary format, and
+    writes the result alongside it, (with .qlb appended to its name). Ship
+    the compiled file along with the input file, and build_from_file() will
+    use it for as long as the input file is not changed.
+    :param file_path: Full path of input file.
+    :raises LayoutError: When the input file is not valid input for the
+    builder.
+    :return: The path of the compiled file.
+    """
+    one_big_string = file_utils.get_file_contents_as_a_string(file_path)
+    parsed_lines = InputParser.parse(one_big_string, file_path)
+    return CompiledLayout.compile(parsed_lines, file_path)
 
 
 class LayoutsCreatedAccessor(object):
     """
     A container for the layouts and widget hieararchies created by the builder.
     You query for any object in the built hierarchy using the at() method.
+
+    When you have finished with the hierarchy, call dispose() to destroy it,
+    or use the container as a context manager, which does so on exit:
+
+        with build_from_file(file_path) as layouts:
+            dialog = layouts.at('dialog')
+            dialog.exec_()
+
+    Normally it keeps every object in the hierarchy alive for as long as it
+    lives itself. Make it with weak_references=True if you want to keep it
+    around, but not to keep windows alive that have been closed. It then
+    holds each top level item only until you first ask for it, so you must
+    keep your own reference to those you want to keep. Asking for an object
+    that has since been destroyed raises a LayoutError that says so.
     """
 
-    def __init__(self, layouts_created):
+    def __init__(self, layouts_created, weak_references=False):
         # Provide a LayoutsCreated object.
         self._impl = layouts_created
+        if weak_references:
+            layouts_created.hold_weakly()
 
     def at(self, name):
         """
-        Find the item with the given name.
+        Find the item with the given name. The name can be preceded by those
+        of its nearest ancestors, separated by dots, like 'layout.ok_btn'.
         :param name: The name to search for.
         :raises LayoutError:
         :return: The QLayout or QWidget at that position in the hierarchy.
         """
         return self._impl.at(name)
 
+    def at_many(self, names):
+        """
+        Find the items with each of the given names, in one go.
+        :param names: The names to search for.
+        :raises LayoutError: Listing all the names that cannot be found.
+        :return: A dictionary of the QLayouts and QWidgets keyed on the names.
+        """
+        return self._impl.at_many(names)
+
+    def find(self, pattern):
+        """
+        Find the items whose names match the given glob style pattern, like
+        '*_btn'. When the pattern has dots in it, it is matched against the
+        dotted paths of the items, like 'my_page.*.ok_btn'.
+        :param pattern: The pattern to match.
+        :return: An OrderedDict of the matching QLayouts and QWidgets, keyed
+        on their names (or paths), in the order they were built.
+        """
+        return self._impl.find(pattern)
+
+    def bind_to(self, target, names=None, prefix='_'):
+        """
+        Assigns the items with the given names to attributes of the target
+        object, in one go, e.g. an item called 'ok_btn' to self._ok_btn. The
+        attribute is named after the last part of a dotted name.
+        :param target: The object to assign the attributes to.
+        :param names: The names of the items to assign. All of them if None.
+        :param prefix: Put in front of each name to make the attribute name.
+        :raises LayoutError: Listing all the names that cannot be found.
+        """
+        if names is None:
+            found = self._impl.find('*')
+        else:
+            found = self._impl.at_many(names)
+        for name, item in found.items():
+            setattr(target, prefix + name.split('.')[-1], item)
+
     def first_top_level_item(self):
         """
         Returns the first item in the build hierarchy. Created to support
         the tools/helper_gui - which cannot know what name to search for.
         """
         return self._impl.first_top_level_item()
+
+    def dispose(self):
+        """
+        Destroys the objects the builder made, (with deleteLater()), and
+        forgets all the objects in the hierarchy, so that at() can no longer
+        be used. Objects you instantiated yourself and cited with ?Type are
+        given back to the parents they were found in, rather than destroyed.
+        Calling it more than once does no harm.
+        """
+        self._impl.dispose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
@@ -0,0 +1,124 @@
+"""
+Entry points for applications that run an asyncio event loop integrated with
+Qt's (for example with qasync). Each returns a future that can be awaited,
+or combined with others using asyncio.gather().
+
+Reading and parsing the input is done in an executor (by default the loop's
+thread pool), so it neither blocks the loop nor is serialised behind other
+builds. Instantiating the Qt objects is done on the loop's own thread (which
+must be the GUI thread), in short time slices, between which the loop can
+get on with other work.
+
+The loop is only ever used via its run_in_executor(), call_soon() and
+create_future() methods, so this module does not itself need to import
+asyncio; except for loops without create_future(), (like those of trollius,
+the asyncio of Python 2), for which it makes the futures itself.
+
+Cancelling the future of a build abandons the build, and destroys what it
+has built so far.
+"""
+from qtlayoutbuilder.api.build import LayoutsCreatedAccessor
+from qtlayoutbuilder.lib import file_utils
+from qtlayoutbuilder.lib.builder import Builder
+from qtlayoutbuilder.lib.inputparser import InputParser
+
+
+def build_from_file_async(file_path, loop, executor=None,
+                          slice_milliseconds=10, finder=None):
+    """
+    Builds a QtLayout and QtWidget hierarchy based on the input text provided
+    in the input file specified. It does not reformat the input file.
+    :param file_path: Full path of input file.
+    :param loop: The asyncio event loop, which must run in the GUI thread.
+    :param executor: Where to read and parse the input. None means the loop's
+    default executor.
+    :param slice_milliseconds: How long each slice of instantiation may take
+    before control is returned to the loop.
+    :param finder: Optionally, a WidgetAndLayoutFinder to reuse across builds
+    for finding the objects cited with ?Type.
+    :return: A future, the result of which is a LayoutsCreatedAccessor object,
+    or the LayoutError that says why the build failed.
+    """
+    def read_and_parse():
+        one_big_string = file_utils.get_file_contents_as_a_string(file_path)
+        return InputParser.parse(one_big_string, file_path)
+
+    return _instantiate_when_parsed(
+        loop, loop.run_in_executor(executor, read_and_parse), file_path,
+        slice_milliseconds, finder)
+
+
+def build_from_multi_line_string_async(one_big_string, loop, executor=None,
+                                       slice_milliseconds=10, finder=None):
+    """
+    As build_from_file_async(), but taking the input text from the
+    (multi-line) input string provided.
+    :return: A future, the result of which is a LayoutsCreatedAccessor object.
+    """
+    provenance = 'No input file used'
+    return _instantiate_when_parsed(
+        loop,
+        loop.run_in_executor(
+            executor, InputParser.parse, one_big_string, provenance),
+        provenance, slice_milliseconds, finder)
+
+
+# -----------------------------------------------------------------------------
+# Private below.
+
+def _instantiate_when_parsed(loop, parse_future, provenance,
+                             slice_milliseconds, finder):
+    """
+    Returns a future for the build result. Once the given parse future is
+    done, schedules the instantiation slices one after another on the loop,
+    and finally sets the build result.
+    """
+    result = _create_future(loop)
+
+    def build_next_slice(slices):
+        if result.cancelled():
+            return  # Closed by close_if_cancelled().
+        try:
+            layouts_created, lines_done, lines_total = next(slices)
+        except Exception as e:
+            result.set_exception(e)
+            return
+        if lines_done == lines_total:
+            result.set_result(LayoutsCreatedAccessor(layouts_created))
+        else:
+            loop.call_soon(build_next_slice, slices)
+
+    def on_parsed(done_parse_future):
+        if result.cancelled():
+            return
+        try:
+            parsed_lines = done_parse_future.result()
+        except Exception as e:
+            result.set_exception(e)
+            return
+        slices = Builder.instantiate_in_slices(
+            parsed_lines, provenance, finder,
+            slice_seconds=slice_milliseconds / 1000.0)
+
+        def close_if_cancelled(done_result):
+            # Closing the slices rolls back the partial build.
+            if done_result.cancelled():
+                slices.close()
+
+        result.add_done_callback(close_if_cancelled)
+        build_next_slice(slices)
+
+    # Done callbacks are always called on the loop's thread.
+    parse_future.add_done_callback(on_parsed)
+    return result
+
+
+def _create_future(loop):
+    create_future = getattr(loop, 'create_future', None)
+    if create_future is not None:
+        return create_future()
+    try:
+        from asyncio import Future
+    except ImportError:
+        from trollius import Future
+    return Future(loop=loop)
@@ -0,0 +1,255 @@
+"""
+A pool of built hierarchies, for dialogs that are opened again and again.
+Instead of building the same hierarchy from the same input every time, you
+acquire one from the pool, and release it back to the pool when the dialog
+is closed, ready for next time.
+"""
+import os
+import weakref
+
+from PySide.QtCore import QTimer
+
+from qtlayoutbuilder.api.build import LayoutsCreatedAccessor
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib import file_utils
+from qtlayoutbuilder.lib.builder import Builder, text_setter_name
+from qtlayoutbuilder.lib.inputparser import InputParser
+from qtlayoutbuilder.lib.qtobjects import is_alive
+from qtlayoutbuilder.lib.unicode_escapes import decode_unicode_escapes
+
+
+class BuildPool(object):
+    """
+    Holds, for each input source (a file, or a multi-line string), up to
+    max_size built hierarchies that are not in use. The input from each source
+    is read and parsed only once.
+
+    When a hierarchy is released back to the pool, its top level widget is
+    hidden, and the text of every object that can have text is put back to
+    what the input says (the text in parenthesis, or nothing). Any other
+    state you change (like check boxes, or combo box selections) is not
+    reset, so set that up each time you acquire the hierarchy.
+
+    A hierarchy can only be pooled when the builder made everything in it,
+    so input with ?Type lines is refused.
+
+    The pool can be pre-warmed, in which case it builds hierarchies one at a
+    time from a zero interval QTimer, (i.e. whenever the event loop has
+    nothing else to do), until it has max_size of each one asked for.
+
+        pool = BuildPool()
+        pool.prewarm_from_file(dialog_file)
+        ...
+        layouts = pool.acquire_from_file(dialog_file)
+        layouts.at('dialog').exec_()
+        pool.release(layouts)
+    """
+
+    def __init__(self, max_size=2):
+        """
+        :param max_size: The most hierarchies to keep for each input source.
+        Those released beyond that are disposed of.
+        """
+        self._max_size = max_size
+        self._entries = {}  # _PoolEntry(s), keyed on input source.
+        # The (entry, LayoutsCreated) of each hierarchy that is out on loan,
+        # keyed weakly on its accessor, so that a hierarchy whose accessor is
+        # dropped without being released is not kept alive.
+        self._lent = weakref.WeakKeyDictionary()
+        self._timer = QTimer()
+        self._timer.setInterval(0)
+        # noinspection PyUnresolvedReferences
+        self._timer.timeout.connect(self._prewarm_one)
+
+    def acquire_from_file(self, file_path):
+        """
+        Hands out a hierarchy built from the input file specified; from the
+        pool if it has one, and otherwise newly built. A change to the file
+        discards what the pool holds for it.
+        :raises LayoutError:
+        :return: A LayoutsCreatedAccessor object.
+        """
+        return self._acquire(self._entry_for_file(file_path))
+
+    def acquire_from_multi_line_string(self, one_big_string):
+        """
+        As acquire_from_file(), but for input text provided as a (multi-line)
+        string.
+        """
+        return self._acquire(self._entry_for_string(one_big_string))
+
+    def release(self, layouts):
+        """
+        Gives a hierarchy back to the pool, once you have finished with it.
+        Do not use it after that. It is disposed of instead, if the pool for
+        its input source is full, or it was not acquired from this pool, or
+        its top level widget, or one of the objects that have text, has been
+        deleted.
+        :param layouts: A LayoutsCreatedAccessor from one of the acquire
+        methods.
+        """
+        entry, layouts_created = self._lent.pop(layouts, (None, None))
+        if entry is None or entry is not self._entries.get(entry.key) or \
+                len(entry.free) >= self._max_size or \
+                not self._reset(entry, layouts_created):
+            layouts.dispose()
+            return
+        entry.free.append(layouts_created)
+
+    def prewarm_from_file(self, file_path):
+        """
+        Starts filling the pool for the input file specified, in idle time.
+        :raises LayoutError: When the file cannot be read or parsed.
+        """
+        self._prewarm(self._entry_for_file(file_path))
+
+    def prewarm_from_multi_line_string(self, one_big_string):
+        """
+        As prewarm_from_file(), but for input text provided as a (multi-line)
+        string.
+        """
+        self._prewarm(self._entry_for_string(one_big_string))
+
+    def is_prewarming(self):
+        return self._timer.isActive()
+
+    def clear(self):
+        """
+        Disposes of all the hierarchies in the pool. (Those out on loan are
+        disposed of when they are released.)
+        """
+        self._timer.stop()
+        for entry in self._entries.values():
+            self._discard(entry)
+        self._entries = {}
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _entry_for_file(self, file_path):
+        key = os.path.abspath(file_path)
+        try:
+            mtime = os.path.getmtime(file_path)
+        except EnvironmentError:
+            mtime = None  # Reading the file will report the problem.
+        entry = self._entries.get(key)
+        if entry is not None and entry.mtime == mtime:
+            return entry
+        if entry is not None:
+            self._discard(entry)
+        one_big_string = file_utils.get_file_contents_as_a_string(file_path)
+        return self._new_entry(key, one_big_string, file_path, mtime)
+
+    def _entry_for_string(self, one_big_string):
+        entry = self._entries.get(one_big_string)
+        if entry is not None:
+            return entry
+        return self._new_entry(one_big_string, one_big_string,
+                               'No input file used', None)
+
+    def _new_entry(self, key, one_big_string, provenance, mtime):
+        parsed_lines = InputParser.parse(one_big_string, provenance)
+        for parsed_line in parsed_lines:
+            if parsed_line.type_word.startswith('?'):
+                raise LayoutError("""
+                    Input that cites existing objects with ?Type cannot be
+                    pooled, because the objects cannot be shared by more
+                    than one hierarchy. This is the first such line:
+                    <%s> (line %d of <%s>).
+                """, (parsed_line.line.strip(), parsed_line.line_number,
+                      provenance))
+        entry = _PoolEntry(key, parsed_lines, provenance, mtime)
+        self._entries[key] = entry
+        return entry
+
+    def _acquire(self, entry):
+        if entry.free:
+            layouts_created = entry.free.pop()
+        else:
+            layouts_created = self._build(entry)
+        layouts = LayoutsCreatedAccessor(layouts_created)
+        self._lent[layouts] = (entry, layouts_created)
+        return layouts
+
+    def _build(self, entry):
+        layouts_created = Builder.instantiate(entry.parsed_lines,
+                                              entry.provenance)
+        if entry.texts is None:
+            entry.texts = self._texts_to_reset(entry.parsed_lines,
+                                               layouts_created)
+        return layouts_created
+
+    @classmethod
+    def _texts_to_reset(cls, parsed_lines, layouts_created):
+        # The (node, setter name, text) for every object that can have text.
+        # Nodes correspond one to one with the parsed lines.
+        texts = []
+        for node, parsed_line in enumerate(parsed_lines):
+            setter_name = text_setter_name(
+                layouts_created.object_at(node).__class__)
+            if setter_name is None:
+                continue
+            text = u''
+            if parsed_line.parenthesised:
+                text = decode_unicode_escapes(parsed_line.parenthesised)
+            texts.append((node, setter_name, text))
+        return texts
+
+    @classmethod
+    def _reset(cls, entry, layouts_created):
+        # Returns False if the hierarchy cannot be reused, because its top
+        # level item, or one of the objects whose text is reset, has been
+        # deleted.
+        top_item = layouts_created.first_top_level_item()
+        if not is_alive(top_item):
+            return False
+        objects_to_reset = [layouts_created.object_at(node)
+                            for node, _, _ in entry.texts]
+        if not all(is_alive(obj) for obj in objects_to_reset):
+            return False
+        if hasattr(top_item, 'hide'):
+            top_item.hide()
+        for obj, (_, setter_name, text) in zip(objects_to_reset,
+                                               entry.texts):
+            getattr(obj, setter_name)(text)
+        return True
+
+    def _prewarm(self, entry):
+        entry.prewarm = True
+        self._timer.start()
+
+    def _prewarm_one(self):
+        # Builds one hierarchy, for the first entry that wants one, per
+        # timeout, so that the event loop stays responsive.
+        for entry in self._entries.values():
+            if entry.prewarm and len(entry.free) < self._max_size:
+                try:
+                    entry.free.append(self._build(entry))
+                except LayoutError:
+                    # The error is reported when the hierarchy is acquired.
+                    entry.prewarm = False
+                return
+        self._timer.stop()
+
+    @classmethod
+    def _discard(cls, entry):
+        for layouts_created in entry.free:
+            layouts_created.dispose()
+        entry.free = []
+
+
+class _PoolEntry(object):
+    """
+    What the pool knows about one input source.
+    """
+
+    def __init__(self, key, parsed_lines, provenance, mtime):
+        self.key = key
+        self.parsed_lines = parsed_lines
+        self.provenance = provenance
+        self.mtime = mtime  # Of the input file, if there is one.
+        self.free = []  # LayoutsCreated objects not in use.
+        self.prewarm = False
+        # (node, setter name, text) for each object whose text is reset on
+        # release; worked out from the first hierarchy built.
+        self.texts = None
@@ -0,0 +1,130 @@
+"""
+Entry points that build progressively, in short time slices driven by a
+QTimer, so that the Qt event loop keeps running (and for example a splash
+screen keeps animating) while a big hierarchy is built.
+"""
+from PySide.QtCore import QObject, QTimer, Signal
+
+from qtlayoutbuilder.api.build import LayoutsCreatedAccessor
+from qtlayoutbuilder.lib import file_utils
+from qtlayoutbuilder.lib.builder import Builder
+
+
+def build_progressively_from_file(file_path, slice_milliseconds=10,
+                                  finder=None):
+    """
+    Starts building a QtLayout and QtWidget hierarchy based on the input text
+    provided in the input file specified. Unlike build_from_file(), this
+    returns immediately, and the build proceeds in time slices from the Qt
+    event loop. It does not reformat the input file.
+    :param file_path: Full path of input file.
+    :param slice_milliseconds: How long each slice of building may take before
+    control is returned to the event loop.
+    :param finder: Optionally, a WidgetAndLayoutFinder to reuse across builds
+    for finding the objects cited with ?Type.
+    :raises LayoutError: (only when the file cannot be read)
+    :return: A ProgressiveBuild object.
+    """
+    one_big_string = file_utils.get_file_contents_as_a_string(file_path)
+    return ProgressiveBuild(one_big_string, file_path, slice_milliseconds,
+                            finder)
+
+
+def build_progressively_from_multi_line_string(
+        one_big_string, slice_milliseconds=10, finder=None):
+    """
+    As build_progressively_from_file(), but taking the input text from the
+    (multi-line) input string provided.
+    :return: A ProgressiveBuild object.
+    """
+    return ProgressiveBuild(one_big_string, 'No input file used',
+                            slice_milliseconds, finder)
+
+
+class ProgressiveBuild(QObject):
+    """
+    A build in progress. Connect to its signals to hear how it is getting on:
+
+    - progressed(lines_done, lines_total) is emitted after every slice
+    - finished(layouts_created_accessor) is emitted when the build is done
+    - failed(error) is emitted if the build fails; with a LayoutError, or
+      whatever other exception stopped it
+
+    The objects built so far are available from layouts() at any time, so
+    you can show the top level container as soon as it has been made, while
+    its deeper content is still filling in. Keep a reference to this object
+    until it has finished, or it will be garbage collected, and the build
+    abandoned. A build that fails or is abandoned is rolled back, (see
+    Builder.instantiate_in_slices()).
+    """
+
+    progressed = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(object)
+
+    def __init__(self, one_big_string, provenance, slice_milliseconds,
+                 finder):
+        super(ProgressiveBuild, self).__init__()
+        self._slices = Builder.build_in_slices(
+            one_big_string, provenance, finder,
+            slice_seconds=slice_milliseconds / 1000.0)
+        self._layouts_created = None
+        self._is_finished = False
+        # A zero interval timer fires whenever the event loop has nothing
+        # else to do.
+        self._timer = QTimer()
+        self._timer.setInterval(0)
+        # noinspection PyUnresolvedReferences
+        self._timer.timeout.connect(self._build_next_slice)
+        self._timer.start()
+
+    def layouts(self):
+        """
+        Provides the objects built so far; or None if the first slice has not
+        been built yet.
+        :return: A LayoutsCreatedAccessor object.
+        """
+        if self._layouts_created is None:
+            return None
+        return LayoutsCreatedAccessor(self._layouts_created)
+
+    def is_finished(self):
+        """
+        Has the build finished, (successfully or not, or been abandoned)?
+        """
+        return self._is_finished
+
+    def abandon(self):
+        """
+        Stops a build that has not finished, and destroys what it has built
+        so far. Neither finished nor failed is emitted.
+        """
+        if not self._is_finished:
+            self._stop()
+            self._layouts_created = None
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _build_next_slice(self):
+        if self._is_finished:
+            return  # A timeout that was already queued when it stopped.
+        try:
+            self._layouts_created, lines_done, lines_total = \
+                next(self._slices)
+        except Exception as e:
+            # The builder has rolled back the build already.
+            self._stop()
+            self._layouts_created = None
+            self.failed.emit(e)
+            return
+        self.progressed.emit(lines_done, lines_total)
+        if lines_done == lines_total:
+            self._stop()
+            self.finished.emit(LayoutsCreatedAccessor(self._layouts_created))
+
+    def _stop(self):
+        # Closing the slices rolls back a build that has not finished.
+        self._timer.stop()
+        self._slices.close()
+        self._is_finished = True
@@ -0,0 +1,68 @@
+"""
+Entry points that go via a Qt Designer .ui document, so that the Qt objects
+can be instantiated by QUiLoader (in C++) instead of by the builder. For big
+hierarchies this is faster. Export the builder's input to a .ui file once
+(for example as a packaging step), and then build from the .ui file at run
+time. The objects built can be queried by name in the same way as those
+made by build_from_file().
+"""
+from os import path
+
+from qtlayoutbuilder.api.build import LayoutsCreatedAccessor
+from qtlayoutbuilder.lib import file_utils
+from qtlayoutbuilder.lib.inputparser import InputParser
+from qtlayoutbuilder.lib.uiexporter import UiExporter
+from qtlayoutbuilder.lib.uiloader import UiLoader
+
+
+def export_ui_from_file(file_path, ui_path=None):
+    """
+    Converts the builder's input text in the input file specified into a .ui
+    document, and writes it to a file.
+    :param file_path: Full path of input file.
+    :param ui_path: Where to write the .ui file. Defaults to the input file's
+    path, with its extension replaced by .ui.
+    :raises LayoutError: (See UiExporter for what cannot be exported.)
+    :return: The path of the .ui file written.
+    """
+    one_big_string = file_utils.get_file_contents_as_a_string(file_path)
+    ui_document = UiExporter.export(
+        InputParser.parse(one_big_string, file_path), file_path)
+    if ui_path is None:
+        ui_path = path.splitext(file_path)[0] + '.ui'
+    with open(ui_path, 'wb') as ui_file:
+        ui_file.write(ui_document)
+    return ui_path
+
+
+def export_ui_from_multi_line_string(one_big_string):
+    """
+    As export_ui_from_file(), but taking the input text from the (multi-line)
+    input string provided, and returning the .ui document as a UTF-8 encoded
+    string.
+    """
+    provenance = 'No input file used'
+    return UiExporter.export(InputParser.parse(one_big_string, provenance),
+                             provenance)
+
+
+def build_from_ui_file(ui_path):
+    """
+    Builds the QtLayout and QtWidget hierarchy described by the .ui file
+    specified, using QUiLoader.
+    :param ui_path: Full path of the .ui file.
+    :raises LayoutError:
+    :return: A LayoutsCreatedAccessor object.
+    """
+    ui_document = file_utils.get_file_contents_as_a_string(ui_path)
+    return LayoutsCreatedAccessor(UiLoader.load(ui_document, ui_path))
+
+
+def build_from_ui_string(ui_document):
+    """
+    As build_from_ui_file(), but taking the .ui document from the string
+    provided.
+    :return: A LayoutsCreatedAccessor object.
+    """
+    return LayoutsCreatedAccessor(
+        UiLoader.load(ui_document, 'No input file used'))
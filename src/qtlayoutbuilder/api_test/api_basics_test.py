@@ -4,11 +4,15 @@ import tempfile
 from os import path
 from unittest import TestCase
 
+from PySide.QtCore import QCoreApplication, QEvent
 from PySide.QtGui import QApplication
 
 from qtlayoutbuilder.api.build import build_from_file, \
-    build_from_multi_line_string
+    build_from_multi_line_string, compile_file
+from qtlayoutbuilder.api.layouterror import LayoutError
 from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
+from qtlayoutbuilder.lib_test.test_utils import \
+    raises_layout_error_with_this_message
 
 
 class TestApiBasics(TestCase):
@@ -40,6 +44,61 @@ class TestApiBasics(TestCase):
         widget.show()
         # qApp.exec_()
 
+    def test_context_manager_disposes_of_what_was_built(self):
+        str_input = """
+            my_page         QWidget
+              layout        QVBoxLayout
+                foo         QPushButton
+        """
+        widgets_before = len(QApplication.allWidgets())
+        with build_from_multi_line_string(str_input) as layouts_created:
+            layouts_created.at('foo').show()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.assertEqual(len(QApplication.allWidgets()), widgets_before)
+
+    def test_weak_references_do_not_keep_windows_alive(self):
+        str_input = """
+            my_page         QWidget
+              layout        QVBoxLayout
+                foo         QPushButton
+        """
+        layouts_created = build_from_multi_line_string(
+            str_input, weak_references=True)
+        # Handed over, but not kept, so the window is deleted.
+        layouts_created.at('my_page')
+        self.assertRaises(LayoutError, layouts_created.at, 'foo')
+
+    def test_bind_to_assigns_attributes(self):
+        str_input = """
+            my_page         QWidget
+              layout        QVBoxLayout
+                foo         QPushButton
+                bar         QPushButton
+        """
+        layouts_created = build_from_multi_line_string(str_input)
+        target = _Target()
+        layouts_created.bind_to(target, ['layout.foo', 'bar'])
+        self.assertIs(target._foo, layouts_created.at('foo'))
+        self.assertIs(target._bar, layouts_created.at('bar'))
+        self.assertFalse(hasattr(target, '_my_page'))
+        layouts_created.bind_to(target, prefix='')
+        self.assertIs(target.my_page, layouts_created.at('my_page'))
+        self.assertIs(target.layout, layouts_created.at('layout'))
+
+    def test_error_message_when_bind_to_cannot_find_names(self):
+        str_input = """
+            my_page         QWidget
+        """
+        layouts_created = build_from_multi_line_string(str_input)
+        result = raises_layout_error_with_this_message("""
+            No paths can be found that end with these: <foo, bar>.
+            These are the paths that do exist:
+
+            my_page    QWidget
+        """, layouts_created.bind_to, _Target(), ['foo', 'my_page', 'bar'])
+        if not result:
+            self.fail()
+
     def test_build_from_file_works(self):
 
         file_path = os.path.abspath(
@@ -49,6 +108,23 @@ class TestApiBasics(TestCase):
         widget.show()
         # qApp.exec_()
 
+    def test_build_from_compiled_file_works(self):
+
+        tmp_dir = tempfile.mkdtemp()
+        file_path = path.join(tmp_dir, 'input.txt')
+        with open(file_path, 'w') as input_file:
+            input_file.write(MultilineString.shift_left("""
+                my_page         QWidget
+                  layout        QVBoxLayout
+                    foo         QPushButton(hello)
+            """))
+        compiled_path = compile_file(file_path)
+        self.assertTrue(os.path.exists(compiled_path))
+        layouts_created = build_from_file(
+            file_path, auto_format_and_overwrite=False)
+        self.assertEqual(layouts_created.at('foo').text(), 'hello')
+        shutil.rmtree(tmp_dir)
+
     def test_reformatted_file_gets_written_to_file_specified(self):
 
         tmp_dir = tempfile.mkdtemp()
@@ -71,3 +147,8 @@ class TestApiBasics(TestCase):
         """))
 
         shutil.rmtree(tmp_dir)
+
+
+class _Target(object):
+    # Takes the attributes bound to it.
+    pass
@@ -0,0 +1,91 @@
+from unittest import TestCase, skipIf
+
+from PySide.QtCore import QCoreApplication, QEvent
+from PySide.QtGui import QApplication
+
+from qtlayoutbuilder.api.build_async import \
+    build_from_multi_line_string_async
+from qtlayoutbuilder.api.layouterror import LayoutError
+
+try:
+    import asyncio
+except ImportError:
+    try:
+        import trollius as asyncio  # The asyncio of Python 2.
+    except ImportError:
+        asyncio = None
+
+
+@skipIf(asyncio is None, 'Requires asyncio or trollius')
+class TestBuildAsync(TestCase):
+    """
+    This class tests the asyncio API entry-point functions are viable. The
+    parsing and slicing they delegate to have their own tests.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Needs QApplication context.
+        super(TestBuildAsync, cls).setUpClass()
+        try:
+            QApplication([])
+        except RuntimeError:
+            pass  # Singleton already exists
+
+    def setUp(self):
+        self._loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self._loop.close()
+
+    def test_concurrent_builds_with_gather(self):
+        inputs = ["""
+            page_%d         QWidget
+              layout_%d     QVBoxLayout
+                button_%d   QPushButton(Hello)
+        """ % (i, i, i) for i in range(5)]
+        futures = [build_from_multi_line_string_async(str_input, self._loop)
+                   for str_input in inputs]
+        results = self._loop.run_until_complete(asyncio.gather(*futures))
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[3].at('button_3').text(), 'Hello')
+
+    def test_failure_is_raised_by_future(self):
+        future = build_from_multi_line_string_async("""
+            page        NoSuchThing
+        """, self._loop)
+        self.assertRaises(
+            LayoutError, self._loop.run_until_complete, future)
+
+    def test_cancelled_build_is_rolled_back(self):
+        widgets_before = self._live_widget_count()
+        str_input = 'page QWidget\n  layout QVBoxLayout\n' + ''.join(
+            '    button_%d QPushButton\n' % i for i in range(2000))
+        future = build_from_multi_line_string_async(
+            str_input, self._loop, slice_milliseconds=0)
+        # Let the parsing finish, and some slices be built.
+        for _ in range(100):
+            if self._live_widget_count() > widgets_before:
+                break
+            self._run_loop_briefly()
+        self.assertGreater(self._live_widget_count(), widgets_before)
+        future.cancel()
+        self._run_loop_briefly()
+        self.assertTrue(future.cancelled())
+        self.assertEqual(self._live_widget_count(), widgets_before)
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _run_loop_briefly(self):
+        # (Rather than with asyncio.sleep(), which hangs with some versions
+        # of trollius.)
+        wake_up = asyncio.Future(loop=self._loop)
+        self._loop.call_later(0.001, wake_up.set_result, None)
+        self._loop.run_until_complete(wake_up)
+
+    @classmethod
+    def _live_widget_count(cls):
+        # Lets the deleteLater() calls take effect first.
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        return len(QApplication.allWidgets())
@@ -0,0 +1,96 @@
+import gc
+import weakref
+from unittest import TestCase
+
+from PySide.QtCore import QCoreApplication, QEvent
+from PySide.QtGui import QApplication
+
+from qtlayoutbuilder.api.buildpool import BuildPool
+from qtlayoutbuilder.lib_test.test_utils import \
+    raises_layout_error_with_this_message
+
+_DIALOG = """
+    dialog          QWidget
+      layout        QVBoxLayout
+        title       QLabel(Hello)
+        name        QLineEdit
+"""
+
+
+class TestBuildPool(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Needs QApplication context.
+        super(TestBuildPool, cls).setUpClass()
+        try:
+            QApplication([])
+        except RuntimeError:
+            pass  # Singleton already exists
+
+    def test_released_hierarchy_is_reused_with_text_reset(self):
+        pool = BuildPool()
+        layouts = pool.acquire_from_multi_line_string(_DIALOG)
+        dialog = layouts.at('dialog')
+        layouts.at('title').setText('Goodbye')
+        layouts.at('name').setText('Fred')
+        pool.release(layouts)
+        layouts = pool.acquire_from_multi_line_string(_DIALOG)
+        self.assertIs(layouts.at('dialog'), dialog)
+        self.assertEqual(layouts.at('title').text(), 'Hello')
+        self.assertEqual(layouts.at('name').text(), '')
+
+    def test_pool_is_bounded(self):
+        pool = BuildPool(max_size=1)
+        first = pool.acquire_from_multi_line_string(_DIALOG)
+        second = pool.acquire_from_multi_line_string(_DIALOG)
+        dialog = first.at('dialog')
+        pool.release(first)
+        pool.release(second)
+        self.assertIs(pool.acquire_from_multi_line_string(_DIALOG).at(
+            'dialog'), dialog)
+        self.assertIsNot(pool.acquire_from_multi_line_string(_DIALOG).at(
+            'dialog'), dialog)
+
+    def test_prewarming_builds_in_idle_time(self):
+        pool = BuildPool(max_size=2)
+        pool.prewarm_from_multi_line_string(_DIALOG)
+        while pool.is_prewarming():
+            QApplication.processEvents()
+        first = pool.acquire_from_multi_line_string(_DIALOG)
+        second = pool.acquire_from_multi_line_string(_DIALOG)
+        third = pool.acquire_from_multi_line_string(_DIALOG)
+        self.assertEqual(len(set(id(layouts.at('dialog')) for layouts in
+                                 (first, second, third))), 3)
+
+    def test_hierarchy_with_deleted_child_is_not_reused(self):
+        pool = BuildPool()
+        layouts = pool.acquire_from_multi_line_string(_DIALOG)
+        dialog = layouts.at('dialog')
+        layouts.at('title').deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        pool.release(layouts)
+        layouts = pool.acquire_from_multi_line_string(_DIALOG)
+        self.assertIsNot(layouts.at('dialog'), dialog)
+        self.assertEqual(layouts.at('title').text(), 'Hello')
+
+    def test_hierarchy_not_released_is_not_kept_alive(self):
+        pool = BuildPool()
+        layouts = pool.acquire_from_multi_line_string(_DIALOG)
+        dialog = weakref.ref(layouts.at('dialog'))
+        del layouts
+        gc.collect()
+        self.assertIsNone(dialog())
+
+    def test_error_message_when_input_cites_existing_objects(self):
+        str_input = """
+            dialog      QWidget
+              layout    ?QVBoxLayout
+        """
+        result = raises_layout_error_with_this_message("""
+            Input that cites existing objects with ?Type cannot be
+            pooled, because the objects cannot be shared by more
+            than one hierarchy. This is the first such line:
+            <layout    ?QVBoxLayout> (line 2 of <No input file used>).
+        """, BuildPool().acquire_from_multi_line_string, str_input)
+        if not result:
+            self.fail()
@@ -0,0 +1,48 @@
+import ast
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+import qtlayoutbuilder
+
+
+class TestLazyImports(TestCase):
+    """
+    Importing the parts of the package that need no Qt (parsing, validation
+    and reformatting) should not import PySide, nor difflib. Each module is
+    imported in a fresh interpreter, because in this one they are likely
+    to have been imported already by other tests.
+    """
+
+    def test_api_build_imports_without_qt(self):
+        self.assertEqual(
+            _modules_loaded_by_importing('qtlayoutbuilder.api.build'), [])
+
+    def test_parser_and_reformatter_import_without_qt(self):
+        self.assertEqual(
+            _modules_loaded_by_importing('qtlayoutbuilder.lib.inputparser'),
+            [])
+        self.assertEqual(
+            _modules_loaded_by_importing('qtlayoutbuilder.lib.reformatter'),
+            [])
+
+
+# The modules that must not be imported eagerly.
+_DEFERRED_MODULES = ('PySide', 'PySide.QtCore', 'PySide.QtGui', 'difflib')
+
+
+def _modules_loaded_by_importing(module_name):
+    # Returns those of the deferred modules that are found in sys.modules
+    # after importing the given module.
+    program = '; '.join((
+        'import sys',
+        'import %s' % module_name,
+        'print([m for m in %r if m in sys.modules])' % (_DEFERRED_MODULES,),
+    ))
+    src_dir = os.path.dirname(os.path.dirname(qtlayoutbuilder.__file__))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [src_dir] + [p for p in [env.get('PYTHONPATH')] if p])
+    output = subprocess.check_output([sys.executable, '-c', program], env=env)
+    return ast.literal_eval(output.strip())
@@ -0,0 +1,105 @@
+from unittest import TestCase
+
+from PySide.QtCore import QCoreApplication, QEvent
+from PySide.QtGui import QApplication
+
+from qtlayoutbuilder.api.progressivebuild import \
+    build_progressively_from_multi_line_string
+from qtlayoutbuilder.lib.qtobjects import is_alive
+
+
+class _BrokenFinder(object):
+    """A finder that fails with something other than a LayoutError."""
+
+    def build_started(self):
+        pass
+
+    def find(self, particular_class, reference_name):
+        raise ValueError('The finder is broken')
+
+
+class TestProgressiveBuild(TestCase):
+    """
+    This class tests the progressive build API entry-point is viable. The
+    slicing itself has its own tests with the Builder.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Needs QApplication context.
+        super(TestProgressiveBuild, cls).setUpClass()
+        try:
+            QApplication([])
+        except RuntimeError:
+            pass  # Singleton already exists
+
+    def _run_until_finished(self, progressive_build):
+        while not progressive_build.is_finished():
+            QApplication.processEvents()
+
+    def test_progressive_build_finishes_with_accessor(self):
+        str_input = """
+            my_page         QWidget
+              layout        QVBoxLayout
+                foo         QPushButton
+                bar         QPushButton
+        """
+        results = []
+        progress = []
+        progressive_build = build_progressively_from_multi_line_string(
+            str_input, slice_milliseconds=0)
+        progressive_build.finished.connect(results.append)
+        progressive_build.progressed.connect(
+            lambda done, total: progress.append((done, total)))
+        self._run_until_finished(progressive_build)
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].at('bar') is not None)
+        self.assertEqual(progress[-1], (4, 4))
+        self.assertTrue(len(progress) > 1)
+
+    def test_progressive_build_reports_failure(self):
+        str_input = """
+            my_page         QWidget
+              layout        QVBoxLayout
+                foo         NoSuchThing
+        """
+        errors = []
+        progressive_build = build_progressively_from_multi_line_string(
+            str_input)
+        progressive_build.failed.connect(errors.append)
+        self._run_until_finished(progressive_build)
+        self.assertEqual(len(errors), 1)
+        self.assertTrue('NoSuchThing' in str(errors[0]))
+
+    def test_progressive_build_reports_other_failures_and_stops(self):
+        str_input = """
+            my_page         QWidget
+              layout        QVBoxLayout
+                foo         ?QLabel
+        """
+        errors = []
+        progressive_build = build_progressively_from_multi_line_string(
+            str_input, finder=_BrokenFinder())
+        progressive_build.failed.connect(errors.append)
+        self._run_until_finished(progressive_build)
+        # Further timeouts must not try to build any more.
+        for _ in range(3):
+            QApplication.processEvents()
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(isinstance(errors[0], ValueError))
+        self.assertTrue(progressive_build.layouts() is None)
+
+    def test_abandoned_build_is_rolled_back(self):
+        str_input = 'my_page QWidget\n  layout QVBoxLayout\n' + ''.join(
+            '    button_%d QPushButton\n' % i for i in range(1000))
+        progressive_build = build_progressively_from_multi_line_string(
+            str_input, slice_milliseconds=0)
+        while progressive_build.layouts() is None and \
+                not progressive_build.is_finished():
+            QApplication.processEvents()
+        page = progressive_build.layouts().at('my_page')
+        progressive_build.abandon()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.assertTrue(progressive_build.is_finished())
+        self.assertTrue(progressive_build.layouts() is None)
+        self.assertFalse(is_alive(page))
@@ -0,0 +1,42 @@
+from os import path
+from unittest import TestCase
+
+from PySide.QtGui import QApplication, QHBoxLayout, QLabel, QSpacerItem
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.api.uifile import build_from_ui_file, \
+    build_from_ui_string, export_ui_from_multi_line_string
+
+
+class TestUiFile(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Needs QApplication context.
+        super(TestUiFile, cls).setUpClass()
+        try:
+            QApplication([])
+        except RuntimeError:
+            pass  # Singleton already exists
+
+    def test_exported_ui_builds_the_same_hierarchy(self):
+        ui_document = export_ui_from_multi_line_string("""
+            page            QWidget
+              layout        QHBoxLayout
+                label       QLabel(hello)
+                stretch     QSpacerItem
+        """)
+        layouts_created = build_from_ui_string(ui_document)
+        self.assertEqual(layouts_created.first_top_level_item().objectName(),
+                         'page')
+        self.assertTrue(isinstance(layouts_created.at('layout'), QHBoxLayout))
+        self.assertTrue(isinstance(layouts_created.at('label'), QLabel))
+        self.assertEqual(layouts_created.at('label').text(), 'hello')
+        self.assertTrue(
+            isinstance(layouts_created.at('stretch'), QSpacerItem))
+
+    def test_error_message_when_ui_file_cannot_be_read(self):
+        ui_path = path.join(path.dirname(__file__), 'no_such_file.ui')
+        with self.assertRaises(LayoutError) as context:
+            build_from_ui_file(ui_path)
+        self.assertTrue('no_such_file.ui' in str(context.exception))
@@ -0,0 +1,37 @@
+from qtlayoutbuilder.lib.buildtransaction import BuildTransaction
+from qtlayoutbuilder.lib.childadder import ChildAdder
+from qtlayoutbuilder.lib.inputparser import extents_of_positioned_children
+from qtlayoutbuilder.lib.itemlists import ItemLists
+from qtlayoutbuilder.lib.layoutscreated import LayoutsCreated
+from qtlayoutbuilder.lib.qobjectmaker import QObjectMaker
+
+
+class BuildContext(object):
+    """
+    Holds everything that belongs to one build in progress. The Builder keeps
+    no state of its own between calls, so any number of builds can be in
+    progress at once (interleaved by the progressive and asyncio entry
+    points), and the result of each depends only on its own input. E.g. the
+    tabs added to QTabWidgets are numbered afresh for each build.
+    """
+
+    def __init__(self, parsed_lines, provenance, finder, profiler=None):
+        """
+        :param parsed_lines: The ParsedLine(s) to be built.
+        :param provenance: Where the input came from, for error messages.
+        :param finder: The WidgetAndLayoutFinder to use for finding the objects
+        cited with ?Type.
+        :param profiler: Optionally, a BuildProfiler to record what the Qt
+        objects cost to make and add.
+        """
+        self.provenance = provenance
+        # The (rows, columns) needed by each line that has positioned
+        # children, keyed on the index of the line.
+        self.extents = extents_of_positioned_children(parsed_lines)
+        # What to undo if the build fails, or is disposed of.
+        self.transaction = BuildTransaction()
+        # Populated by the build.
+        self.layouts_created = LayoutsCreated(self.transaction)
+        self.object_maker = QObjectMaker(finder, profiler)
+        self.child_adder = ChildAdder(profiler)
+        self.item_lists = ItemLists(provenance)
@@ -1,10 +1,11 @@
+from timeit import default_timer
+
 from qtlayoutbuilder.api.layouterror import LayoutError
-from qtlayoutbuilder.lib.builderassertions import BuilderAssertions
-from qtlayoutbuilder.lib.childadder import ChildAdder
-from qtlayoutbuilder.lib.layoutscreated import LayoutsCreated
-from qtlayoutbuilder.lib.line_parser import LineParser
-from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
-from qtlayoutbuilder.lib.qobjectmaker import QObjectMaker
+from qtlayoutbuilder.lib.buildcontext import BuildContext
+from qtlayoutbuilder.lib.constructionguard import ConstructionGuard
+from qtlayoutbuilder.lib.inputparser import InputParser, NO_PARENT, \
+    with_line_context
+from qtlayoutbuilder.lib.unicode_escapes import decode_unicode_escapes
 from qtlayoutbuilder.lib.widgetandlayoutfinder import WidgetAndLayoutFinder
 
 
@@ -14,107 +15,249 @@ class Builder(object):
     internal entry point to do almost everything to build the layouts - taking 
     as an argument one big string. It doesn't get involved in re-formatting 
     and overwriting the original file though. That is done by the client.
+
+    Building has two stages. The input is parsed and validated first (by the
+    InputParser), which needs no Qt. Then the Qt objects are instantiated,
+    which must be done in the GUI thread. Callers who want to do the first
+    stage elsewhere can call instantiate_in_slices() with its output.
+
+    All the state of a build in progress is held in a BuildContext, so
+    builds are independent of each other. A build that fails is rolled back
+    (see BuildTransaction), so its objects do not outlive it.
     """
     @classmethod
-    def build(cls, one_big_string, provenance):
-        # Construct the widget and layout finder helper just once and early
-        # on because its construction is expensive.
-        finder = WidgetAndLayoutFinder()
-        layouts_created = LayoutsCreated()  # Will be populated, then returned.
-        line_number = 0
-        lines = MultilineString.get_as_left_shifted_lines(one_big_string)
-        for line in lines:
-            line_number += 1
-            cls._process_line(line, finder, layouts_created, line_number,
-                              provenance)
-        BuilderAssertions.assert_layouts_created_is_not_empty(
-                layouts_created, provenance)
+    def build(cls, one_big_string, provenance, finder=None, profiler=None,
+              memory_report=None):
+        """
+        :param finder: Optionally, a WidgetAndLayoutFinder to use for resolving
+        references to existing objects. Callers that build repeatedly can
+        keep one alive and pass it in every time, to avoid re-scanning the
+        heap on every build.
+        :param profiler: Optionally, a BuildProfiler to record what each Qt
+        class costs to make and add.
+        :param memory_report: Optionally, a BuildMemoryReport to fill in with
+        the memory the build accounts for.
+        """
+        for layouts_created, _, _ in cls.build_in_slices(
+                one_big_string, provenance, finder, profiler=profiler,
+                memory_report=memory_report):
+            pass
         return layouts_created
 
+    @classmethod
+    def instantiate(cls, parsed_lines, provenance, finder=None,
+                    profiler=None, memory_report=None):
+        """
+        Does the same as build(), but from input that has already been
+        parsed. The parsed_lines can be any sequence of ParsedLine(s), for
+        example a CompiledLayout.
+        """
+        for layouts_created, _, _ in cls.instantiate_in_slices(
+                parsed_lines, provenance, finder, profiler=profiler,
+                memory_report=memory_report):
+            pass
+        return layouts_created
+
+    @classmethod
+    def build_in_slices(cls, one_big_string, provenance, finder=None,
+                        slice_seconds=None, profiler=None,
+                        memory_report=None):
+        """
+        A generator that does the same as build(), but in time slices, so that
+        the caller can service its event loop in between them. See
+        instantiate_in_slices(), which does the slicing.
+        """
+        parsed_lines = cls._parse(one_big_string, provenance, memory_report)
+        slices = cls.instantiate_in_slices(
+            parsed_lines, provenance, finder, slice_seconds, profiler,
+            memory_report)
+        try:
+            for built_so_far in slices:
+                yield built_so_far
+        finally:
+            # Passes on a close(), which abandons the build.
+            slices.close()
+
+    @classmethod
+    def instantiate_in_slices(cls, parsed_lines, provenance, finder=None,
+                              slice_seconds=None, profiler=None,
+                              memory_report=None):
+        """
+        A generator that instantiates the Qt objects described by the given
+        ParsedLine(s) (see InputParser), in time slices. Each slice processes
+        lines until slice_seconds have elapsed, and then yields
+        (layouts_created, lines_done, lines_total). The layouts_created object
+        is the one being populated, so what has been built so far can be used
+        (e.g. shown) between slices. The final slice yields the completed
+        result. When slice_seconds is None, the whole build is done in one
+        slice.
+
+        Closing the generator (with close()) before the final slice abandons
+        the build, and rolls it back, as does a failure.
+
+        This must be run in the GUI thread.
+        """
+        # The finder defers its expensive heap scan until it is first
+        # searched, so making one that goes unused costs nothing.
+        if finder is None:
+            finder = WidgetAndLayoutFinder()
+        finder.build_started()
+        context = BuildContext(parsed_lines, provenance, finder, profiler)
+        if memory_report is not None:
+            memory_report.instantiation_started()
+        lines_done = 0
+        while True:
+            try:
+                lines_done = cls._build_slice(parsed_lines, lines_done,
+                                              slice_seconds, context)
+            except Exception as e:
+                context.transaction.roll_back()
+                if memory_report is not None:
+                    memory_report.build_failed(e)
+                raise
+            if memory_report is not None and \
+                    lines_done == len(parsed_lines):
+                memory_report.instantiation_ended(
+                    context.layouts_created,
+                    context.transaction.created_qobjects())
+            try:
+                yield context.layouts_created, lines_done, len(parsed_lines)
+            except GeneratorExit:
+                if lines_done != len(parsed_lines):
+                    context.transaction.roll_back()
+                    if memory_report is not None:
+                        memory_report.build_abandoned()
+                raise
+            if lines_done == len(parsed_lines):
+                return
+
     # --------------------------------------------------------
     # Private below
 
     @classmethod
-    def _process_line(cls, line, finder, layouts_created, line_number,
-                      provenance):
+    def _parse(cls, one_big_string, provenance, memory_report):
+        if memory_report is None:
+            return InputParser.parse(one_big_string, provenance)
+        memory_report.parsing_started(one_big_string)
+        try:
+            parsed_lines = InputParser.parse(one_big_string, provenance,
+                                             memory_report)
+        except LayoutError as e:
+            memory_report.build_failed(e)
+            raise
+        memory_report.parsing_ended(parsed_lines)
+        return parsed_lines
+
+    @classmethod
+    def _build_slice(cls, parsed_lines, lines_done, slice_seconds, context):
+        """
+        Processes lines, starting after the number of lines already done,
+        until the time slice is used up or there are none left. Returns the
+        number of lines then done.
+        """
+        if slice_seconds is not None:
+            slice_ends_at = default_timer() + slice_seconds
+        # Holds off repaints and signals from the widgets until the slice is
+        # done.
+        guard = ConstructionGuard()
+        try:
+            while lines_done < len(parsed_lines):
+                parsed_line = parsed_lines[lines_done]
+                lines_done += 1
+                cls._process_line(parsed_line, context, guard)
+                if slice_seconds is not None and \
+                        default_timer() >= slice_ends_at:
+                    break
+        finally:
+            guard.release()
+        return lines_done
+
+    @classmethod
+    def _process_line(cls, parsed_line, context, guard):
         """
         This function exists only to encapsulate the process_line_internals()
         function with exception handling that adds line number and input
         context to error reporting.
         """
         try:
-            cls._process_line_internals(line, finder, layouts_created)
+            cls._process_line_internals(parsed_line, context, guard)
         except LayoutError as e:
-            # Augment the error with line number, line contents and source.
-            raise LayoutError("""
-                    %s
-                    (This line: <%s>)
-                    (Line number: %d, from %s)
-                """, (str(e), line, line_number, provenance))
+            raise with_line_context(e, parsed_line.line,
+                                    parsed_line.line_number,
+                                    context.provenance)
 
     @classmethod
-    def _process_line_internals(cls, line, finder, layouts_created):
+    def _process_line_internals(cls, parsed_line, context, guard):
         """
         The guts of the process-line logic.
         """
-        is_a_comment, is_blank, indent, name, type_string, parenthesised = \
-            LineParser.parse_line(line)
-        if is_a_comment or is_blank:
-            return
+        name = parsed_line.name
+        layouts_created = context.layouts_created
+
+        # Ask the QObjectMaker to create the new QObject. (It has the
+        # object finder, in case it needs to find it rather than make it.)
+        new_qobject = context.object_maker.make(name, parsed_line.type_word)
+        guard.suppress(new_qobject)
 
-        # Amount of indentation gives us the depth at which this line lives in
-        # parent-child hierarchy. Top level objects have depth=1.
-
-        depth = 1 + indent / 2  # Integer division.
-        BuilderAssertions.assert_have_not_skipped_a_level(
-                depth, layouts_created)
-
-        # Ask the QObjectMaker to create the new QObject, passing in the
-        # object finder, in case it needs to find it rather than make it.
-        new_qobject = QObjectMaker(finder).make(name, type_string)
-
-        # Add then object as a child to its parent if required.
-        if depth > 1:
-            parent_level = depth - 1
-            parent_object, parent_path = \
-                layouts_created.most_recently_added_at_level(
-                    parent_level)
-            ChildAdder.add(new_qobject, name, parent_object)
-            layouts_created.register_child(new_qobject, parent_path, name)
+        # Add then object as a child to its parent if required. The parser
+        # has worked out which line is the parent, and the nodes in
+        # layouts_created correspond one to one with the parsed lines.
+        parent_object = None
+        if parsed_line.parent != NO_PARENT:
+            parent_object = layouts_created.object_at(parsed_line.parent)
+        if parsed_line.type_word.startswith('?'):
+            context.transaction.found(new_qobject)
+        else:
+            context.transaction.created(new_qobject, parent_object)
+        if parent_object is not None:
+            context.child_adder.add(new_qobject, name, parent_object,
+                                    parsed_line.position)
+            node = layouts_created.register_child(
+                new_qobject, parsed_line.parent, name)
         else:  # A top-level object.
-            layouts_created.register_top_level_object(new_qobject, name)
+            node = layouts_created.register_top_level_object(new_qobject, name)
 
-        # Finish up by processing any text present in the line in parenthesis.
-        cls._process_parenthesised_text(parenthesised, new_qobject)
+        # Lines are registered in order, so the node is the line's index.
+        if node in context.extents:
+            rows, columns = context.extents[node]
+            context.child_adder.reserve(new_qobject, rows, columns)
+
+        # Finish up by processing any text present in the line in parenthesis,
+        # and any item list in curly braces.
+        cls._process_parenthesised_text(parsed_line.parenthesised, new_qobject)
+        if parsed_line.items is not None:
+            context.item_lists.apply(parsed_line.items, new_qobject)
 
     @classmethod
     def _process_parenthesised_text(cls, parenthesised, object_to_add_text_to):
         if not parenthesised:
             return
-        # We parse the parenthises text using the same function as python
-        # does itself when it parses string literals in source code. This
-        # means the parenthesised text can be like this: # 'hello \u25c0'.
-        # In that case 25c0 is a solid left-pointing arrow.
-        try:
-            decoded_with_unicode_escapes = parenthesised.decode(
-                'raw_unicode-escape')
-        except Exception as e:
+        text = decode_unicode_escapes(parenthesised)
+
+        # Try the text-adding methods speculatively, but only once per class.
+        setter_name = text_setter_name(object_to_add_text_to.__class__)
+        if setter_name is None:
             raise LayoutError("""
-                Python raised an exception when the builder tried to
-                deal with unicode encoded values in your text: <%s>. The
-                underlying python error was:
-                %s
-            """, (parenthesised, str(e)))
-
-        # Try the text-adding methods speculatively.
-        if hasattr(object_to_add_text_to, 'setText'):
-            object_to_add_text_to.setText(decoded_with_unicode_escapes)
-            return
-        if hasattr(object_to_add_text_to, 'setTitle'):
-            object_to_add_text_to.setTitle(decoded_with_unicode_escapes)
-            return
-        raise LayoutError("""
-            Cannot do anything with the text you specified
-            in parenthesis because the object being created
-            has neither of the following methods: setText(), or setTitle().
-            """, ())
+                Cannot do anything with the text you specified
+                in parenthesis because the object being created
+                has neither of the following methods: setText(), or setTitle().
+                """, ())
+        getattr(object_to_add_text_to, setter_name)(text)
+
+
+def text_setter_name(qt_class):
+    """
+    Returns the name of the method that objects of the given class use to
+    set their text; or None if they have none of the methods we know about.
+    The answers are cached, because a form can have hundreds of labels.
+    """
+    if qt_class not in _TEXT_SETTER_BY_CLASS:
+        setter_names = [name for name in _TEXT_SETTER_NAMES if
+                        hasattr(qt_class, name)]
+        _TEXT_SETTER_BY_CLASS[qt_class] = \
+            setter_names[0] if setter_names else None
+    return _TEXT_SETTER_BY_CLASS[qt_class]
+
+
+_TEXT_SETTER_NAMES = ('setText', 'setTitle')
+_TEXT_SETTER_BY_CLASS = {}
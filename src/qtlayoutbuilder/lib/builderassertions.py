@@ -17,9 +17,9 @@ class BuilderAssertions(object):
             """, indent)
 
     @classmethod
-    def assert_have_not_skipped_a_level(cls, level, layouts_created):
+    def assert_have_not_skipped_a_level(cls, level, current_level):
         # Only allowed to descend levels in single steps.
-        if level <= layouts_created.current_level() + 1:
+        if level <= current_level + 1:
             return
         raise LayoutError("""
             This line is indented too much.
@@ -28,8 +28,8 @@ class BuilderAssertions(object):
         """, ())
 
     @classmethod
-    def assert_layouts_created_is_not_empty(cls, layouts_created, provenance):
-        if layouts_created.is_empty():
+    def assert_input_is_not_empty(cls, parsed_lines, provenance):
+        if len(parsed_lines) == 0:
             raise LayoutError("""
                 This input provided (%s) contains nothing, or
                 nothing except whitespace and comments.
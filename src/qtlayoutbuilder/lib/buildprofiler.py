@@ -0,0 +1,128 @@
+import json
+from collections import OrderedDict
+
+
+class BuildProfiler(object):
+    """
+    Records, for each Qt class, how many objects of that class the builder
+    made, how long their constructors took, and how long it took to add
+    them to their parents, with which add methods. Use it to find out
+    whether a slow screen is slow because of the builder, or because of the
+    particular widgets on it, (e.g. a QCalendarWidget costs far more to
+    make than a QLabel).
+
+    Make one, and pass it in to as many builds as you like; it accumulates.
+
+        profiler = BuildProfiler()
+        layouts = build_from_file(file_path, profiler=profiler)
+        print profiler.report()
+
+    Objects cited with ?Type are not constructed by the builder, so only
+    their addition is recorded.
+    """
+
+    def __init__(self):
+        self._stats = {}  # _ClassStats, keyed on Qt class name.
+
+    def constructed(self, class_name, seconds):
+        """
+        Record that an object of the class named was constructed, taking the
+        given time.
+        """
+        stats = self._stats_for(class_name)
+        stats.constructed += 1
+        stats.construct_seconds += seconds
+
+    def added(self, class_name, parent_class_name, method_name, seconds):
+        """
+        Record that an object of the class named was added to a parent of the
+        other class named, by calling the parent's method named, and that
+        this (including any methods tried first that did not work) took the
+        given time.
+        """
+        stats = self._stats_for(class_name)
+        stats.added += 1
+        stats.add_seconds += seconds
+        method = '%s.%s' % (parent_class_name, method_name)
+        stats.add_methods[method] = stats.add_methods.get(method, 0) + 1
+
+    def report(self):
+        """
+        Returns a table of what was recorded, one line per Qt class, with the
+        classes that cost the most time first.
+        """
+        rows = [('Class', 'Made', 'Construct ms', 'Added', 'Add ms',
+                 'Total ms', 'Add methods that worked')]
+        for class_name, stats in self._by_cost():
+            rows.append((
+                class_name,
+                '%d' % stats.constructed,
+                '%.3f' % (stats.construct_seconds * 1000),
+                '%d' % stats.added,
+                '%.3f' % (stats.add_seconds * 1000),
+                '%.3f' % (stats.total_seconds() * 1000),
+                ', '.join('%s x%d' % (method, count) for method, count in
+                          sorted(stats.add_methods.items()))))
+        widths = [max(len(row[column]) for row in rows) for column in
+                  range(len(rows[0]) - 1)]
+        lines = []
+        for row in rows:
+            cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+            lines.append(('  '.join(cells + [row[-1]])).rstrip())
+        return '\n'.join(lines)
+
+    def as_json(self):
+        """
+        Returns what was recorded as a JSON string, with the classes and keys
+        in a stable order, so that the output from different versions of
+        your program (or of Qt) can be diffed.
+        """
+        profile = OrderedDict()
+        for class_name in sorted(self._stats):
+            stats = self._stats[class_name]
+            profile[class_name] = OrderedDict([
+                ('constructed', stats.constructed),
+                ('construct_seconds', round(stats.construct_seconds, 6)),
+                ('added', stats.added),
+                ('add_seconds', round(stats.add_seconds, 6)),
+                ('add_methods', OrderedDict(sorted(
+                    stats.add_methods.items()))),
+            ])
+        return json.dumps(profile, indent=2, separators=(',', ': '))
+
+    def clear(self):
+        self._stats = {}
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _stats_for(self, class_name):
+        stats = self._stats.get(class_name)
+        if stats is None:
+            stats = _ClassStats()
+            self._stats[class_name] = stats
+        return stats
+
+    def _by_cost(self):
+        # The (class name, stats) pairs, most costly first, and then in
+        # order of name, so that the report is stable.
+        return sorted(self._stats.items(),
+                      key=lambda item: (-item[1].total_seconds(), item[0]))
+
+
+class _ClassStats(object):
+    """
+    What the profiler knows about one Qt class.
+    """
+
+    def __init__(self):
+        self.constructed = 0
+        self.construct_seconds = 0.0
+        self.added = 0
+        self.add_seconds = 0.0
+        # How many times each add method worked, keyed on
+        # '<parent class>.<method>'.
+        self.add_methods = {}
+
+    def total_seconds(self):
+        return self.construct_seconds + self.add_seconds
@@ -0,0 +1,142 @@
+import weakref
+
+from qtlayoutbuilder.lib.qtobjects import is_alive
+
+
+class BuildTransaction(object):
+    """
+    Keeps track of what a build has done to the Qt world, so that when the
+    build fails part way through, it can be undone, and the objects made for
+    the abandoned build do not live on until the process exits.
+
+    Call created() for every object the builder makes, and found() for every
+    existing object it finds (cited with ?Type), before it is added to its
+    parent. If the build fails, roll_back() gives the found widgets back to
+    the parents they were found in, and then disposes of the objects that
+    were made, using deleteLater(). Only the outermost of those need to be
+    disposed of explicitly, because Qt deletes the children along with
+    their parents.
+
+    The same undo is used to dispose of the objects of a build that
+    succeeded, (see LayoutsCreated.dispose()).
+    """
+
+    def __init__(self):
+        # Deferred until a build needs it, as in QObjectMaker.
+        from PySide.QtCore import QObject
+        from PySide.QtGui import QWidget
+        self._qobject_class = QObject
+        self._widget_class = QWidget
+        # Sequence of (object, the object it is being added to, or None).
+        self._created = []
+        # Sequence of (widget, parent widget, was_hidden).
+        self._found = []
+        # When true, the objects in the sequences above are weak references.
+        self._weak = False
+
+    def created(self, new_object, parent_object):
+        """
+        Record that the builder made the given object, which is about to be
+        added to the given parent object (None for a top level object).
+        """
+        self._created.append((new_object, parent_object))
+
+    def found(self, existing_object):
+        """
+        Record where the given existing object was found, before the builder
+        moves it. Objects other than QWidgets are ignored.
+        """
+        if isinstance(existing_object, self._widget_class):
+            self._found.append((existing_object,
+                                existing_object.parentWidget(),
+                                existing_object.isHidden()))
+
+    def created_qobjects(self):
+        """
+        The QObjects made so far that still exist, (i.e. leaving out the
+        QSpacerItems, and the existing objects that were found).
+        """
+        return [new_object for new_object, _ in self._live_created()
+                if isinstance(new_object, self._qobject_class)]
+
+    def hold_weakly(self):
+        """
+        Switches to holding weak references to the objects recorded, so that
+        the transaction does not keep them alive. Those that have gone by the
+        time of a roll_back() are left out of it.
+        """
+        if self._weak:
+            return
+        self._created = [(weakref.ref(new_object), _weak_or_none(parent))
+                         for new_object, parent in self._created]
+        self._found = [(weakref.ref(widget), _weak_or_none(parent), hidden)
+                       for widget, parent, hidden in self._found]
+        self._weak = True
+
+    def roll_back(self):
+        """
+        Undo the build as far as is possible. The found widgets get their
+        parents back, (but not their places in their parents' layouts), and
+        the objects that were made are scheduled for deletion.
+        """
+        created = self._live_created()
+        found = self._live_found()
+        for widget, parent, was_hidden in reversed(found):
+            if parent is not None and not is_alive(parent):
+                continue
+            if widget.parentWidget() is not parent:
+                widget.setParent(parent)
+                if not was_hidden:
+                    widget.show()
+        created_ids = set(id(new_object) for new_object, _ in created)
+        # In reverse, so that children are detached before their parents.
+        for new_object, parent_object in reversed(created):
+            if not isinstance(new_object, self._qobject_class):
+                # A QSpacerItem, which is owned by the layout it is in, so
+                # need only be taken out of a layout that survives.
+                if is_alive(parent_object) and \
+                        id(parent_object) not in created_ids:
+                    parent_object.removeItem(new_object)
+                continue
+            # A widget's parent is the widget that its layout belongs to,
+            # which need not be the object that it was added to.
+            qt_parent = new_object.parent()
+            if qt_parent is not None and id(qt_parent) in created_ids:
+                continue
+            if isinstance(new_object, self._widget_class):
+                new_object.setParent(None)
+            new_object.deleteLater()
+        self._weak = False
+        self._created = []
+        self._found = []
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _live_created(self):
+        # The (object, parent object) records of the objects made that still
+        # exist. They may have been destroyed since they were recorded, e.g.
+        # by the closing of a window.
+        created = self._created
+        if self._weak:
+            created = [(new_object(), _strong_or_none(parent))
+                       for new_object, parent in created]
+        return [(new_object, parent) for new_object, parent in created
+                if is_alive(new_object)]
+
+    def _live_found(self):
+        # Likewise, the (widget, parent widget, was_hidden) records.
+        found = self._found
+        if self._weak:
+            found = [(widget(), _strong_or_none(parent), was_hidden)
+                     for widget, parent, was_hidden in found]
+        return [(widget, parent, was_hidden) for widget, parent, was_hidden
+                in found if is_alive(widget)]
+
+
+def _weak_or_none(obj):
+    return None if obj is None else weakref.ref(obj)
+
+
+def _strong_or_none(reference):
+    return None if reference is None else reference()
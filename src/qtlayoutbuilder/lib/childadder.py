@@ -1,5 +1,4 @@
-from PySide.QtCore import Qt
-from PySide.QtGui import QScrollArea, QSlider
+from timeit import default_timer
 
 from qtlayoutbuilder.api.layouterror import LayoutError
 
@@ -9,20 +8,50 @@ class ChildAdder(object):
     Provides a generalised function that tries various adventures,
     to add a child to a Qt parent object. See the code below for the logical
     experiments it tries.
+
+    Children that have a position (row, column, row_span, column_span) are
+    not added speculatively, but put in that cell of their parent, which must
+    be a QGridLayout or QFormLayout.
+
+    Use one instance per build, because it numbers the tabs it adds to
+    QTabWidgets, and the numbering should not depend on other builds.
     """
 
-    # This variable is used to increment the name for every tab created.
-    # Note it is class scope and will hence work across separate instantiations.
-    _next_tab_number = 0
+    def __init__(self, profiler=None):
+        """
+        :param profiler: Optionally, a BuildProfiler to tell how long each
+        addition took, and which add method worked.
+        """
+        self._profiler = profiler
+        # This variable is used to increment the name for every tab created.
+        self._next_tab_number = 0
+        # Qt is imported here so that importing the builder does not import
+        # it.
+        from PySide.QtCore import Qt
+        from PySide import QtGui
+        self._horizontal = Qt.Orientation.Horizontal
+        self._qt_gui = QtGui
 
-    @classmethod
-    def add(cls, child_object, child_name, parent_object):
+    def add(self, child_object, child_name, parent_object, position=None):
+        started = default_timer()
+        if position is not None:
+            method_name = self._add_at_position(child_object, child_name,
+                                                parent_object, position)
+        else:
+            method_name = self._add_speculatively(child_object, child_name,
+                                                  parent_object)
+        if self._profiler is not None:
+            self._profiler.added(child_object.__class__.__name__,
+                                 parent_object.__class__.__name__,
+                                 method_name, default_timer() - started)
+
+    def _add_speculatively(self, child_object, child_name, parent_object):
         # Stop at the first method from the experimental sequence, which
         # the parent object has, and which does not raise  exceptions when it
-        # is called.
+        # is called. Returns the name of that method.
         for method_name in _SPECULATIVE_METHODS:
-            if cls._method_worked(method_name, child_object, parent_object):
-                return
+            if self._method_worked(method_name, child_object, parent_object):
+                return method_name
         # Nothing worked, which is an error
         raise LayoutError("""
             Could not add this child: <%s> to its parent.
@@ -34,12 +63,11 @@ class ChildAdder(object):
             %s
             """, (child_name, child_object.__class__.__name__,
                   parent_object.__class__.__name__,
-                  cls._format_supported_add_methods()))
+                  self._format_supported_add_methods()))
 
-    @classmethod
-    def _method_worked(cls, method_name, child_object, parent_object):
+    def _method_worked(self, method_name, child_object, parent_object):
         # Does this parent have this method?
-        method = cls._get_method(parent_object, method_name)
+        method = self._get_method(parent_object, method_name)
         if method is None:
             return False
         # The method is available and callable - let's see if it
@@ -47,22 +75,84 @@ class ChildAdder(object):
         try:
             # Some addition methods require a bit of intervention.
             if method_name == 'addTab':  # QTabWidget
-                cls._next_tab_number += 1
-                method(child_object, 'tab_%d' % cls._next_tab_number)
+                self._next_tab_number += 1
+                method(child_object, 'tab_%d' % self._next_tab_number)
             else:  # General case.
                 method(child_object)
 
             # We promise a few post-addition actions for some child or
             # parent types.
-            if isinstance(parent_object, QScrollArea):
+            if isinstance(parent_object, self._qt_gui.QScrollArea):
                 parent_object.setWidgetResizable(True)
-            if isinstance(child_object, QSlider):
-                child_object.setOrientation(Qt.Orientation.Horizontal)
+            if isinstance(child_object, self._qt_gui.QSlider):
+                child_object.setOrientation(self._horizontal)
 
             return True  # The method worked.
         except TypeError:
             return False
 
+    def reserve(self, parent_object, rows, columns):
+        """
+        Makes a QGridLayout big enough for the given number of rows and
+        columns in one go, before its children are added, so that it does
+        not grow one row or column at a time. Other parents are left alone.
+        """
+        if not isinstance(parent_object, self._qt_gui.QGridLayout):
+            return
+        # Setting the stretch of a row or column that is beyond the end
+        # of the grid extends the grid to include it. The default stretch
+        # is zero.
+        if rows > parent_object.rowCount():
+            parent_object.setRowStretch(rows - 1, 0)
+        if columns > parent_object.columnCount():
+            parent_object.setColumnStretch(columns - 1, 0)
+
+    def _add_at_position(self, child_object, child_name, parent_object,
+                         position):
+        if isinstance(parent_object, self._qt_gui.QGridLayout):
+            method_name = self._choose_method(
+                child_object, 'addWidget', 'addLayout', 'addItem')
+            getattr(parent_object, method_name)(child_object, *position)
+            return method_name
+        elif isinstance(parent_object, self._qt_gui.QFormLayout):
+            method_name = self._choose_method(
+                child_object, 'setWidget', 'setLayout', 'setItem')
+            row = position[0]
+            getattr(parent_object, method_name)(
+                row, self._form_role(child_name, position), child_object)
+            return method_name
+        else:
+            raise LayoutError("""
+                This child: <%s> has a position in square brackets, but
+                its parent is a: <%s>. Only the children of a QGridLayout
+                or a QFormLayout can have positions.
+            """, (child_name, parent_object.__class__.__name__))
+
+    def _choose_method(self, child_object, for_widget, for_layout, for_item):
+        if isinstance(child_object, self._qt_gui.QWidget):
+            return for_widget
+        if isinstance(child_object, self._qt_gui.QLayout):
+            return for_layout
+        return for_item  # E.g. QSpacerItem.
+
+    def _form_role(self, child_name, position):
+        # Column zero holds the labels, and column one the fields. Spanning
+        # both columns makes a row that has only the one item.
+        _, column, row_span, column_span = position
+        roles = {
+            (0, 1): self._qt_gui.QFormLayout.LabelRole,
+            (1, 1): self._qt_gui.QFormLayout.FieldRole,
+            (0, 2): self._qt_gui.QFormLayout.SpanningRole,
+        }
+        role = roles.get((column, column_span))
+        if role is None or row_span != 1:
+            raise LayoutError("""
+                This child: <%s> cannot be put in that position in a
+                QFormLayout. The position must be [row,0] for a label,
+                [row,1] for a field, or [row,0,1,2] to span both columns.
+            """, child_name)
+        return role
+
     @classmethod
     def _get_method(cls, target_object, method_name):
         attr = getattr(target_object, method_name, None)
@@ -0,0 +1,309 @@
+import mmap
+import os
+import struct
+import zlib
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib.inputparser import ParsedLine
+
+# The file extension appended to the name of the text file, to make the name
+# of the compiled file that lives alongside it.
+COMPILED_SUFFIX = '.qlb'
+
+
+class CompiledLayout(object):
+    """
+    A binary, precompiled form of the builder's input, from which the Builder
+    can instantiate directly, skipping the reading and parsing of the text.
+
+    The file is memory mapped, and behaves as a read-only sequence of
+    ParsedLine(s), each of which is decoded from the map only when it is
+    asked for. It is laid out like this (all little-endian):
+
+    - A header: magic, format version, and the size, modification time and
+      CRC-32 of the text file it was compiled from, followed by the number
+      of records and the number of strings.
+    - Fixed width records, one per ParsedLine, each holding the depth, some
+      flags, the index of the parent record and the line number, the
+      indices in the string table of the name, type word, parenthesised
+      text and item list, and the position (row, column and spans).
+    - The string table: an array of (number of strings + 1) offsets into the
+      string bytes that follow it. Each distinct string is stored only once,
+      so repeated type words cost nothing.
+
+    Compiled files are meant to ship alongside their text sources. The
+    builder uses one only when it is up to date with its source (see
+    open_if_fresh()), and otherwise reads the text.
+    """
+
+    @classmethod
+    def compile(cls, parsed_lines, source_path):
+        """
+        Writes the compiled form of the given ParsedLine(s), alongside the
+        text file they were parsed from. The file is written under a
+        temporary name, and then renamed, so that a build never sees one that
+        is only partly written.
+        :param parsed_lines: The output of InputParser.parse().
+        :param source_path: The text file the lines were parsed from.
+        :raises LayoutError: When a line is indented too deeply, or positioned
+        too far out, for the compiled form to hold.
+        :return: The path of the compiled file written.
+        """
+        size, mtime, crc = _describe_source(source_path)
+        strings = _StringTable()
+        records = []
+        for parsed_line in parsed_lines:
+            flags = 0
+            text_index = 0
+            if parsed_line.parenthesised is not None:
+                flags |= _HAS_TEXT
+                text_index = strings.index_of(parsed_line.parenthesised)
+            items_index = 0
+            if parsed_line.items is not None:
+                flags |= _HAS_ITEMS
+                items_index = strings.index_of(parsed_line.items)
+            position = _NO_POSITION
+            if parsed_line.position is not None:
+                flags |= _HAS_POSITION
+                position = parsed_line.position
+            if max((parsed_line.depth,) + position) > _MAX_SHORT:
+                raise LayoutError("""
+                    This line cannot be compiled, because its depth or
+                    position numbers exceed %d: <%s> (line %d).
+                """, (_MAX_SHORT, parsed_line.line.strip(),
+                      parsed_line.line_number))
+            records.append(_RECORD.pack(
+                parsed_line.depth, flags, parsed_line.parent,
+                parsed_line.line_number, strings.index_of(parsed_line.name),
+                strings.index_of(parsed_line.type_word), text_index,
+                items_index, *position))
+        header = _HEADER.pack(_MAGIC, _VERSION, 0, size, mtime, crc,
+                              len(records), strings.count())
+        compiled_path = compiled_path_for(source_path)
+        temporary_path = '%s.%d.tmp' % (compiled_path, os.getpid())
+        try:
+            with open(temporary_path, 'wb') as output_file:
+                output_file.write(header)
+                output_file.write(b''.join(records))
+                strings.write_to(output_file)
+            _rename_over(temporary_path, compiled_path)
+        except Exception:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        return compiled_path
+
+    @classmethod
+    def open(cls, compiled_path):
+        """
+        Opens and maps a compiled file, regardless of whether it is up to
+        date with its source.
+        :raises LayoutError: When the file cannot be read, or is not a
+        compiled layout of this version.
+        :return: A CompiledLayout object. Call close() when done with it.
+        """
+        try:
+            with open(compiled_path, 'rb') as compiled_file:
+                mapped = mmap.mmap(compiled_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        except Exception as e:
+            raise LayoutError("""
+                Cannot read this compiled layout file: <%s>.
+                The underlying error reported is: %s.
+            """, (compiled_path, str(e)))
+        return cls(mapped, compiled_path)
+
+    @classmethod
+    def open_if_fresh(cls, source_path):
+        """
+        Opens the compiled file that lives alongside the given text file, but
+        only if there is one, and it was compiled from the text file as it is
+        now. The size and modification time are compared first. When only the
+        modification time differs (as happens when files are copied or
+        installed), the text file's CRC-32 decides.
+        :return: A CompiledLayout object, or None.
+        """
+        compiled_path = compiled_path_for(source_path)
+        if not os.path.exists(compiled_path):
+            return None
+        try:
+            compiled = cls.open(compiled_path)
+        except LayoutError:
+            return None
+        try:
+            stat = os.stat(source_path)
+            fresh = stat.st_size == compiled._source_size and (
+                stat.st_mtime == compiled._source_mtime or
+                _crc_of_file(source_path) == compiled._source_crc)
+        except EnvironmentError:
+            fresh = False
+        if not fresh:
+            compiled.close()
+            return None
+        return compiled
+
+    def __init__(self, mapped, compiled_path):
+        """
+        Use open() or open_if_fresh() instead.
+        """
+        self._map = mapped
+        try:
+            magic, version, _, self._source_size, self._source_mtime, \
+                self._source_crc, self._record_count, string_count = \
+                _HEADER.unpack_from(mapped, 0)
+        except struct.error:
+            magic, version = None, None
+        if magic != _MAGIC or version != _VERSION:
+            mapped.close()
+            raise LayoutError("""
+                This file: <%s> is not a compiled layout file that this
+                version of the builder can read. Compile it again from
+                its text source.
+            """, compiled_path)
+        self._string_offsets_at = \
+            _HEADER.size + self._record_count * _RECORD.size
+        self._strings_at = self._string_offsets_at + \
+            (string_count + 1) * _OFFSET.size
+        # The records and the string offsets must all be there, and so must
+        # the string bytes, whose length is the last of the offsets.
+        if len(mapped) < self._strings_at or \
+                len(mapped) < self._strings_at + _OFFSET.unpack_from(
+                    mapped, self._strings_at - _OFFSET.size)[0]:
+            mapped.close()
+            raise LayoutError("""
+                This compiled layout file: <%s> is shorter than its header
+                says it should be. Compile it again from its text source.
+            """, compiled_path)
+
+    def __len__(self):
+        return self._record_count
+
+    def __getitem__(self, index):
+        """
+        Decodes the record at the given index into a ParsedLine.
+        """
+        if not 0 <= index < self._record_count:
+            raise IndexError(index)
+        record = _RECORD.unpack_from(
+            self._map, _HEADER.size + index * _RECORD.size)
+        depth, flags, parent, line_number, name_index, type_index, \
+            text_index, items_index = record[:8]
+        name = self._string(name_index)
+        type_word = self._string(type_index)
+        # The line is reconstructed (for error messages) rather than stored.
+        line = '%s%s    %s' % ('  ' * (depth - 1), name, type_word)
+        position = None
+        if flags & _HAS_POSITION:
+            position = record[8:]
+            line += '[%s]' % ','.join(str(number) for number in position)
+        items = None
+        if flags & _HAS_ITEMS:
+            items = self._string(items_index)
+            line += '{%s}' % items
+        parenthesised = None
+        if flags & _HAS_TEXT:
+            parenthesised = self._string(text_index)
+            line += '(%s)' % parenthesised
+        return ParsedLine(line_number, line, depth, parent, name, type_word,
+                          parenthesised, position, items)
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _string(self, index):
+        start, end = _TWO_OFFSETS.unpack_from(
+            self._map, self._string_offsets_at + index * _OFFSET.size)
+        return self._map[self._strings_at + start:self._strings_at + end]
+
+
+def compiled_path_for(source_path):
+    """
+    The path of the compiled file that lives alongside the given text file.
+    """
+    return source_path + COMPILED_SUFFIX
+
+
+# -----------------------------------------------------------------------------
+# Private below.
+
+class _StringTable(object):
+    """
+    Accumulates the distinct strings to be written to a compiled file.
+    """
+
+    def __init__(self):
+        self._strings = []
+        self._index_of_string = {}
+
+    def index_of(self, string):
+        if isinstance(string, unicode):
+            string = string.encode('utf-8')
+        index = self._index_of_string.get(string)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(string)
+            self._index_of_string[string] = index
+        return index
+
+    def count(self):
+        return len(self._strings)
+
+    def write_to(self, output_file):
+        offsets = [0]
+        for string in self._strings:
+            offsets.append(offsets[-1] + len(string))
+        output_file.write(struct.pack('<%dI' % len(offsets), *offsets))
+        output_file.write(b''.join(self._strings))
+
+
+def _describe_source(source_path):
+    # The size, modification time and CRC-32 of the given text file.
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime, _crc_of_file(source_path)
+
+
+def _rename_over(from_path, to_path):
+    # os.rename() will not replace an existing file on Windows.
+    try:
+        os.rename(from_path, to_path)
+    except OSError:
+        if not os.path.exists(to_path):
+            raise
+        os.remove(to_path)
+        os.rename(from_path, to_path)
+
+
+def _crc_of_file(file_path):
+    with open(file_path, 'rb') as source_file:
+        return zlib.crc32(source_file.read()) & 0xffffffff
+
+
+_MAGIC = b'QLB\x00'
+_VERSION = 3
+# Magic, version, (padding), source size, source mtime, source CRC-32,
+# record count, string count.
+_HEADER = struct.Struct('<4sHHQdIII')
+# Depth, flags, parent, line number, name, type word, text and item list
+# indices, row, column, row span and column span.
+_RECORD = struct.Struct('<HHiIIIIIHHHH')
+_OFFSET = struct.Struct('<I')
+_TWO_OFFSETS = struct.Struct('<II')
+
+# Record flags.
+_HAS_TEXT = 1
+_HAS_POSITION = 2
+_HAS_ITEMS = 4
+
+_NO_POSITION = (0, 0, 0, 0)
+# The most that the depth and the position numbers can be, (they are stored
+# as unsigned shorts).
+_MAX_SHORT = 0xffff
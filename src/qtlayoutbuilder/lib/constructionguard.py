@@ -0,0 +1,50 @@
+class ConstructionGuard(object):
+    """
+    Suppresses the repainting and signal emission of the widgets the builder
+    is putting together, while it does so. Without this, a widget that is
+    already live (typically one cited with ?Type) would repaint and have its
+    layout redone, each time a child is added to it, or text is set on one of
+    its descendants.
+
+    Call suppress() for every widget as soon as the builder has it, and
+    release() once all the building is done (or has failed). Release
+    restores each widget to the state it was found in, and then activates
+    the layouts of those that are visible, just the once.
+    """
+
+    def __init__(self):
+        # Deferred until a build needs it, as in QObjectMaker.
+        from PySide.QtGui import QWidget
+        self._widget_class = QWidget
+        # Sequence of (widget, updates_were_enabled, signals_were_blocked).
+        self._suppressed = []
+
+    def suppress(self, qobject):
+        """
+        Suppress repainting and signals for the given object until release()
+        is called. Objects other than QWidgets are ignored.
+        """
+        if not isinstance(qobject, self._widget_class):
+            return
+        self._suppressed.append(
+            (qobject, qobject.updatesEnabled(), qobject.signalsBlocked()))
+        qobject.setUpdatesEnabled(False)
+        qobject.blockSignals(True)
+
+    def release(self):
+        """
+        Restore all the suppressed widgets to how they were found, and bring
+        the layouts of the visible ones up to date.
+        """
+        # In reverse, so that children are restored before their parents.
+        for widget, updates_were_enabled, signals_were_blocked in \
+                reversed(self._suppressed):
+            widget.blockSignals(signals_were_blocked)
+            widget.setUpdatesEnabled(updates_were_enabled)
+        # Hidden widgets get their layouts activated when they are shown, so
+        # there is no point in doing it for them now.
+        for widget, _, _ in self._suppressed:
+            layout = widget.layout()
+            if layout is not None and widget.isVisible():
+                layout.activate()
+        self._suppressed = []
@@ -0,0 +1,144 @@
+from collections import namedtuple
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib import regex_helpers
+from qtlayoutbuilder.lib.builderassertions import BuilderAssertions
+from qtlayoutbuilder.lib.line_parser import LineParser
+from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
+
+# One of these describes each line of input that is neither a comment nor
+# blank. The parent is the index (in the sequence of ParsedLine(s)) of the
+# line that is the parent of this one, or NO_PARENT for top level lines. The
+# position is None, unless the type word had a [row,column] suffix, in which
+# case it is (row, column, row_span, column_span). The items are None, unless
+# the type word was followed by an item list in curly braces, in which case
+# they are what was inside the braces.
+ParsedLine = namedtuple('ParsedLine', (
+    'line_number', 'line', 'depth', 'parent', 'name', 'type_word',
+    'parenthesised', 'position', 'items'))
+
+NO_PARENT = -1
+
+
+class InputParser(object):
+    """
+    Parses and validates the builder's entire input, to produce the sequence of
+    ParsedLine(s) that the Builder instantiates Qt objects from. This stage
+    does not touch Qt at all, and has no state outside of each call, so it can
+    be run in any thread, or several threads at once.
+    """
+
+    @classmethod
+    def parse(cls, one_big_string, provenance, memory_report=None):
+        """
+        :param one_big_string: The builder's input text.
+        :param provenance: Where the input came from, for error messages.
+        :param memory_report: Optionally, a BuildMemoryReport to give the
+        lines of the input to, (which are gone once parsing is done).
+        :raises LayoutError:
+        :return: A list of ParsedLine(s).
+        """
+        lines = MultilineString.get_as_left_shifted_lines(one_big_string)
+        if memory_report is not None:
+            memory_report.input_lines_made(lines)
+        parsed_lines = []
+        # The index of the most recently parsed line at each depth, which
+        # are the candidate parents for subsequent lines.
+        most_recent_at_depth = []
+        line_number = 0
+        for line in lines:
+            line_number += 1
+            try:
+                parsed_line = cls._parse_line(
+                    line, line_number, most_recent_at_depth)
+            except LayoutError as e:
+                raise with_line_context(e, line, line_number, provenance)
+            if parsed_line is None:
+                continue
+            del most_recent_at_depth[parsed_line.depth - 1:]
+            most_recent_at_depth.append(len(parsed_lines))
+            parsed_lines.append(parsed_line)
+        BuilderAssertions.assert_input_is_not_empty(parsed_lines, provenance)
+        return parsed_lines
+
+    # --------------------------------------------------------
+    # Private below
+
+    @classmethod
+    def _parse_line(cls, line, line_number, most_recent_at_depth):
+        is_a_comment, is_blank, indent, name, type_string, parenthesised = \
+            LineParser.parse_line(line)
+        if is_a_comment or is_blank:
+            return None
+
+        # Amount of indentation gives us the depth at which this line lives in
+        # parent-child hierarchy. Top level objects have depth=1.
+
+        depth = 1 + indent / 2  # Integer division.
+        # The depth of the previous line, or zero when there is none.
+        current_depth = len(most_recent_at_depth)
+        BuilderAssertions.assert_have_not_skipped_a_level(depth, current_depth)
+        if depth > 1:
+            parent = most_recent_at_depth[depth - 2]
+        else:
+            parent = NO_PARENT
+        type_string, items = regex_helpers.split_off_braces(type_string)
+        type_word, bracketed = regex_helpers.split_off_brackets(type_string)
+        position = None
+        if bracketed is not None:
+            position = cls._parse_position(bracketed, parent)
+        return ParsedLine(line_number, line, depth, parent, name, type_word,
+                          parenthesised, position, items)
+
+    @classmethod
+    def _parse_position(cls, bracketed, parent):
+        try:
+            numbers = [int(word) for word in bracketed.split(',')]
+        except ValueError:
+            numbers = []
+        if len(numbers) == 2:
+            numbers.extend((1, 1))
+        if len(numbers) != 4 or min(numbers[:2]) < 0 or \
+                min(numbers[2:]) < 1:
+            raise LayoutError("""
+                The position in square brackets after the type word must
+                look like this: [row,column] or this:
+                [row,column,row_span,column_span]. The row and column
+                count from zero, and the spans must be at least one.
+            """, ())
+        if parent == NO_PARENT:
+            raise LayoutError("""
+                A top level item cannot have a position in square brackets,
+                because it has no parent to be positioned in.
+            """, ())
+        return tuple(numbers)
+
+
+def extents_of_positioned_children(parsed_lines):
+    """
+    Works out how many rows and columns each parent must have to accommodate
+    those of its children that have positions.
+    :return: A dictionary of (rows, columns), keyed on the index of the parent
+    line.
+    """
+    extents = {}
+    for parsed_line in parsed_lines:
+        if parsed_line.position is None:
+            continue
+        row, column, row_span, column_span = parsed_line.position
+        rows, columns = extents.get(parsed_line.parent, (0, 0))
+        extents[parsed_line.parent] = (max(rows, row + row_span),
+                                       max(columns, column + column_span))
+    return extents
+
+
+def with_line_context(error, line, line_number, provenance):
+    """
+    Returns a new LayoutError that augments the one provided with the line
+    number, the line contents, and the source of the input.
+    """
+    return LayoutError("""
+            %s
+            (This line: <%s>)
+            (Line number: %d, from %s)
+        """, (str(error), line, line_number, provenance))
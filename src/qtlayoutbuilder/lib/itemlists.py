@@ -0,0 +1,89 @@
+from os import path
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib import file_utils
+from qtlayoutbuilder.lib.unicode_escapes import decode_unicode_escapes
+
+
+class ItemLists(object):
+    """
+    Deals with the item lists given in curly braces after type words, which
+    populate widgets like QComboBox and QListWidget. A list is either given
+    inline, separated by vertical bars, {red|green|blue}, or taken from a
+    data file that has one item per line, {@colours.txt}. A relative data
+    file path is taken to be relative to the folder of the input file (or
+    the current directory when there is no input file).
+
+    A model-based view, like QListView or QTableView, can cite a data file
+    in the same way, and gets a LazyFileModel of it.
+
+    Use one instance per build, because it remembers the data files it has
+    read, so that a file cited by several widgets is read only once.
+    """
+
+    def __init__(self, provenance):
+        """
+        :param provenance: Where the input came from. When it is the path of
+        a file, relative data file paths are resolved against its folder.
+        """
+        self._provenance = provenance
+        self._items_by_path = {}
+
+    def items(self, items_text):
+        """
+        Returns the list of items that the given item list (the contents of
+        the curly braces) describes.
+        :raises LayoutError:
+        """
+        if items_text.startswith('@'):
+            data_file_path = self.data_file_path(items_text[1:])
+            if data_file_path not in self._items_by_path:
+                self._items_by_path[data_file_path] = \
+                    file_utils.get_file_contents_as_a_string(
+                        data_file_path).splitlines()
+            return self._items_by_path[data_file_path]
+        return [decode_unicode_escapes(item) for item in items_text.split('|')]
+
+    def data_file_path(self, reference):
+        """
+        Resolves the path of a data file cited in an item list.
+        """
+        if path.isabs(reference) or not path.isfile(self._provenance):
+            return reference
+        return path.join(path.dirname(self._provenance), reference)
+
+    def apply(self, items_text, target):
+        """
+        Gives the given item list to the given widget. Items are added with
+        a single addItems() call, while the widget's signals are blocked.
+        A view is given a model of the data file instead.
+        :raises LayoutError:
+        """
+        add_items = getattr(target, 'addItems', None)
+        if callable(add_items):
+            self._add_items(self.items(items_text), target, add_items)
+            return
+        if callable(getattr(target, 'setModel', None)) and \
+                items_text.startswith('@'):
+            # Imported here, because it is a Qt class.
+            from qtlayoutbuilder.lib.lazyfilemodel import LazyFileModel
+            target.setModel(LazyFileModel(
+                self.data_file_path(items_text[1:]), target))
+            return
+        raise LayoutError("""
+            Cannot do anything with the item list you specified in
+            curly braces, because the object being created has no
+            addItems() method, (nor a setModel() method to take a
+            data file).
+        """, ())
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    @classmethod
+    def _add_items(cls, items, target, add_items):
+        were_blocked = target.blockSignals(True)
+        try:
+            add_items(items)
+        finally:
+            target.blockSignals(were_blocked)
@@ -1,108 +1,278 @@
+import weakref
+from array import array
 from collections import OrderedDict
+from fnmatch import fnmatchcase
 
 from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib.qtobjects import is_alive
 
 
 class LayoutsCreated(object):
     """
-    Holds the tree of layouts created as an ordered dictionary, keyed on
-    pathnames that look likethis 'my_page.layout.my_widget'.
-    
-    Offers methods to register objects in the tree, and a method to query
-    what is in the tree.
+    Holds the tree of layouts created as a compact node table. Each node
+    occupies one slot in a set of parallel arrays (object, name, parent index
+    and depth), and a dictionary indexes the nodes by name. Dotted path names
+    that look like this 'my_page.layout.my_widget' are not stored; they are
+    computed on demand from the parent indices, for dump() and for error
+    messages.
+
+    Offers methods to register objects in the tree, a method to query
+    what is in the tree, and a method to dispose of it.
+
+    Once the tree is built, it can be switched to holding only weak
+    references to its objects (see hold_weakly()), so that it does not keep
+    them alive once the rest of the program has finished with them.
     """
-    def __init__(self):
-        self._elements = OrderedDict()
+    def __init__(self, transaction=None):
+        """
+        :param transaction: The BuildTransaction of the build that populates
+        this tree, which knows which of its objects were made, and which were
+        found. When there is none, all of the objects are taken to be made.
+        """
+        self._transaction = transaction
+        self._disposed = False
+        self._weak = False
+        # Strong references to the top level objects, by node, that are kept
+        # when holding weakly, until each is first asked for.
+        self._held_until_asked = {}
+        self._objects = []
+        self._names = []
+        self._parents = array('l')  # Index of parent node, or _NO_PARENT.
+        self._depths = array('l')  # Top level objects have depth=1.
+        self._index_of_name = {}
 
     def at(self, name):
         """
-        Find the item with the given name.
+        Find the item with the given name. The name can be preceded by those
+        of any number of its nearest ancestors, separated by dots, like
+        this: 'layout.my_widget', in which case they must match too.
 
         :param name: The name to search for.
         :raises LayoutError:
         :return: The QLayout or QWidget at that position in the hierarchy.
         """
-        matching_paths = [path for path in self._elements.keys() if
-                          self._name_segment(path) == name]
-        if len(matching_paths) == 0:
+        self._raise_if_disposed(name)
+        node = self._node_of(name)
+        if node is None:
             raise LayoutError("""
                 No path can be found that ends with <%s>.
                 These are the paths that do exist:
 
                 %s
             """, (name, self.dump()))
-        if len(matching_paths) > 1:
+        return self._handed_over(node)
+
+    def at_many(self, names):
+        """
+        Finds the items with each of the given names, (which can be dotted
+        like those given to at()).
+
+        :raises LayoutError: Listing all of the names that cannot be found.
+        :return: A dictionary of the QLayouts and QWidgets, keyed on the names
+        given.
+        """
+        names = list(names)  # They are gone through more than once.
+        self._raise_if_disposed(', '.join(names))
+        nodes = [(name, self._node_of(name)) for name in names]
+        missing = [name for name, node in nodes if node is None]
+        if missing:
             raise LayoutError("""
-                More than one path exists that ends with <%s>.
+                No paths can be found that end with these: <%s>.
+                These are the paths that do exist:
 
-                The first two are:
-                %s
                 %s
-            """, (name, matching_paths.pop(), matching_paths.pop()))
-        return self._elements[matching_paths.pop()]
+            """, (', '.join(missing), self.dump()))
+        return dict((name, self._handed_over(node)) for name, node in nodes)
+
+    def find(self, pattern):
+        """
+        Finds the items whose names match the given glob style pattern, e.g.
+        '*_btn'. A pattern with a dot in it is matched against the dotted
+        paths of the items instead, e.g. 'page.*.ok_btn'. Items that have been
+        destroyed are left out.
+
+        :return: An OrderedDict of the QLayouts and QWidgets, keyed on their
+        names (or paths), in the order they were built.
+        """
+        self._raise_if_disposed(pattern)
+        found = OrderedDict()
+        for node, name in enumerate(self._names):
+            if '.' in pattern:
+                name = self.path_of(node)
+            if fnmatchcase(name, pattern) and is_alive(self.object_at(node)):
+                found[name] = self._handed_over(node)
+        return found
 
     def register_top_level_object(self, object_to_register, name):
         """
-        Register the given object in the tree using the given name, 
-        as a top-level object.
+        Register the given object in the tree using the given name,
+        as a top-level object. Returns its node.
         """
-        if name in self._all_names():
-            raise LayoutError("""
-                The name you have given this item (<%s>), has already
-                been used.
-            """, name)
-        self._elements[name] = object_to_register
+        return self._add_node(object_to_register, name, _NO_PARENT, 1)
 
-    def register_child(self, child_object, parent_path, child_name):
+    def register_child(self, child_object, parent_node, child_name):
         """
         Register the given child object of the given name in the tree,
-        as a child of the given parent path (not parent object).
+        as a child of the given parent node (not parent object). Nodes are
+        numbered from zero in the order they are registered. Returns the
+        child's node.
         """
-        if child_name in self._all_names():
-            raise LayoutError("""
-                The name you have given this item (<%s>), has already
-                been used.
-            """, child_name)
-        key = parent_path + '.' + child_name
-        self._elements[key] = child_object
+        return self._add_node(child_object, child_name, parent_node,
+                              self._depths[parent_node] + 1)
 
     def first_top_level_item(self):
-        if len(self._elements.keys()) == 0:
+        if len(self._objects) == 0:
             return None
-        key = self._elements.keys()[0]
-        return self._elements[key]
-
-    def most_recently_added_at_level(self, level):
-        for key in reversed(self._elements.keys()):
-            if len(key.split('.')) == level:
-                return self._elements[key], key
-        return None
-
-    def current_level(self):
-        keys = self._elements.keys()
-        if len(keys) == 0:
-            return 1
-        last_key = self._elements.keys().pop()
-        return len(last_key.split('.'))
+        return self._handed_over(0)
+
+    def node_table(self):
+        """
+        Returns the parallel sequences of the node table, and the index of
+        names, (not copies), for measuring how much memory they take.
+        """
+        return (self._objects, self._names, self._parents, self._depths,
+                self._index_of_name)
+
+    def object_at(self, node):
+        """
+        Returns the object registered at the given node, (or None if it is
+        held weakly, and has gone).
+        """
+        if self._weak:
+            return self._objects[node]()
+        return self._objects[node]
+
+    def hold_weakly(self):
+        """
+        Switches from holding strong references to the objects in the tree,
+        to holding weak ones. (Of the objects, and of the BuildTransaction.)
+        Child objects are kept alive by their parents anyway. The top level
+        objects are held strongly until each is first asked for with at() or
+        first_top_level_item(), so that they survive long enough to be handed
+        over. Thereafter, keeping them alive is the caller's responsibility.
+        """
+        if self._weak:
+            return
+        self._held_until_asked = dict(
+            (index, self._objects[index]) for index, parent in
+            enumerate(self._parents) if parent == _NO_PARENT)
+        self._objects = [weakref.ref(obj) for obj in self._objects]
+        self._weak = True
+        if self._transaction is not None:
+            self._transaction.hold_weakly()
+
+    def dispose(self):
+        """
+        Destroys the objects in the tree that the builder made, and forgets
+        them all. Objects that were found rather than made (cited with
+        ?Type) are given back to the parents they were found in, and are not
+        destroyed. The destruction is done with deleteLater(), so it is safe
+        to dispose of a tree from inside one of its own signal handlers. It
+        completes when control next returns to the event loop.
+        """
+        if self._disposed:
+            return
+        if self._transaction is not None:
+            self._transaction.roll_back()
+        else:
+            for index, parent in enumerate(self._parents):
+                obj = self.object_at(index)
+                if parent == _NO_PARENT and is_alive(obj):
+                    obj.deleteLater()
+        self._disposed = True
+        self._held_until_asked = {}
+        self._objects = []
+        self._names = []
+        self._parents = array('l')
+        self._depths = array('l')
+        self._index_of_name = {}
 
     def is_empty(self):
-        return len(self._elements.keys()) == 0
+        return len(self._objects) == 0
+
+    def path_of(self, node):
+        """
+        Computes the dotted path name of the given node, e.g.
+        'my_page.layout.my_widget'.
+        """
+        segments = []
+        while node != _NO_PARENT:
+            segments.append(self._names[node])
+            node = self._parents[node]
+        segments.reverse()
+        return '.'.join(segments)
 
     def dump(self):
-        key_lengths = [len(key) for key in self._elements.keys()]
-        pad_columns = max(key_lengths) + 4
+        paths = [self.path_of(node) for node in range(len(self._objects))]
+        pad_columns = max(len(path) for path in paths) + 4
         lines = []
-        for key, obj in self._elements.items():
-            line = key.ljust(pad_columns) + obj.__class__.__name__
-            lines.append(line)
+        for node, path in enumerate(paths):
+            obj = self.object_at(node)
+            if is_alive(obj):
+                class_name = obj.__class__.__name__
+            else:
+                class_name = '(destroyed)'
+            lines.append(path.ljust(pad_columns) + class_name)
         return '\n'.join(lines)
 
     # ------------------------------------------------------------------------
     # Private below
 
-    def _all_names(self):
-        names = [self._name_segment(path) for path in self._elements.keys()]
-        return names
+    def _raise_if_disposed(self, name):
+        if self._disposed:
+            raise LayoutError("""
+                Cannot find <%s>, because the objects built have been
+                disposed of.
+            """, name)
+
+    def _node_of(self, name):
+        # The node with the given (possibly dotted) name, or None. Names are
+        # unique, so only the ancestors named need be checked.
+        segments = name.split('.')
+        node = self._index_of_name.get(segments[-1], None)
+        ancestor = node
+        for segment in reversed(segments[:-1]):
+            if ancestor is None:
+                break
+            ancestor = self._parents[ancestor]
+            if ancestor == _NO_PARENT or self._names[ancestor] != segment:
+                return None
+        return node
+
+    def _handed_over(self, index):
+        # The object at the given node, for the caller to keep.
+        obj = self.object_at(index)
+        self._held_until_asked.pop(index, None)
+        if not is_alive(obj):
+            raise LayoutError("""
+                The object called <%s> has been destroyed. (Qt deletes
+                the objects in a window when it is closed, if it has been
+                told to, and otherwise when nothing refers to it any more.)
+            """, self._names[index])
+        return obj
+
+    def _add_node(self, object_to_register, name, parent_node, depth):
+        if name in self._index_of_name:
+            raise LayoutError("""
+                The name you have given this item (<%s>), has already
+                been used.
+            """, name)
+        name = _intern(name)
+        index = len(self._objects)
+        self._objects.append(object_to_register)
+        self._names.append(name)
+        self._parents.append(parent_node)
+        self._depths.append(depth)
+        self._index_of_name[name] = index
+        return index
+
+
+def _intern(name):
+    # Only byte strings can be interned. Names parsed from unicode input
+    # are kept as they are.
+    if isinstance(name, str):
+        return intern(name)
+    return name
+
 
-    def _name_segment(self, path):
-        return path.split('.').pop()
+_NO_PARENT = -1
@@ -0,0 +1,140 @@
+import csv
+import mmap
+from array import array
+
+from PySide.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+
+
+class LazyFileModel(QAbstractTableModel):
+    """
+    A read-only table model backed by a data file, for QListView and
+    QTableView, which loads lazily no matter how big the file is.
+
+    The file is memory mapped rather than read. At first the model has no
+    rows. Each time the view asks to fetchMore() (which it does as it is
+    scrolled towards the end of what it has), the model finds where the
+    next batch of lines starts, and records those offsets in a compact
+    array. A row's text is only sliced out of the map when the view asks
+    for it.
+
+    A file whose name ends in .csv is taken to be comma separated, with a
+    header line naming the columns. Any other file has one row per line, in
+    a single column, with no header.
+    """
+
+    def __init__(self, file_path, parent=None, batch_size=1000):
+        """
+        :param file_path: The data file.
+        :param parent: Typically the view.
+        :param batch_size: How many rows to add at each fetchMore().
+        :raises LayoutError: When the file cannot be read.
+        """
+        super(LazyFileModel, self).__init__(parent)
+        self._batch_size = batch_size
+        self._map = _map_file(file_path)
+        self._size = len(self._map) if self._map is not None else 0
+        # The start of each row found so far, followed by where the next
+        # row would start.
+        self._offsets = array('L', [0])
+        self._header = None
+        self._is_csv = file_path.lower().endswith('.csv')
+        if self._is_csv and self._size > 0:
+            self._header = self._columns_of(self._next_line_at(0))
+            self._offsets[0] = self._end_of_line_at(0)
+        self._column_count = len(self._header) if self._header else 1
+        # The most recently parsed rows, by row number.
+        self._row_cache = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._offsets) - 1
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._column_count
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._offsets[-1] < self._size
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        new_offsets = []
+        start = self._offsets[-1]
+        while len(new_offsets) < self._batch_size and start < self._size:
+            start = self._end_of_line_at(start)
+            new_offsets.append(start)
+        first_new_row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first_new_row,
+                             first_new_row + len(new_offsets) - 1)
+        self._offsets.extend(new_offsets)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        columns = self._row(index.row())
+        if index.column() >= len(columns):
+            return None
+        return columns[index.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal and self._header is not None:
+            if section < len(self._header):
+                return self._header[section]
+            return None
+        return section + 1
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _row(self, row):
+        columns = self._row_cache.get(row)
+        if columns is None:
+            if len(self._row_cache) >= _ROW_CACHE_SIZE:
+                self._row_cache.clear()
+            columns = self._columns_of(self._next_line_at(self._offsets[row]))
+            self._row_cache[row] = columns
+        return columns
+
+    def _columns_of(self, line):
+        if self._is_csv:
+            return [column.decode('utf-8', 'replace') for column in
+                    next(csv.reader([line]))]
+        return [line.decode('utf-8', 'replace')]
+
+    def _end_of_line_at(self, start):
+        newline = self._map.find('\n', start)
+        if newline == -1:
+            return self._size
+        return newline + 1
+
+    def _next_line_at(self, start):
+        return self._map[start:self._end_of_line_at(start)].rstrip('\r\n')
+
+
+def _map_file(file_path):
+    # Returns None for an empty file, which cannot be mapped.
+    try:
+        with open(file_path, 'rb') as data_file:
+            data_file.seek(0, 2)
+            if data_file.tell() == 0:
+                return None
+            return mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except EnvironmentError as e:
+        raise LayoutError("""
+            Cannot read this data file: <%s>.
+            The underlying error reported is:
+            %s.
+        """, (file_path, str(e)))
+
+
+_ROW_CACHE_SIZE = 1000
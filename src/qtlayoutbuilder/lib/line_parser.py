@@ -14,7 +14,9 @@ class LineParser(object):
         When so, the others are undefined. If it is not a comment or blank,
         the remaining returned items partition out: the length of the leading
         indentation string, the name string, the type string, and the contents
-        of any parenthesised content after the type word.
+        of any parenthesised content after the type word. The type string
+        includes any position in square brackets and item list in curly
+        braces that follow the type word, (which may contain spaces).
         :param line: The line to parse.
         :return: (is_a_comment, is_blank, indent, name, type, parenthesised)
         """
@@ -23,12 +25,16 @@ class LineParser(object):
             return True, False, None, None, None, None
         if len(line.strip()) == 0:
             return False, True, None, None, None, None
-        original_line = line
+        # The item list comes out first, because it may contain spaces and
+        # parentheses.
+        original_line, braces = regex_helpers.capture_braces(line)
         parenthesised = regex_helpers.capture_parenthesis(original_line)
         cls._assert_nothing_follows_parenthesis(original_line, parenthesised)
         working_line = regex_helpers.remove_parenthesis(original_line)
         indent = cls._measure_and_validate_indent(working_line)
         name, type_string = cls._parse_name_and_type(working_line)
+        if braces is not None:
+            type_string += braces
         return False, False, indent, name, type_string, parenthesised
 
     # --------------------------------------------------------
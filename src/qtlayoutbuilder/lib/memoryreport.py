@@ -0,0 +1,213 @@
+import sys
+from collections import OrderedDict
+
+
+class BuildMemoryReport(object):
+    """
+    Reports how much memory one build accounts for, to help size processes
+    that keep many built UIs alive. Pass a new one in to each build you want
+    to measure, and read it afterwards, (even if the build failed).
+
+        memory_report = BuildMemoryReport()
+        layouts = build_from_file(file_path, memory_report=memory_report)
+        print memory_report.report()
+
+    It measures the Python objects that each stage of the build makes, with
+    sys.getsizeof(), counting each object only once:
+
+        input copies: The input text, and the left shifted copy of its lines
+        that the parser works on.
+        parsed records: The ParsedLine(s), apart from the lines they keep,
+        (which are the parser's, and so counted as input copies).
+        LayoutsCreated node table: What the built hierarchy is looked up by.
+        error strings: The message of the LayoutError, if the build failed.
+
+    Where tracemalloc can be imported, it also gives the net Python
+    allocations made by the parsing and instantiation stages, (starting
+    tracemalloc for the build if it is not already tracing, and stopping it
+    when the build finishes, fails or is abandoned). The memory that
+    Qt allocates in C++ is not visible to either, so the number of Qt objects
+    made for each class is reported too.
+    """
+
+    def __init__(self):
+        self._kept_bytes = OrderedDict(
+            (category, 0) for category in _CATEGORIES)
+        self._stage_bytes = OrderedDict()
+        self._qt_object_counts = {}
+        self._seen = set()  # ids of the objects measured so far.
+        self._line_ids = set()  # ids of the parser's lines, while parsing.
+        self._tracemalloc = _tracemalloc()
+        self._started_tracing = False
+        self._stage = None  # (name, traced bytes at start) of open stage.
+
+    def kept_bytes(self):
+        """
+        :return: An OrderedDict of the bytes measured with sys.getsizeof(),
+        keyed on category, (see the class description).
+        """
+        return OrderedDict(self._kept_bytes)
+
+    def stage_bytes(self):
+        """
+        :return: An OrderedDict of the net bytes allocated by each stage that
+        has finished, according to tracemalloc. Empty if tracemalloc is not
+        available.
+        """
+        return OrderedDict(self._stage_bytes)
+
+    def qt_object_counts(self):
+        """
+        :return: A dictionary of the number of QObjects the builder made,
+        keyed on class name. Objects cited with ?Type are not included, and
+        nor are QSpacerItems, which are not QObjects.
+        """
+        return dict(self._qt_object_counts)
+
+    def report(self):
+        """
+        Returns all of the above as text.
+        """
+        kept = list(self._kept_bytes.items())
+        kept.append(('total', sum(self._kept_bytes.values())))
+        sections = [_table(
+            'Python memory measured with sys.getsizeof(), in bytes:', kept)]
+        if self._tracemalloc is None:
+            sections.append(
+                'tracemalloc is not available, so the allocations made by '
+                'each stage are not reported.')
+        else:
+            sections.append(_table(
+                'Python allocations made by each stage (tracemalloc), '
+                'in bytes:', self._stage_bytes.items()))
+        sections.append(_table(
+            'Qt objects made, by class:',
+            sorted(self._qt_object_counts.items(),
+                   key=lambda item: (-item[1], item[0]))))
+        return '\n\n'.join(sections)
+
+    # -------------------------------------------------------------------------
+    # The Builder calls these as the build progresses.
+
+    def parsing_started(self, one_big_string):
+        self._measure('input copies', one_big_string)
+        self._start_stage('parsing')
+
+    def input_lines_made(self, lines):
+        # The parser calls this with its copy of the lines, most of which has
+        # gone by the time it has finished, (after which the ids of those
+        # objects can be reused). So it is measured now, and the ids of the
+        # lines are kept apart until it is known which of them live on in
+        # the parsed records. What measuring allocates is left out of the
+        # parsing stage.
+        traced_before = self._traced_bytes()
+        self._line_ids = set(id(line) for line in lines)
+        self._kept_bytes['input copies'] += _size_of(lines, set())
+        if self._stage is not None:
+            name, traced_at_start = self._stage
+            self._stage = (name, traced_at_start + self._traced_bytes() -
+                           traced_before)
+
+    def parsing_ended(self, parsed_lines):
+        self._end_stage()
+        # The lines that the parsed records keep have been measured already.
+        self._seen.update(id(parsed_line.line) for parsed_line in parsed_lines
+                          if id(parsed_line.line) in self._line_ids)
+        self._line_ids = set()
+        self._measure('parsed records', parsed_lines)
+
+    def instantiation_started(self):
+        self._start_stage('instantiation')
+
+    def instantiation_ended(self, layouts_created, created_qobjects):
+        self._end_stage()
+        self._stop_tracing()
+        self._measure('LayoutsCreated node table',
+                      layouts_created.node_table())
+        for created_qobject in created_qobjects:
+            class_name = created_qobject.__class__.__name__
+            self._qt_object_counts[class_name] = \
+                self._qt_object_counts.get(class_name, 0) + 1
+
+    def build_failed(self, error):
+        self._end_stage()
+        self._stop_tracing()
+        self._measure('error strings', str(error))
+
+    def build_abandoned(self):
+        self._end_stage()
+        self._stop_tracing()
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _measure(self, category, thing):
+        self._kept_bytes[category] += _size_of(thing, self._seen)
+
+    def _start_stage(self, name):
+        if self._tracemalloc is None:
+            return
+        if not self._tracemalloc.is_tracing():
+            self._tracemalloc.start()
+            self._started_tracing = True
+        self._stage = (name, self._tracemalloc.get_traced_memory()[0])
+
+    def _traced_bytes(self):
+        if self._tracemalloc is None or not self._tracemalloc.is_tracing():
+            return 0
+        return self._tracemalloc.get_traced_memory()[0]
+
+    def _end_stage(self):
+        if self._stage is None:
+            return
+        name, traced_at_start = self._stage
+        self._stage = None
+        self._stage_bytes[name] = \
+            self._tracemalloc.get_traced_memory()[0] - traced_at_start
+
+    def _stop_tracing(self):
+        if self._started_tracing:
+            self._tracemalloc.stop()
+            self._started_tracing = False
+
+
+def _size_of(thing, seen):
+    # The size of the thing, and of what it contains, leaving out the objects
+    # whose ids are in seen, (and adding those it measures). Other objects
+    # (e.g. Qt wrappers) are measured, but not what they refer to.
+    if id(thing) in seen:
+        return 0
+    seen.add(id(thing))
+    size = sys.getsizeof(thing)
+    if isinstance(thing, dict):
+        for key, value in thing.items():
+            size += _size_of(key, seen) + _size_of(value, seen)
+    elif isinstance(thing, (list, tuple)):
+        for item in thing:
+            size += _size_of(item, seen)
+    return size
+
+
+def _table(title, rows):
+    rows = list(rows)
+    if not rows:
+        return title + '\n  (none)'
+    width = max(len(name) for name, _ in rows)
+    return '\n'.join([title] + ['  %s  %d' % (name.ljust(width), value)
+                                for name, value in rows])
+
+
+def _tracemalloc():
+    # Imported when first needed, like shiboken is (see qtobjects).
+    if not _TRACEMALLOC:
+        try:
+            import tracemalloc
+        except ImportError:
+            tracemalloc = None
+        _TRACEMALLOC.append(tracemalloc)
+    return _TRACEMALLOC[0]
+
+
+_CATEGORIES = ('input copies', 'parsed records', 'LayoutsCreated node table',
+               'error strings')
+_TRACEMALLOC = []  # Holds the tracemalloc module (or None) once imported.
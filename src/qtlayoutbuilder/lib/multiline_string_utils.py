@@ -22,19 +22,7 @@ class MultilineString(object):
         the opening triple quote and ends on the line before the closing 
         triple quote.
         """
-        topped_and_tailed = MultilineString.remove_empty_first_and_last_lines(
-            input_string)
-        lines = topped_and_tailed.split('\n')
-        shortest = 999
-        shortest_string = ''
-        for line in lines:
-            string, length = get_leading_spaces(line)
-            if length < shortest:
-                shortest = length
-                shortest_string = string
-        new_lines = [line.replace(shortest_string, '', 1) for line in lines]
-        result = '\n'.join(new_lines)
-        return result
+        return '\n'.join(cls._left_shifted_lines(input_string))
 
     @classmethod
     def get_as_left_shifted_lines(cls, multiline_string):
@@ -42,8 +30,7 @@ class MultilineString(object):
         Similar to the shift_left() function above, but returns the result,
         as an array of the lines thus formed.
         """
-        shifted = cls.shift_left(multiline_string)
-        return shifted.split('\n')
+        return cls._left_shifted_lines(multiline_string)
 
     @classmethod
     def remove_empty_first_and_last_lines(cls, input_string):
@@ -57,12 +44,7 @@ class MultilineString(object):
         # present in the input.
         if len(lines) <= 2:
             return input_string
-
-        while ((len(lines) > 0) and (len(lines[0].strip()) == 0)):
-            del lines[0]
-        while ((len(lines) > 0) and (len(lines[-1].strip()) == 0)):
-            del lines[-1]
-        return '\n'.join(lines)
+        return '\n'.join(cls._without_empty_first_and_last(lines))
 
     @classmethod
     def normalise(cls, input_string):
@@ -76,3 +58,37 @@ class MultilineString(object):
         lines = topped_and_tailed.split('\n')
         lines = [line.strip() for line in lines]
         return '\n'.join(lines)
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    @classmethod
+    def _left_shifted_lines(cls, input_string):
+        # The work of shift_left(), which keeps the lines it works on as a
+        # list, rather than joining them up only to split them again.
+        lines = input_string.split('\n')
+        if len(lines) > 2:
+            lines = cls._without_empty_first_and_last(lines)
+            if len(lines) == 0:
+                lines = ['']
+        shortest = 999
+        shortest_string = ''
+        for line in lines:
+            string, length = get_leading_spaces(line)
+            if length < shortest:
+                shortest = length
+                shortest_string = string
+        return [line.replace(shortest_string, '', 1) for line in lines]
+
+    @classmethod
+    def _without_empty_first_and_last(cls, lines):
+        # Slices the whitespace only lines off both ends in one go, rather
+        # than deleting them from the front one at a time, which moves all
+        # the remaining lines each time.
+        first = 0
+        while first < len(lines) and len(lines[first].strip()) == 0:
+            first += 1
+        end = len(lines)
+        while end > first and len(lines[end - 1].strip()) == 0:
+            end -= 1
+        return lines[first:end]
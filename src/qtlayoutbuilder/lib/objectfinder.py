@@ -1,4 +1,8 @@
 import gc
+import sys
+import types
+import weakref
+from collections import OrderedDict
 
 
 class ObjectFinder(object):
@@ -10,49 +14,234 @@ class ObjectFinder(object):
     called 'my_banana'. The results will include subclasses of Banana too.
 
     The search for objects of the qualifying classes is relatively expensive,
-    but is done at construction time only. The find_objects() query method then
-    has a relatively small search space and is consequently inexpensive.
+    so it is done only once, at the time of the first query, and the
+    resultant snapshot of candidate objects is kept for subsequent queries.
+    The find_objects() query method then has a relatively small search space
+    and is consequently inexpensive. This makes it worthwhile to keep one of
+    these alive across several builds.
+
+    The snapshot holds only weak references to the candidates, so keeping a
+    finder alive does not keep alive the objects it has seen. Objects
+    instantiated after the snapshot was taken are not seen until catch_up()
+    or refresh() is called.
+
+    Before resorting to a snapshot, callers can try find_objects_in_callers(),
+    which looks only in the scope of the functions on the call stack, and so
+    costs in proportion to the depth of the stack rather than the size of the
+    heap.
+
+    By default, taking the snapshot starts with a full garbage collection, and
+    then scans every object the garbage collector tracks. On a big heap both
+    of these stall the calling thread, so the constructor offers options to
+    scan less:
+
+    - collect_garbage=False skips the collection. The price is that objects
+      which are already garbage (unreachable reference cycles) but not yet
+      collected can still be found, which can provoke spurious ambiguity.
+    - roots=(some_module, some_frame, ...) scans only the objects reachable
+      from the given roots by following at most root_depth references.
+      Objects reachable only by a longer chain of references, or only from
+      elsewhere, are missed.
     """
 
-    def __init__(self, class_filters):
+    def __init__(self, class_filters, collect_garbage=True, roots=None,
+                 root_depth=4):
         """
         :param class_filters: The list of classes (class objects) you wish
         to search for instances of. E.g. (Banana, Apple).
+        :param collect_garbage: Run a full garbage collection before scanning.
+        :param roots: Scan only the objects reachable from these objects.
+        :param root_depth: How many references to follow from the roots.
         """
         if len(class_filters) == 0:
             raise RuntimeError('You must provide at least one class')
-        self._available_objects = _assemble_available_objects(class_filters)
+        self._class_filters = tuple(class_filters)
+        self._collect_garbage = collect_garbage
+        self._roots = roots
+        self._root_depth = root_depth
+        self._snapshot = None  # Assembled on demand.
 
     def find_objects(self, reference_name):
         """
         The main API search function. See example in class doc string.
 
-        Finds the objects that were instantiated at the time the constructor
-        was called, and which passed the constructor's class filter criteria,
+        Finds the objects that were instantiated at the time the snapshot
+        was taken, and which passed the constructor's class filter criteria,
         and which are referenced (somewhere in your program) by a variable
         (or attribute) having the name you have specified.
         :param reference_name: Name of variable or attribute to search for.
         :return: A list of objects that satisfy the search.
         """
-        return [obj for obj in self._available_objects if
+        if self._snapshot is None:
+            self._snapshot = _WeakSnapshot(self._assemble_available_objects())
+        return [obj for obj in self._snapshot.live_objects() if
                 _is_referenced_by_name(obj, reference_name)]
 
-        # -------------------------------------------------------------------------
-        # Private below
-        # -------------------------------------------------------------------------
+    def find_objects_in_callers(self, reference_name, depth,
+                                skip_modules=()):
+        """
+        Finds the objects which pass the constructor's class filter criteria,
+        and which are referenced by the name you have specified from the
+        scope of one of the functions on the call stack. I.e. by a local
+        variable (or argument) of the function, or by an attribute of an
+        object that is a local variable (which includes self). Takes no
+        snapshot.
+        :param reference_name: Name of variable or attribute to search for.
+        :param depth: How many calling functions to look in, starting with
+        the nearest.
+        :param skip_modules: Prefixes of the names of modules whose functions
+        are stepped over, (and not counted in the depth).
+        :return: A list of objects that satisfy the search, without
+        duplicates.
+        """
+        found = []
+        found_ids = set()
+        frame = sys._getframe(1)
+        while frame is not None and depth > 0:
+            module_name = frame.f_globals.get('__name__', '')
+            if not module_name.startswith(tuple(skip_modules)):
+                depth -= 1
+                for obj in _referenced_from_scope(frame.f_locals,
+                                                  reference_name):
+                    if id(obj) not in found_ids and \
+                            _belongs_to_one_of_these_classes(
+                                obj, self._class_filters):
+                        found_ids.add(id(obj))
+                        found.append(obj)
+            frame = frame.f_back
+        return found
+
+    def has_snapshot(self):
+        """
+        Has a snapshot of the candidate objects been taken (and not since
+        discarded by refresh())?
+        """
+        return self._snapshot is not None
+
+    def catch_up(self):
+        """
+        Adds to the current snapshot (if there is one) the candidate objects
+        instantiated since it was taken, (or last caught up). This is much
+        cheaper than refresh(), because it does no garbage collection, and
+        scans only the objects that the garbage collector tracks, not the
+        objects they refer to. So an object it tracks is seen, but one that
+        is referred to only by other objects (e.g. an int in a list) is not.
+        :return: The number of objects added.
+        """
+        if self._snapshot is None:
+            return 0  # The next search takes a whole new one anyway.
+        if self._roots is not None:
+            scanned_objects = _iterate_objects_reachable_from(
+                self._roots, self._root_depth)
+        else:
+            scanned_objects = gc.get_objects()
+        return self._snapshot.add_new(
+            _candidates_among(scanned_objects, self._class_filters))
+
+    def refresh(self):
+        """
+        Discards the current snapshot, so that the next search takes a fresh
+        one, and thus sees objects instantiated since the last one was taken.
+        """
+        self._snapshot = None
+
+    # -------------------------------------------------------------------------
+    # Private below
+    # -------------------------------------------------------------------------
+
+    def _assemble_available_objects(self):
+        """
+        Provides a list of all the objects in the scope of the scan that
+        belong to the classes cited. (Or their subclasses).
+        :return: A sequence of objects.
+        """
+        if self._collect_garbage:
+            gc.collect()  # Refresh
+        if self._roots is not None:
+            scanned_objects = _iterate_objects_reachable_from(
+                self._roots, self._root_depth)
+        else:
+            scanned_objects = _iterate_all_objects()
+        return _candidates_among(scanned_objects, self._class_filters)
+
+
+class _WeakSnapshot(object):
+    """
+    Holds a sequence of objects by weak reference where possible (and by
+    strong reference for the few types that do not support weak references),
+    in the order they were provided.
+    """
+
+    def __init__(self, objects):
+        # References keyed on the id() of the object referred to.
+        self._references = OrderedDict()
+        self.add_new(objects)
+
+    def add_new(self, objects):
+        """
+        Adds those of the given objects that are not already held, (and
+        forgets those that have gone). Returns how many were added.
+        """
+        for obj_id, reference in self._references.items():
+            if reference() is None:
+                del self._references[obj_id]
+        added = 0
+        for obj in objects:
+            reference = self._references.get(id(obj))
+            if reference is not None and reference() is obj:
+                continue
+            self._references[id(obj)] = _make_reference(obj)
+            added += 1
+        return added
+
+    def live_objects(self):
+        live = [reference() for reference in self._references.values()]
+        return [obj for obj in live if obj is not None]
 
 
-def _objects_filtered_on_class(objects, class_filters):
+def _make_reference(obj):
     """
-    Returns a copy of the list of objects provided, from which have
-    been removed, all objects that do not belong to one of the classes
-    cited by the class filters. (Or their subclasses).
-    :param objects: Input objects.
+    Returns a callable that returns the given object, or None once the object
+    has been destroyed.
+    """
+    try:
+        return weakref.ref(obj)
+    except TypeError:
+        return lambda: obj
+
+
+def _candidates_among(objects, class_filters):
+    """
+    Consumes the (potentially enormous) stream of objects provided, keeping
+    only those that belong to one of the classes cited by the class filters.
+    (Or their subclasses). The memory used is thus proportional to the number
+    of objects kept, not the number scanned.
+    :param objects: Input objects (an iterable).
     :param class_filters: Qualifying classes.
-    :return: Output objects.
+    :return: A list of the qualifying objects, without duplicates.
     """
-    return [obj for obj in objects if
-            _belongs_to_one_of_these_classes(obj, class_filters)]
+    # Most objects belong to a handful of types, so the verdict is cached
+    # by type to avoid repeating the isinstance() checks for every object.
+    # The type is used rather than the __class__ attribute, because reading
+    # an attribute of a weakref.proxy whose object has gone raises
+    # ReferenceError.
+    qualifies_by_type = {}
+    candidates = []
+    candidate_ids = set()
+    for obj in objects:
+        obj_type = type(obj)
+        if obj_type in _TYPES_NOT_CACHED:
+            qualifies = _belongs_to_one_of_these_classes(obj, class_filters)
+        else:
+            qualifies = qualifies_by_type.get(obj_type, None)
+            if qualifies is None:
+                qualifies = _belongs_to_one_of_these_classes(
+                    obj, class_filters)
+                qualifies_by_type[obj_type] = qualifies
+        if qualifies and id(obj) not in candidate_ids:
+            candidate_ids.add(id(obj))
+            candidates.append(obj)
+    return candidates
 
 
 def _is_referenced_by_name(obj, name):
@@ -80,53 +269,57 @@ def _is_referenced_by_name(obj, name):
     return False
 
 
-def _assemble_available_objects(class_filters):
+def _referenced_from_scope(local_variables, name):
     """
-    Provides a list of all objects known to the garbage collector that
-    belong to the classes cited. (Or their subclasses).
-    :param class_filters: The classes you wish to qualify.
-    (Apple, Banana).
-    :return: A sequence of objects.
+    Generates the objects referred to by the given name from the given local
+    variables of a function: the variable of that name, and the attribute of
+    that name of each of the variables.
     """
-    all_objects = _get_all_objects()
-    filtered = [obj for obj in all_objects if
-                _belongs_to_one_of_these_classes(obj, class_filters)]
-    return filtered
+    if name in local_variables:
+        yield local_variables[name]
+    for value in local_variables.values():
+        try:
+            attributes = getattr(value, '__dict__', None)
+        except ReferenceError:
+            continue  # A weakref.proxy whose object has gone.
+        if isinstance(attributes, dict) and name in attributes:
+            yield attributes[name]
 
 
-def _get_all_objects():
+def _iterate_all_objects():
     """
-    Provides a sequence of all the objects being tracked by the garbage
-    collector at this time.
-    :return: The objects.
+    Generates all the objects being tracked by the garbage collector at this
+    time, together with the objects they refer to. Objects are generated one by one, and may be generated
+    more than once.
     """
-    gc.collect()  # Refresh
-    first_tier_objs = gc.get_objects()  # These are always container objects.
-
-    # Now add-in the objects referred to inside the containers.
-    all_objects_by_id = {}  # Avoid duplicates.
-    for first_tier_obj in first_tier_objs:
-        obj_id = id(first_tier_obj)
-        if obj_id not in all_objects_by_id:
-            all_objects_by_id[obj_id] = first_tier_obj
-        _add_second_tier_objects(first_tier_obj, all_objects_by_id)
-    return all_objects_by_id.values()
+    # These are always container objects.
+    for first_tier_obj in gc.get_objects():
+        yield first_tier_obj
+        # The garbage collector knows what objects the first tier container
+        # holds references to, which catches objects it does not track.
+        for second_tier_obj in gc.get_referents(first_tier_obj):
+            yield second_tier_obj
 
 
-def _add_second_tier_objects(first_tier_obj, all_objects_by_id):
+def _iterate_objects_reachable_from(roots, depth):
     """
-    Augments the all_objects_by_id dictionary provided, with entries for
-    the objects referred to by the given first tier object.
-    :param first_tier_obj:
-    :param all_objects_by_id: The dictionary to update.
-    :return:
+    Generates the given root objects, and those reachable from them by
+    following at most depth references.
     """
-    # The garbage collector knows what objects the first tier container holds
-    # references to.
-    second_tier_objs = gc.get_referents(first_tier_obj)
-    for second_tier_obj in second_tier_objs:
-        obj_id = id(second_tier_obj)
-        all_objects_by_id[obj_id] = second_tier_obj
+    reached_by_id = {}
+    frontier = list(roots)
+    for obj in frontier:
+        reached_by_id[id(obj)] = obj
+    for _ in range(depth):
+        next_frontier = []
+        for obj in frontier:
+            for referent in gc.get_referents(obj):
+                obj_id = id(referent)
+                if obj_id not in reached_by_id:
+                    reached_by_id[obj_id] = referent
+                    next_frontier.append(referent)
+        frontier = next_frontier
+    return reached_by_id.itervalues()
 
 
 def _belongs_to_one_of_these_classes(obj, classes):
@@ -137,9 +330,12 @@ def _belongs_to_one_of_these_classes(obj, classes):
     :param classes: The qualifying classes.
     :return: Boolean.
     """
-    for cls in classes:
-        if isinstance(obj, cls):
-            return True
+    try:
+        for cls in classes:
+            if isinstance(obj, cls):
+                return True
+    except ReferenceError:
+        pass  # A weakref.proxy whose object has gone.
     return False
 
 
@@ -182,3 +378,10 @@ def _is_referenced_by_a_dict(referrers, obj, name):
 
 def _is_a_(obj, class_name):
     return obj.__class__.__name__ == class_name
+
+
+# The types whose instances do not all belong to the same class, (old-style
+# class instances, and weak reference proxies, which stand in for the
+# objects they refer to), for which the class cannot be cached by type.
+_TYPES_NOT_CACHED = (types.InstanceType, weakref.ProxyType,
+                     weakref.CallableProxyType)
@@ -4,8 +4,6 @@ import shutil
 from datetime import datetime
 from os import path
 
-from PySide.QtGui import QDesktopServices
-
 from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
 
 
@@ -45,6 +43,9 @@ class OriginalFileReWriter(object):
         # C:\Users\<user_namer>\AppData\Local\python\qtlayoutbuilder\
         # Each file is timestamped like this:
         # archived_input-20170417-003554.txt
+        # (Qt is imported here so that merely importing this module does not
+        # import QtGui.)
+        from PySide.QtGui import QDesktopServices
 
         dir_for_archive_copy = path.join(
             QDesktopServices.storageLocation(QDesktopServices.DataLocation),
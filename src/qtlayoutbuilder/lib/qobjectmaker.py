@@ -1,5 +1,4 @@
-# So that we can construct any QObject from a string.
-from PySide.QtGui import *
+from timeit import default_timer
 
 from qtlayoutbuilder.api.layouterror import LayoutError
 from qtlayoutbuilder.lib.qtclassnameprompter import QtClassNamePrompter
@@ -12,8 +11,14 @@ class QObjectMaker(object):
     of what you might have meant when it can't recognize the class you
     asked for.
     """
-    def __init__(self, widget_and_layout_finder):
+    def __init__(self, widget_and_layout_finder, profiler=None):
+        """
+        :param widget_and_layout_finder: For the objects cited with ?Type.
+        :param profiler: Optionally, a BuildProfiler to tell how long each
+        constructor took.
+        """
         self._widget_and_layout_finder = widget_and_layout_finder
+        self._profiler = profiler
 
     def make(self, name, type_word):
         if type_word.startswith('?'):
@@ -28,12 +33,16 @@ class QObjectMaker(object):
         """
         Instantiates a QObject of the type specified by the name.
         """
+        # QtGui is imported here rather than at module scope, so that
+        # importing the builder does not cost the import of QtGui, until a
+        # build actually needs it.
+        from PySide import QtGui
 
         # First see if the constructor can be found.
 
         try:
-            constructor = globals()[type_word]
-        except KeyError:
+            constructor = getattr(QtGui, type_word)
+        except AttributeError:
             raise LayoutError("""
                 Python cannot find this word in the QtGui namespace: <%s>,
                 Did you mean one of these:
@@ -44,8 +53,11 @@ class QObjectMaker(object):
         # Deal with one special case (pity - but adding stretch to QxBoxLayout
         # is too common not to support.
         if type_word == 'QSpacerItem':
-            instance = QSpacerItem(
-                0, 0, QSizePolicy.Expanding, QSizePolicy.Expanding)
+            started = default_timer()
+            instance = QtGui.QSpacerItem(
+                0, 0, QtGui.QSizePolicy.Expanding,
+                QtGui.QSizePolicy.Expanding)
+            self._record_construction(type_word, started)
             return instance
 
         # Now the general case.
@@ -53,7 +65,9 @@ class QObjectMaker(object):
         # Have a go at constructing it, and then make sure it is a class derived
         # from QLayout or QWidget.
         try:
+            started = default_timer()
             instance = constructor()
+            self._record_construction(type_word, started)
         except Exception as e:
             raise LayoutError("""
                     Cannot instantiate one of these: <%s>.
@@ -64,15 +78,19 @@ class QObjectMaker(object):
             """, (type_word, str(e)))
 
         # Make sure it is a QWidget or QLayout
-        if isinstance(instance, QWidget):
+        if isinstance(instance, QtGui.QWidget):
             return instance
-        if isinstance(instance, QLayout):
+        if isinstance(instance, QtGui.QLayout):
             return instance
         raise LayoutError("""
             This class name: <%s>, instantiates successfully,
             but is neither a QLayout nor a QWidget.
         """, type_word)
 
+    def _record_construction(self, type_word, started):
+        if self._profiler is not None:
+            self._profiler.constructed(type_word, default_timer() - started)
+
     def _find_existing_object(self, name, type_word):
         """
         Tries to find an already-instantiated QWidget or QLayout that is of
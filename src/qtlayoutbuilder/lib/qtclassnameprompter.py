@@ -1,8 +1,3 @@
-import difflib
-
-from PySide import QtGui
-
-
 class QtClassNamePrompter(object):
     """
     Capable of providing a list of similar looking Qt class names to the
@@ -11,6 +6,9 @@ class QtClassNamePrompter(object):
 
     @classmethod
     def suggest_names_similar_to_this(cls, name):
+        # Imported here, because this is only needed when reporting errors.
+        import difflib
+        from PySide import QtGui
         all_qtgui_names = dir(QtGui)
         lower_cased = [n.lower() for n in all_qtgui_names]
         # The search is done in lower-case space, so we need a map to return
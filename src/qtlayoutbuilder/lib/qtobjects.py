@@ -0,0 +1,28 @@
+def is_alive(qt_object):
+    """
+    Returns False if the given object is None, or is a Python wrapper for a
+    Qt object that has been deleted (on the C++ side). Shiboken knows which
+    wrappers these are. Where it cannot be imported, wrappers are assumed to
+    be alive. Objects other than wrappers are alive.
+    """
+    if qt_object is None:
+        return False
+    shiboken = _shiboken()
+    return shiboken is None or shiboken.isValid(qt_object)
+
+
+# -----------------------------------------------------------------------------
+# Private below.
+
+def _shiboken():
+    # Imported when first needed, like Qt itself is.
+    if not _SHIBOKEN:
+        try:
+            import shiboken
+        except ImportError:
+            shiboken = None
+        _SHIBOKEN.append(shiboken)
+    return _SHIBOKEN[0]
+
+
+_SHIBOKEN = []  # Holds the shiboken module (or None) once imported.
@@ -22,5 +22,48 @@ def capture_parenthesis(line):
     return paren[1:-1]
 
 
+def capture_braces(line):
+    """
+    Finds the item list in curly braces that can follow the type word of a
+    line (and its position in square brackets, if any), e.g. the
+    '{red|green}' in 'colours  QComboBox{red|green}(ignored)'.
+    :return: (the line with the braces and their contents removed, the
+    braces and their contents); or (line, None) if there are none.
+    """
+    match = _BRACES_REGEX.match(line)
+    if not match:
+        return line, None
+    return match.group(1) + line[match.end():], match.group(2)
+
+
+def split_off_braces(type_string):
+    """
+    Splits a type string like 'QComboBox{a|b}' into the type string and the
+    contents of the curly braces: ('QComboBox', 'a|b'). The second item is
+    None when there are no curly braces.
+    """
+    match = _TRAILING_BRACES_REGEX.match(type_string)
+    if not match:
+        return type_string, None
+    return match.group(1), match.group(2)
+
+
+def split_off_brackets(type_string):
+    """
+    Splits a type string like 'QLabel[1,2]' into the type word and the
+    contents of the square brackets: ('QLabel', '1,2'). The second item is
+    None when there are no square brackets.
+    """
+    match = _BRACKETS_REGEX.match(type_string)
+    if not match:
+        return type_string, None
+    return match.group(1), match.group(2)
+
+
 _PARENTHESIS_REGEX = re.compile(r'\(.*\)')
+_BRACKETS_REGEX = re.compile(r'([^\[]*)\[(.*)\]$')
+# Indent, name and type word, followed by braces. The contents of the braces
+# can be anything except a closing brace.
+_BRACES_REGEX = re.compile(r'(\s*\S+\s+[^\s(){}]+)(\{[^}]*\})')
+_TRAILING_BRACES_REGEX = re.compile(r'([^{]*)\{(.*)\}$')
 _COMMENT_REGEX = re.compile(r'#.*')
@@ -0,0 +1,267 @@
+from xml.etree import ElementTree
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib.builder import text_setter_name
+from qtlayoutbuilder.lib.inputparser import NO_PARENT, with_line_context
+from qtlayoutbuilder.lib.itemlists import ItemLists
+from qtlayoutbuilder.lib.unicode_escapes import decode_unicode_escapes
+
+
+class UiExporter(object):
+    """
+    Converts the builder's parsed input into a Qt Designer .ui document, so
+    that QUiLoader can instantiate the hierarchy in C++, instead of the
+    Builder doing it one Python call at a time.
+
+    Each parent / child relationship the ChildAdder supports is mapped to
+    the .ui element that makes QUiLoader do the same thing:
+
+    - A layout in a widget (setLayout) becomes a <layout> inside the
+      <widget>.
+    - A widget, layout or spacer in a layout (addWidget, addLayout and
+      addSpacerItem) becomes an <item> of the <layout>. In a QGridLayout or
+      QFormLayout, the item has the row, column and spans of the child's
+      position. (Which is required, because the .ui format has no way to
+      say "in the next free cell".)
+    - A widget in a QTabWidget (addTab) becomes a page, titled tab_1,
+      tab_2 ... like the builder does.
+    - A widget in a QScrollArea (setWidget) becomes its content widget,
+      and the scroll area is made widget resizable, like the builder does.
+    - A widget in any other widget that has addWidget() (e.g. QStackedWidget
+      or QSplitter) becomes a <widget> inside the <widget>.
+
+    Text in parenthesis becomes the text or title property, and an item list
+    in curly braces becomes <item>s of the <widget>. The .ui format
+    can describe only a single top level widget, and has no way to refer to
+    existing objects, so input with more than one top level item, or with
+    ?Type lines, cannot be exported.
+    """
+
+    @classmethod
+    def export(cls, parsed_lines, provenance):
+        """
+        :param parsed_lines: The output of InputParser.parse().
+        :param provenance: Where the input came from, for error messages.
+        :raises LayoutError:
+        :return: The .ui document, as a UTF-8 encoded string.
+        """
+        # Exporting needs to know what kind of thing each class is, for
+        # which there is no substitute for asking Qt.
+        from PySide import QtGui
+        ui = ElementTree.Element('ui', version='4.0')
+        # One (element, qt_class) per parsed line.
+        exported = []
+        tab_numbers = {}  # Of the tabs added so far, by QTabWidget line.
+        item_lists = ItemLists(provenance)
+        for parsed_line in parsed_lines:
+            try:
+                exported.append(cls._export_line(
+                    parsed_line, exported, ui, tab_numbers, item_lists, QtGui))
+            except LayoutError as e:
+                raise with_line_context(e, parsed_line.line,
+                                        parsed_line.line_number, provenance)
+        return ElementTree.tostring(ui, encoding='utf-8')
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    @classmethod
+    def _export_line(cls, parsed_line, exported, ui, tab_numbers, item_lists,
+                     QtGui):
+        qt_class = cls._qt_class(parsed_line.type_word, QtGui)
+        if qt_class is QtGui.QSpacerItem:
+            element = ElementTree.Element('spacer', name=parsed_line.name)
+        elif issubclass(qt_class, QtGui.QLayout):
+            element = ElementTree.Element(
+                'layout', {'class': parsed_line.type_word,
+                           'name': parsed_line.name})
+        else:
+            element = ElementTree.Element(
+                'widget', {'class': parsed_line.type_word,
+                           'name': parsed_line.name})
+        cls._add_text(element, qt_class, parsed_line.parenthesised)
+        if parsed_line.items is not None:
+            cls._add_items(element, qt_class, item_lists.items(
+                parsed_line.items))
+
+        if parsed_line.parent == NO_PARENT:
+            if len(ui) != 0:
+                raise LayoutError("""
+                    A .ui file can describe only one top level item, so
+                    this cannot be exported.
+                """, ())
+            if element.tag != 'widget':
+                raise LayoutError("""
+                    The top level item in a .ui file must be a QWidget,
+                    so this cannot be exported.
+                """, ())
+            ui.append(element)
+            return element, qt_class
+
+        parent_element, parent_class = exported[parsed_line.parent]
+        if parent_element.tag == 'layout':
+            if element.tag == 'spacer':
+                cls._add_spacer_properties(element, parent_class, QtGui)
+            item = ElementTree.SubElement(parent_element, 'item')
+            cls._add_item_position(item, parsed_line, parent_class, QtGui)
+            item.append(element)
+        elif parsed_line.position is not None:
+            cls._raise_cannot_position(parsed_line, parent_class)
+        elif parent_element.tag == 'widget' and element.tag == 'layout':
+            if parent_element.find('layout') is not None:
+                cls._raise_cannot_add(parsed_line, parent_class)
+            parent_element.append(element)
+        elif parent_element.tag == 'widget' and element.tag == 'widget':
+            cls._add_widget_to_widget(element, parent_element, parent_class,
+                                      parsed_line, tab_numbers, QtGui)
+        else:
+            cls._raise_cannot_add(parsed_line, parent_class)
+        return element, qt_class
+
+    @classmethod
+    def _qt_class(cls, type_word, QtGui):
+        if type_word.startswith('?'):
+            raise LayoutError("""
+                Objects cited with ?Type exist only in a running program,
+                so cannot be exported to a .ui file.
+            """, ())
+        qt_class = getattr(QtGui, type_word, None)
+        if qt_class is QtGui.QSpacerItem:
+            return qt_class
+        if not isinstance(qt_class, type) or not issubclass(
+                qt_class, (QtGui.QLayout, QtGui.QWidget)):
+            raise LayoutError("""
+                This is not the name of a QLayout or QWidget class in the
+                QtGui namespace: <%s>.
+            """, type_word)
+        return qt_class
+
+    @classmethod
+    def _add_widget_to_widget(cls, element, parent_element, parent_class,
+                              parsed_line, tab_numbers, QtGui):
+        # The same preference order as the ChildAdder has.
+        if hasattr(parent_class, 'addWidget'):
+            pass
+        elif hasattr(parent_class, 'addTab'):
+            tab_number = tab_numbers.get(parsed_line.parent, 0) + 1
+            tab_numbers[parsed_line.parent] = tab_number
+            attribute = ElementTree.SubElement(element, 'attribute',
+                                               name='title')
+            ElementTree.SubElement(attribute, 'string').text = \
+                'tab_%d' % tab_number
+        elif hasattr(parent_class, 'setWidget'):
+            if parent_element.find('widget') is not None:
+                cls._raise_cannot_add(parsed_line, parent_class)
+            if issubclass(parent_class, QtGui.QScrollArea):
+                cls._add_property(parent_element, 'widgetResizable', 'bool',
+                                  'true')
+        else:
+            cls._raise_cannot_add(parsed_line, parent_class)
+        parent_element.append(element)
+
+    @classmethod
+    def _add_item_position(cls, item, parsed_line, layout_class, QtGui):
+        position = parsed_line.position
+        is_grid = issubclass(layout_class, QtGui.QGridLayout)
+        is_form = issubclass(layout_class, QtGui.QFormLayout)
+        if not is_grid and not is_form:
+            if position is not None:
+                cls._raise_cannot_position(parsed_line, layout_class)
+            return
+        if position is None:
+            raise LayoutError("""
+                The children of a <%s> must have a position in square
+                brackets, like this: [row,column], to be exported to a .ui
+                file.
+            """, layout_class.__name__)
+        row, column, row_span, column_span = position
+        if is_form and (row_span != 1 or
+                        (column, column_span) not in _FORM_COLUMNS):
+            raise LayoutError("""
+                This child: <%s> cannot be put in that position in a
+                QFormLayout. The position must be [row,0] for a label,
+                [row,1] for a field, or [row,0,1,2] to span both columns.
+            """, parsed_line.name)
+        item.set('row', str(row))
+        item.set('column', str(column))
+        if row_span != 1:
+            item.set('rowspan', str(row_span))
+        if column_span != 1:
+            item.set('colspan', str(column_span))
+
+    @classmethod
+    def _add_text(cls, element, qt_class, parenthesised):
+        if not parenthesised:
+            return
+        text = _as_qt_reads(decode_unicode_escapes(parenthesised))
+        setter_name = text_setter_name(qt_class)
+        if setter_name is None:
+            raise LayoutError("""
+                Cannot do anything with the text you specified
+                in parenthesis because the object being created
+                has neither of the following methods: setText(), or setTitle().
+                """, ())
+        property_name = {'setText': 'text', 'setTitle': 'title'}[setter_name]
+        cls._add_property(element, property_name, 'string', text)
+
+    @classmethod
+    def _add_items(cls, element, qt_class, items):
+        if not hasattr(qt_class, 'addItems'):
+            raise LayoutError("""
+                Cannot do anything with the item list you specified in
+                curly braces, because the object being created has no
+                addItems() method.
+            """, ())
+        for text in items:
+            item = ElementTree.SubElement(element, 'item')
+            cls._add_property(item, 'text', 'string', _as_qt_reads(text))
+
+    @classmethod
+    def _add_spacer_properties(cls, element, layout_class, QtGui):
+        # The builder's spacers expand in both directions, but a .ui spacer
+        # expands in one, which must be along its (box) layout.
+        if issubclass(layout_class, QtGui.QHBoxLayout):
+            orientation = 'Qt::Horizontal'
+        else:
+            orientation = 'Qt::Vertical'
+        cls._add_property(element, 'orientation', 'enum', orientation)
+        size_hint = ElementTree.SubElement(element, 'property',
+                                           name='sizeHint', stdset='0')
+        size = ElementTree.SubElement(size_hint, 'size')
+        ElementTree.SubElement(size, 'width').text = '0'
+        ElementTree.SubElement(size, 'height').text = '0'
+
+    @classmethod
+    def _add_property(cls, element, name, value_tag, value):
+        property_element = ElementTree.SubElement(element, 'property',
+                                                  name=name)
+        ElementTree.SubElement(property_element, value_tag).text = value
+
+    @classmethod
+    def _raise_cannot_position(cls, parsed_line, parent_class):
+        raise LayoutError("""
+            This child: <%s> has a position in square brackets, but
+            its parent is a: <%s>. Only the children of a QGridLayout
+            or a QFormLayout can have positions.
+        """, (parsed_line.name, parent_class.__name__))
+
+    @classmethod
+    def _raise_cannot_add(cls, parsed_line, parent_class):
+        raise LayoutError("""
+            The .ui format has no way to add this child: <%s> to its
+            parent, which is a: <%s>.
+        """, (parsed_line.name, parent_class.__name__))
+
+
+def _as_qt_reads(text):
+    # The unicode of the given text, as PySide makes it from a str when the
+    # builder gives it to Qt, (i.e. as Latin-1), so that the .ui document
+    # shows the same text as the builder does.
+    if isinstance(text, str):
+        return text.decode('latin-1')
+    return text
+
+
+# The (column, column_span) combinations that a QFormLayout can hold: label,
+# field, and spanning both.
+_FORM_COLUMNS = ((0, 1), (1, 1), (0, 2))
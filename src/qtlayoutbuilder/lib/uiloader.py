@@ -0,0 +1,111 @@
+from xml.etree import ElementTree
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib.layoutscreated import LayoutsCreated
+
+
+class UiLoader(object):
+    """
+    Instantiates the hierarchy described by a .ui document (for example one
+    written by UiExporter) using QUiLoader, and then registers the objects
+    created in a LayoutsCreated object, so that they can be queried by name
+    just as if the Builder had made them.
+
+    QUiLoader gives every widget and layout the object name it has in the
+    document, so those are found by name. Spacers are not QObjects and
+    have no name, so each is found instead by its position in its parent
+    layout: the cell it occupies in a grid or form layout, and otherwise its
+    index.
+    """
+
+    @classmethod
+    def load(cls, ui_document, provenance):
+        """
+        :param ui_document: The .ui document, as a UTF-8 encoded string.
+        :param provenance: Where the document came from, for error messages.
+        :raises LayoutError:
+        :return: A LayoutsCreated object.
+        """
+        from PySide.QtCore import QBuffer, QByteArray, QIODevice, QObject
+        from PySide.QtUiTools import QUiLoader
+
+        try:
+            top_element = ElementTree.fromstring(ui_document).find('widget')
+        except ElementTree.ParseError as e:
+            raise LayoutError("""
+                This is not a valid .ui document: <%s>.
+                The underlying error reported is: %s.
+            """, (provenance, str(e)))
+        ui_buffer = QBuffer()
+        ui_buffer.setData(QByteArray(ui_document))
+        ui_buffer.open(QIODevice.ReadOnly)
+        top_widget = QUiLoader().load(ui_buffer)
+        if top_widget is None or top_element is None:
+            raise LayoutError("""
+                QUiLoader could not load anything from this .ui
+                document: <%s>.
+            """, provenance)
+
+        # One pass over the objects created, rather than one search for each
+        # name.
+        objects_by_name = dict(
+            (qobject.objectName(), qobject) for qobject in
+            top_widget.findChildren(QObject))
+        layouts_created = LayoutsCreated()
+        top_node = layouts_created.register_top_level_object(
+            top_widget, top_element.get('name'))
+        cls._register_children(top_element, top_node, objects_by_name,
+                               layouts_created)
+        return layouts_created
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    @classmethod
+    def _register_children(cls, parent_element, parent_node, objects_by_name,
+                           layouts_created):
+        item_number = 0
+        for child in parent_element:
+            # The items of a layout hold its children, whereas the items of
+            # (say) a QComboBox hold only properties.
+            if child.tag == 'item' and child[0].tag != 'property':
+                element = child[0]
+                position = item_number
+                item_number += 1
+            elif child.tag in ('widget', 'layout'):
+                element = child
+                position = None
+            else:
+                continue
+            name = element.get('name')
+            if element.tag == 'spacer':
+                parent_layout = layouts_created.object_at(parent_node)
+                qobject = cls._spacer_at(parent_layout, child, position)
+            elif name in objects_by_name:
+                qobject = objects_by_name[name]
+            else:
+                raise LayoutError("""
+                    QUiLoader did not create anything called <%s>.
+                """, name)
+            node = layouts_created.register_child(qobject, parent_node, name)
+            cls._register_children(element, node, objects_by_name,
+                                   layouts_created)
+
+    @classmethod
+    def _spacer_at(cls, parent_layout, item_element, index):
+        from PySide.QtGui import QFormLayout, QGridLayout
+        row = item_element.get('row')
+        if row is not None and isinstance(parent_layout, QGridLayout):
+            layout_item = parent_layout.itemAtPosition(
+                int(row), int(item_element.get('column')))
+        elif row is not None and isinstance(parent_layout, QFormLayout):
+            if item_element.get('colspan') == '2':
+                role = QFormLayout.SpanningRole
+            elif item_element.get('column') == '0':
+                role = QFormLayout.LabelRole
+            else:
+                role = QFormLayout.FieldRole
+            layout_item = parent_layout.itemAt(int(row), role)
+        else:
+            layout_item = parent_layout.itemAt(index)
+        return layout_item.spacerItem()
@@ -0,0 +1,24 @@
+from qtlayoutbuilder.api.layouterror import LayoutError
+
+
+def decode_unicode_escapes(parenthesised):
+    """
+    Returns the text given in parenthesis on an input line, with any unicode
+    escapes in it decoded.
+    """
+    # Most text has no escapes in it, and then there is nothing to decode.
+    if '\\' not in parenthesised:
+        return parenthesised
+    # We parse the parenthises text using the same function as python
+    # does itself when it parses string literals in source code. This
+    # means the parenthesised text can be like this: # 'hello \u25c0'.
+    # In that case 25c0 is a solid left-pointing arrow.
+    try:
+        return parenthesised.decode('raw_unicode-escape')
+    except Exception as e:
+        raise LayoutError("""
+            Python raised an exception when the builder tried to
+            deal with unicode encoded values in your text: <%s>. The
+            underlying python error was:
+            %s
+        """, (parenthesised, str(e)))
@@ -1,5 +1,3 @@
-from PySide.QtGui import QLayout, QWidget
-
 from qtlayoutbuilder.lib.objectfinder import ObjectFinder
 
 
@@ -18,12 +16,40 @@ class WidgetAndLayoutFinder(object):
     ADDITIONAL filtering criteria - which is the particular class you want to
     find.
 
-    Note that construction of this class is expensive, but subsequent searches
-    with it are not.
+    Each search looks first in the scope of the functions that called the
+    builder: their local variables, and the attributes of those (which
+    include the attributes of self). That is where the objects sought almost
+    always are. Only when nothing is found there is the heap scanned.
+
+    Note that the first heap scan with an instance of this class is expensive,
+    but subsequent searches with it are not. So it is
+    worth keeping one alive across builds, and passing it in to each. The
+    builder calls build_started() at the start of each build, and the first
+    search of the existing snapshot after that adds to it the objects
+    instantiated since it was taken (see ObjectFinder.catch_up()), which is
+    cheaper than a new snapshot. So an object made since the previous build
+    is found, and one made with the same name as an object found before
+    makes the search ambiguous, as it should. Later searches in the same
+    build use the snapshot as it is.
     """
 
-    def __init__(self):
-        self._object_finder = ObjectFinder([QLayout, QWidget])
+    def __init__(self, collect_garbage=True, roots=None, root_depth=4,
+                 caller_depth=5):
+        """
+        The optional arguments limit the scope of the heap scan, trading
+        completeness for speed. See ObjectFinder for what each one costs.
+        :param caller_depth: How many calling functions (outside of the
+        builder itself) to look in before scanning the heap. Zero to always
+        scan the heap.
+        """
+        self._caller_depth = caller_depth
+        self._catch_up_due = False
+        # Not imported at module scope, so that lint and reformat tools
+        # which import the builder never load QtGui.
+        from PySide.QtGui import QLayout, QWidget
+        self._object_finder = ObjectFinder(
+            [QLayout, QWidget], collect_garbage=collect_garbage, roots=roots,
+            root_depth=root_depth)
 
     def find(self, particular_class, reference_name):
         """
@@ -35,13 +61,54 @@ class WidgetAndLayoutFinder(object):
         :return: A sequence of matching objects.
         """
 
+        if self._caller_depth > 0:
+            found = self._filtered(
+                self._object_finder.find_objects_in_callers(
+                    reference_name, self._caller_depth, _BUILDER_MODULES),
+                particular_class)
+            if len(found) != 0:
+                return found
+
+        # An existing snapshot may be missing objects made since it was
+        # taken; either the object sought, or others with the same name.
+        # Catching up scans the heap, so it is done once per build.
+        if self._catch_up_due:
+            self._catch_up_due = False
+            self._object_finder.catch_up()
+        return self._find_in_snapshot(particular_class, reference_name)
+
+    def build_started(self):
+        """
+        Tells the finder that a new build has started, so that its next
+        search adds to the snapshot the objects instantiated since the
+        previous build.
+        """
+        self._catch_up_due = True
+
+    def refresh(self):
+        """
+        Discards the snapshot of candidate objects, so that the next search
+        takes a fresh one.
+        """
+        self._object_finder.refresh()
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _find_in_snapshot(self, particular_class, reference_name):
         # First find all the QLayouts and QWidgets that are referenced by
         # that name.
         found = self._object_finder.find_objects(reference_name)
 
         # Now reduce to only those of the specified particular class.
+        return self._filtered(found, particular_class)
+
+    @classmethod
+    def _filtered(cls, found, particular_class):
+        return [obj for obj in found if
+                obj.__class__.__name__ == particular_class]
 
-        filtered = [obj for obj in found if
-                    obj.__class__.__name__ == particular_class]
 
-        return filtered
+# The functions of these modules are the builder's own, in which the objects
+# sought are not to be found.
+_BUILDER_MODULES = ('qtlayoutbuilder.lib.', 'qtlayoutbuilder.api.')
@@ -1,8 +1,18 @@
+import json
+import shutil
+import tempfile
+from os import path
 from unittest import TestCase
 
-from PySide.QtGui import QApplication, QPushButton, QVBoxLayout
+from PySide.QtCore import QCoreApplication, QEvent, QObject
+from PySide.QtGui import QApplication, QFormLayout, QLabel, QPushButton, \
+    QTabWidget, QVBoxLayout, QWidget
 
+from qtlayoutbuilder.api.layouterror import LayoutError
 from qtlayoutbuilder.lib.builder import Builder
+from qtlayoutbuilder.lib.buildprofiler import BuildProfiler
+from qtlayoutbuilder.lib.lazyfilemodel import LazyFileModel
+from qtlayoutbuilder.lib.memoryreport import BuildMemoryReport
 from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
 from qtlayoutbuilder.lib_test.test_utils import \
     raises_layout_error_with_this_message, \
@@ -278,6 +288,111 @@ class TestBuilder(TestCase):
         widget = layouts_created.at('page2')
         self.assertTrue(isinstance(widget.layout(), QVBoxLayout))
 
+    def test_building_in_slices_yields_progress_and_same_result(self):
+        str_input = """
+            page        QWidget
+              layout    QVBoxLayout
+                a       QLabel
+                b       QLabel
+        """
+        # A zero length slice gets one line done per slice.
+        slices = list(Builder.build_in_slices(
+            str_input, 'unit test provenance', slice_seconds=0))
+        progress = [(done, total) for _, done, total in slices]
+        self.assertEqual(progress, [(1, 4), (2, 4), (3, 4), (4, 4)])
+        layouts_created = slices[-1][0]
+        self.assertEqual(layouts_created.at('layout').count(), 2)
+
+    def test_tabs_are_numbered_afresh_for_each_build(self):
+        str_input = """
+            tabs        QTabWidget
+              a         QWidget
+              b         QWidget
+        """
+        for _ in range(2):
+            layouts_created = Builder.build(str_input, 'unit test provenance')
+            tabs = layouts_created.at('tabs')
+            self.assertEqual(tabs.tabText(0), 'tab_1')
+            self.assertEqual(tabs.tabText(1), 'tab_2')
+
+    def test_grid_and_form_positions(self):
+        str_input = """
+            page            QWidget
+              layout        QVBoxLayout
+                grid        QGridLayout
+                  a         QLabel[0,0]
+                  b         QPushButton[4,1,1,2](b)
+                form        QFormLayout
+                  c         QLabel[0,0](c)
+                  d         QPushButton[0,1](d)
+        """
+        layouts_created = Builder.build(str_input, 'unit test provenance')
+        grid = layouts_created.at('grid')
+        self.assertEqual(grid.rowCount(), 5)
+        self.assertEqual(grid.columnCount(), 3)
+        self.assertIs(grid.itemAtPosition(4, 2).widget(),
+                      layouts_created.at('b'))
+        form = layouts_created.at('form')
+        self.assertIs(form.itemAt(0, QFormLayout.FieldRole).widget(),
+                      layouts_created.at('d'))
+
+    def test_item_lists_populate_combo_boxes(self):
+        str_input = """
+            page        QWidget
+              layout    QVBoxLayout
+                colours QComboBox{red|green|blue}
+        """
+        layouts_created = Builder.build(str_input, 'unit test provenance')
+        colours = layouts_created.at('colours')
+        self.assertEqual([colours.itemText(i) for i in range(colours.count())],
+                         ['red', 'green', 'blue'])
+        self.assertFalse(colours.signalsBlocked())
+
+    def test_item_list_data_file_gives_views_a_lazy_model(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            input_path = path.join(tmp_dir, 'input.txt')
+            open(input_path, 'w').close()
+            with open(path.join(tmp_dir, 'people.csv'), 'w') as data_file:
+                data_file.write('name,age\nann,31\n')
+            str_input = """
+                page        QWidget
+                  layout    QVBoxLayout
+                    people  QTableView{@people.csv}
+            """
+            layouts_created = Builder.build(str_input, input_path)
+            model = layouts_created.at('people').model()
+            self.assertIsInstance(model, LazyFileModel)
+            self.assertEqual(model.columnCount(), 2)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_failed_builds_leave_no_widgets_alive(self):
+        # Everything the builds make, layouts and spacers included, is a
+        # descendant of a widget that they find, and that outlives them, so
+        # only the roll back can get rid of it. The error comes after the
+        # objects on the earlier lines, and the one on the failing line,
+        # have been made.
+        str_input = """
+            host                ?QWidget
+              layout            QVBoxLayout
+                label           QLabel(hello)
+                stretch         QSpacerItem
+                inner           QWidget
+                  inner_layout  QHBoxLayout
+                broken          QVBoxLayout(hello)
+        """
+        host = QWidget()
+        widgets_before = self._live_widget_count()
+        for _ in range(2000):
+            self.assertRaises(LayoutError, Builder.build, str_input,
+                              'unit test provenance')
+            # Lets the deleteLater() calls take effect, so that the next
+            # build can give the host a layout.
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.assertEqual(host.findChildren(QObject), [])
+        self.assertEqual(self._live_widget_count(), widgets_before)
+
     def test_adding_text_unicode_decode_works(self):
         str_input = """
             page        QWidget
@@ -319,6 +434,14 @@ class TestBuilder(TestCase):
         widget = layouts_created.at('label')
         self.assertEqual(widget.text(), 'hello')
 
+    def test_adding_text_with_backslash_but_no_unicode_escape(self):
+        str_input = r"""
+            label       QLabel(C:\temp)
+        """
+        layouts_created = Builder.build(str_input, 'unit test provenenance')
+        widget = layouts_created.at('label')
+        self.assertEqual(widget.text(), r'C:\temp')
+
     def test_adding_text_works_using_set_title(self):
         str_input = """
             group       QGroupBox(hello)
@@ -327,5 +450,74 @@ class TestBuilder(TestCase):
         widget = layouts_created.at('group')
         self.assertEqual(widget.title(), 'hello')
 
+    def test_profiler_records_each_class_and_add_method(self):
+        str_input = """
+            page          QWidget
+              layout      QVBoxLayout
+                a         QLabel(a)
+                b         QLabel(b)
+                grid      QGridLayout
+                  c       QPushButton[0,0](c)
+        """
+        profiler = BuildProfiler()
+        Builder.build(str_input, 'unit test provenance', profiler=profiler)
+        profile = json.loads(profiler.as_json())
+        self.assertEqual(
+            sorted(profile.keys()),
+            ['QGridLayout', 'QLabel', 'QPushButton', 'QVBoxLayout',
+             'QWidget'])
+        self.assertEqual(profile['QLabel']['constructed'], 2)
+        self.assertEqual(profile['QLabel']['add_methods'],
+                         {'QVBoxLayout.addWidget': 2})
+        self.assertEqual(profile['QVBoxLayout']['add_methods'],
+                         {'QWidget.setLayout': 1})
+        self.assertEqual(profile['QPushButton']['add_methods'],
+                         {'QGridLayout.addWidget': 1})
+        # The top level object is made, but not added to anything.
+        self.assertEqual(profile['QWidget']['constructed'], 1)
+        self.assertEqual(profile['QWidget']['added'], 0)
+
+    def test_memory_report_covers_the_whole_build(self):
+        str_input = """
+            page          QWidget
+              layout      QVBoxLayout
+                a         QLabel(a)
+                b         QLabel(b)
+                found     ?QLabel
+                stretch   QSpacerItem
+        """
+        found = QLabel()
+        memory_report = BuildMemoryReport()
+        Builder.build(str_input, 'unit test provenance',
+                      memory_report=memory_report)
+        kept = memory_report.kept_bytes()
+        self.assertGreater(kept['parsed records'], 0)
+        self.assertGreater(kept['LayoutsCreated node table'], 0)
+        self.assertEqual(kept['error strings'], 0)
+        # The label that was found was not made, and the spacer is not a
+        # QObject.
+        self.assertEqual(memory_report.qt_object_counts(), {
+            'QWidget': 1, 'QVBoxLayout': 1, 'QLabel': 2})
+
+    def test_memory_report_measures_the_error_of_a_failed_build(self):
+        str_input = """
+            page          QWidget
+              layout      QVBoxLayout
+                a         QNoSuchWidget
+        """
+        memory_report = BuildMemoryReport()
+        self.assertRaises(LayoutError, Builder.build, str_input,
+                          'unit test provenance', memory_report=memory_report)
+        self.assertGreater(memory_report.kept_bytes()['error strings'], 0)
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    @classmethod
+    def _live_widget_count(cls):
+        # Lets the deleteLater() calls take effect first.
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        return len(QApplication.allWidgets())
+
 
 _MOCK_LINE = 'mock line'
@@ -0,0 +1,55 @@
+import json
+from unittest import TestCase
+
+from qtlayoutbuilder.lib.buildprofiler import BuildProfiler
+from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
+
+
+class TestBuildProfiler(TestCase):
+
+    def _make_profiler(self):
+        profiler = BuildProfiler()
+        profiler.constructed('QLabel', 0.001)
+        profiler.constructed('QLabel', 0.001)
+        profiler.added('QLabel', 'QVBoxLayout', 'addWidget', 0.0005)
+        profiler.added('QLabel', 'QGridLayout', 'addWidget', 0.0005)
+        profiler.constructed('QCalendarWidget', 0.02)
+        profiler.added('QCalendarWidget', 'QVBoxLayout', 'addWidget', 0.001)
+        profiler.constructed('QVBoxLayout', 0.0001)
+        profiler.added('QVBoxLayout', 'QWidget', 'setLayout', 0.0001)
+        return profiler
+
+    def test_report_puts_the_most_costly_class_first(self):
+        report = MultilineString.normalise(self._make_profiler().report())
+        expected = MultilineString.normalise("""
+            Class            Made  Construct ms  Added  Add ms  Total ms  Add methods that worked
+            QCalendarWidget  1     20.000        1      1.000   21.000    QVBoxLayout.addWidget x1
+            QLabel           2     2.000         2      1.000   3.000     QGridLayout.addWidget x1, QVBoxLayout.addWidget x1
+            QVBoxLayout      1     0.100         1      0.100   0.200     QWidget.setLayout x1
+        """)
+        self.assertEqual(report, expected)
+
+    def test_json_accumulates_counts_and_times(self):
+        profile = json.loads(self._make_profiler().as_json())
+        self.assertEqual(profile['QLabel'], {
+            'constructed': 2,
+            'construct_seconds': 0.002,
+            'added': 2,
+            'add_seconds': 0.001,
+            'add_methods': {
+                'QGridLayout.addWidget': 1,
+                'QVBoxLayout.addWidget': 1,
+            }
+        })
+
+    def test_json_is_in_a_stable_order(self):
+        dumped = self._make_profiler().as_json()
+        self.assertLess(dumped.index('QCalendarWidget'),
+                        dumped.index('QLabel'))
+        self.assertLess(dumped.index('"constructed"'),
+                        dumped.index('"construct_seconds"'))
+
+    def test_clear_forgets_everything(self):
+        profiler = self._make_profiler()
+        profiler.clear()
+        self.assertEqual(json.loads(profiler.as_json()), {})
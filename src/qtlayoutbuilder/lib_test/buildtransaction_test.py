@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from PySide.QtCore import QCoreApplication, QEvent
+from PySide.QtGui import QApplication, QLabel, QSizePolicy, QSpacerItem, \
+    QVBoxLayout, QWidget
+
+from qtlayoutbuilder.lib.buildtransaction import BuildTransaction
+
+
+class TestBuildTransaction(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Needs QApplication context.
+        super(TestBuildTransaction, cls).setUpClass()
+        try:
+            QApplication([])
+        except RuntimeError:
+            pass  # Singleton already exists
+
+    def test_found_widget_gets_its_parent_back(self):
+        owner = QWidget()
+        found = QLabel(owner)
+        new_page = QWidget()
+        new_layout = QVBoxLayout()
+        transaction = BuildTransaction()
+        transaction.created(new_page, None)
+        transaction.created(new_layout, new_page)
+        new_page.setLayout(new_layout)
+        transaction.found(found)
+        new_layout.addWidget(found)
+        self.assertIs(found.parentWidget(), new_page)
+        transaction.roll_back()
+        self.assertIs(found.parentWidget(), owner)
+
+    def test_made_objects_are_taken_out_of_found_layouts(self):
+        owner = QWidget()
+        found_layout = QVBoxLayout(owner)
+        label = QLabel()
+        spacer = QSpacerItem(0, 0, QSizePolicy.Expanding,
+                             QSizePolicy.Expanding)
+        transaction = BuildTransaction()
+        transaction.created(label, found_layout)
+        found_layout.addWidget(label)
+        transaction.created(spacer, found_layout)
+        found_layout.addSpacerItem(spacer)
+        transaction.roll_back()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.assertEqual(found_layout.count(), 0)
+        self.assertEqual(owner.children(), [found_layout])
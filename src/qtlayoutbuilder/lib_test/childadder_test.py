@@ -1,8 +1,9 @@
 from unittest import TestCase
 
 from PySide.QtCore import Qt
-from PySide.QtGui import QApplication, QHBoxLayout, QLabel, QScrollArea, \
-    QSlider, QSpacerItem, QStackedWidget, QTabWidget, QVBoxLayout, QWidget
+from PySide.QtGui import QApplication, QFormLayout, QGridLayout, \
+    QHBoxLayout, QLabel, QScrollArea, QSlider, QSpacerItem, QStackedWidget, \
+    QTabWidget, QVBoxLayout, QWidget
 
 from qtlayoutbuilder.lib.childadder import ChildAdder
 from qtlayoutbuilder.lib_test.test_utils import \
@@ -34,36 +35,84 @@ class TestChildAdder(TestCase):
             addTab
             setWidget
             addSpacerItem
-        """, ChildAdder.add, QWidget(), 'fred', QWidget())
+        """, ChildAdder().add, QWidget(), 'fred', QWidget())
         if not result:
             self.fail()
 
     def test_add_layout_succeeding(self):
         parent = QVBoxLayout()
-        ChildAdder.add(QHBoxLayout(), 'fred', parent)
+        ChildAdder().add(QHBoxLayout(), 'fred', parent)
         self.assertEqual(parent.count(), 1)
         self.assertTrue(isinstance(parent.itemAt(0), QHBoxLayout))
 
     def test_set_layout_succeeding(self):
         parent = QWidget()
-        ChildAdder.add(QHBoxLayout(), 'fred', parent)
+        ChildAdder().add(QHBoxLayout(), 'fred', parent)
         self.assertTrue(isinstance(parent.layout(), QHBoxLayout))
 
     def test_add_widget_succeeding(self):
         parent = QStackedWidget()
-        ChildAdder.add(QLabel(), 'fred', parent)
+        ChildAdder().add(QLabel(), 'fred', parent)
         self.assertEqual(parent.count(), 1)
         self.assertTrue(isinstance(parent.currentWidget(), QLabel))
 
     def test_add_tab_succeeding(self):
         parent = QTabWidget()
-        ChildAdder.add(QLabel(), 'fred', parent)
+        ChildAdder().add(QLabel(), 'fred', parent)
         self.assertEqual(parent.count(), 1)
         self.assertTrue(isinstance(parent.currentWidget(), QLabel))
 
+    def test_tabs_are_numbered_per_instance(self):
+        for _ in range(2):
+            adder = ChildAdder()
+            parent = QTabWidget()
+            adder.add(QLabel(), 'fred', parent)
+            adder.add(QLabel(), 'bill', parent)
+            self.assertEqual(parent.tabText(0), 'tab_1')
+            self.assertEqual(parent.tabText(1), 'tab_2')
+
+    def test_add_to_grid_at_position(self):
+        parent = QGridLayout()
+        label = QLabel()
+        ChildAdder().add(label, 'fred', parent, (1, 2, 1, 3))
+        self.assertIs(parent.itemAtPosition(1, 4).widget(), label)
+        self.assertEqual(parent.getItemPosition(0), (1, 2, 1, 3))
+
+    def test_reserve_grid_rows_and_columns(self):
+        parent = QGridLayout()
+        ChildAdder().reserve(parent, 10, 4)
+        self.assertEqual(parent.rowCount(), 10)
+        self.assertEqual(parent.columnCount(), 4)
+
+    def test_add_to_form_in_each_role(self):
+        parent = QFormLayout()
+        label, field, spanning = QLabel(), QLabel(), QLabel()
+        adder = ChildAdder()
+        adder.add(label, 'label', parent, (0, 0, 1, 1))
+        adder.add(field, 'field', parent, (0, 1, 1, 1))
+        adder.add(spanning, 'spanning', parent, (1, 0, 1, 2))
+        self.assertIs(parent.itemAt(0, QFormLayout.LabelRole).widget(), label)
+        self.assertIs(parent.itemAt(0, QFormLayout.FieldRole).widget(), field)
+        self.assertIs(parent.itemAt(1, QFormLayout.SpanningRole).widget(),
+                      spanning)
+
+    def test_error_message_when_form_position_is_unusable(self):
+        self.assertTrue(raises_layout_error_with_this_message("""
+            This child: <fred> cannot be put in that position in a
+            QFormLayout. The position must be [row,0] for a label,
+            [row,1] for a field, or [row,0,1,2] to span both columns.
+        """, ChildAdder().add, QLabel(), 'fred', QFormLayout(), (0, 2, 1, 1)))
+
+    def test_error_message_when_parent_cannot_take_position(self):
+        self.assertTrue(raises_layout_error_with_this_message("""
+            This child: <fred> has a position in square brackets, but
+            its parent is a: <QVBoxLayout>. Only the children of a QGridLayout
+            or a QFormLayout can have positions.
+        """, ChildAdder().add, QLabel(), 'fred', QVBoxLayout(), (0, 0, 1, 1)))
+
     def test_set_widget_succeeding(self):
         parent = QScrollArea()
-        ChildAdder.add(QLabel(), 'fred', parent)
+        ChildAdder().add(QLabel(), 'fred', parent)
         self.assertTrue(isinstance(parent.widget(), QLabel))
         # We promise to setWidgetResizable(True), also.
         resizable = parent.widgetResizable()
@@ -71,13 +120,13 @@ class TestChildAdder(TestCase):
 
     def test_add_spacer_item_succeeding(self):
         parent = QHBoxLayout()
-        ChildAdder.add(QSpacerItem(0, 0), 'fred', parent)
+        ChildAdder().add(QSpacerItem(0, 0), 'fred', parent)
         self.assertTrue(isinstance(parent.itemAt(0), QSpacerItem))
 
     def test_qslider_intervention(self):
         parent = QHBoxLayout()
         slider = QSlider()  # Don't specify orientation.
-        ChildAdder.add(slider, 'fred', parent)
+        ChildAdder().add(slider, 'fred', parent)
         # We promise to give it horizontal (the non-default) orientation.
         orient = slider.orientation()
         self.assertEqual(orient, Qt.Orientation.Horizontal)
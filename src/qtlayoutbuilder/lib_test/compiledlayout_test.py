@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+from os import path
+from unittest import TestCase
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib.compiledlayout import CompiledLayout, \
+    compiled_path_for
+from qtlayoutbuilder.lib.inputparser import InputParser
+from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
+
+
+class TestCompiledLayout(TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._source_path = path.join(self._tmp_dir, 'layout.txt')
+        self._write_source("""
+            page          QWidget
+              layout      QVBoxLayout
+                a         QLabel(hello)
+                # A comment
+                b         QLabel(hello)
+                c         QLabel
+              other       QWidget
+                grid      QGridLayout
+                  d       QLabel[1,2,1,3](d)
+                  e       QComboBox[2,0]{x (1)|y}
+            page2         QWidget
+        """)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_compiled_lines_match_parsed_lines(self):
+        parsed_lines = self._parse_source()
+        CompiledLayout.compile(parsed_lines, self._source_path)
+        with CompiledLayout.open_if_fresh(self._source_path) as compiled:
+            self.assertEqual(len(compiled), len(parsed_lines))
+            for from_text, from_binary in zip(parsed_lines, compiled):
+                self.assertEqual(
+                    from_binary._replace(line=None),
+                    from_text._replace(line=None))
+            self.assertEqual(compiled[2].line, '    a    QLabel(hello)')
+            self.assertEqual(compiled[7].position, (1, 2, 1, 3))
+            self.assertEqual(compiled[7].line,
+                             '      d    QLabel[1,2,1,3](d)')
+            self.assertEqual(compiled[8].items, 'x (1)|y')
+
+    def test_strings_are_stored_once(self):
+        parsed_lines = self._parse_source()
+        compiled_path = CompiledLayout.compile(parsed_lines, self._source_path)
+        with open(compiled_path, 'rb') as compiled_file:
+            self.assertEqual(compiled_file.read().count('QLabel'), 1)
+
+    def test_stale_when_source_changes(self):
+        CompiledLayout.compile(self._parse_source(), self._source_path)
+        self._write_source("""
+            page          QWidget
+        """)
+        self.assertIsNone(CompiledLayout.open_if_fresh(self._source_path))
+
+    def test_fresh_when_only_modification_time_changes(self):
+        CompiledLayout.compile(self._parse_source(), self._source_path)
+        os.utime(self._source_path, (1, 1))
+        compiled = CompiledLayout.open_if_fresh(self._source_path)
+        self.assertIsNotNone(compiled)
+        compiled.close()
+
+    def test_none_when_not_compiled(self):
+        self.assertIsNone(CompiledLayout.open_if_fresh(self._source_path))
+
+    def test_error_message_when_not_a_compiled_file(self):
+        compiled_path = compiled_path_for(self._source_path)
+        with open(compiled_path, 'wb') as compiled_file:
+            compiled_file.write('not a compiled layout')
+        self.assertRaises(LayoutError, CompiledLayout.open, compiled_path)
+        self.assertIsNone(CompiledLayout.open_if_fresh(self._source_path))
+
+    def test_error_message_when_compiled_file_is_truncated(self):
+        compiled_path = CompiledLayout.compile(
+            self._parse_source(), self._source_path)
+        with open(compiled_path, 'rb') as compiled_file:
+            compiled_bytes = compiled_file.read()
+        # Cut short in the records, and in the string bytes.
+        for length in (60, len(compiled_bytes) - 1):
+            with open(compiled_path, 'wb') as compiled_file:
+                compiled_file.write(compiled_bytes[:length])
+            self.assertRaises(LayoutError, CompiledLayout.open, compiled_path)
+            self.assertIsNone(
+                CompiledLayout.open_if_fresh(self._source_path))
+
+    def test_compile_leaves_only_the_compiled_file(self):
+        CompiledLayout.compile(self._parse_source(), self._source_path)
+        CompiledLayout.compile(self._parse_source(), self._source_path)
+        self.assertEqual(sorted(os.listdir(self._tmp_dir)),
+                         ['layout.txt', 'layout.txt.qlb'])
+
+    def test_error_message_when_position_too_big_to_compile(self):
+        self._write_source("""
+            page          QWidget
+              grid        QGridLayout
+                d         QLabel[70000,0]
+        """)
+        self.assertRaises(LayoutError, CompiledLayout.compile,
+                          self._parse_source(), self._source_path)
+        self.assertEqual(os.listdir(self._tmp_dir), ['layout.txt'])
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _write_source(self, str_input):
+        with open(self._source_path, 'w') as source_file:
+            source_file.write(MultilineString.shift_left(str_input))
+
+    def _parse_source(self):
+        with open(self._source_path, 'r') as source_file:
+            return InputParser.parse(source_file.read(), self._source_path)
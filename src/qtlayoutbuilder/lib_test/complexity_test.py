@@ -0,0 +1,136 @@
+import math
+from timeit import default_timer
+from unittest import TestCase
+
+from qtlayoutbuilder.lib.inputparser import InputParser, NO_PARENT
+from qtlayoutbuilder.lib.layoutscreated import LayoutsCreated
+from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
+from qtlayoutbuilder.lib.reformatter import ReFormatter
+
+
+class Thing(object):
+    """Stands in for the QLayouts and QWidgets the builder registers."""
+    pass
+
+
+class TestComplexity(TestCase):
+    """
+    Guards against the stages of a build, that do not need Qt, slipping back
+    into doing work that grows with the square of the number of input lines.
+    Each stage is timed on synthetic input of 1k to 16k lines, and the slope
+    of log(time) against log(lines) is measured. A linear stage gives a slope
+    of about 1, (n log n a little more), while a quadratic one gives 2. The
+    threshold sits well between them, so the tests are not upset by a busy
+    machine.
+    """
+
+    def test_parsing_is_near_linear(self):
+        self._assert_near_linear(
+            'parsing',
+            lambda text: text,
+            lambda text: InputParser.parse(text, 'No input file used'))
+
+    def test_shifting_left_is_near_linear(self):
+        self._assert_near_linear(
+            'shifting left',
+            _indented_with_empty_lines,
+            MultilineString.get_as_left_shifted_lines)
+
+    def test_registration_is_near_linear(self):
+        self._assert_near_linear(
+            'registration',
+            lambda text: InputParser.parse(text, 'No input file used'),
+            _register)
+
+    def test_reformatting_is_near_linear(self):
+        self._assert_near_linear('reformatting', lambda text: text,
+                                 ReFormatter.format)
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _assert_near_linear(self, stage, prepare, run_stage):
+        """
+        :param stage: The name of the stage, for the failure message.
+        :param prepare: Makes the stage's input from the synthetic input text;
+        untimed.
+        :param run_stage: Runs the stage on what prepare() made.
+        """
+        sizes = []
+        seconds = []
+        for line_count in _LINE_COUNTS:
+            stage_input = prepare(_synthetic_input(line_count))
+            sizes.append(line_count)
+            seconds.append(_best_time(run_stage, stage_input))
+        slope = _log_log_slope(sizes, seconds)
+        self.assertLess(
+            slope, _MAX_SLOPE,
+            '%s grows as lines^%.2f, (seconds for %s lines: %s)' % (
+                stage, slope, sizes,
+                ', '.join('%.4f' % s for s in seconds)))
+
+
+def _synthetic_input(line_count):
+    # A page of groups, each with a layout holding labels, (with text), and
+    # combo boxes, (with item lists), so that every kind of line is present.
+    lines = ['page QWidget', '  page_layout QVBoxLayout']
+    group = 0
+    while len(lines) < line_count:
+        lines.append('    group_%d QGroupBox(Group %d)' % (group, group))
+        lines.append('      grid_%d QGridLayout' % group)
+        for row in range(3):
+            lines.append('        label_%d_%d QLabel[%d,0](Label %d)' % (
+                group, row, row, row))
+            lines.append('        combo_%d_%d QComboBox[%d,1]{One|Two}' % (
+                group, row, row))
+        group += 1
+    return '\n'.join(lines[:line_count])
+
+
+def _indented_with_empty_lines(text):
+    # As it would appear in a triple quoted string, but with as many empty
+    # lines before it as there are lines in it, (e.g. as a generator of input
+    # might leave), so that removing those shows up in the timings.
+    lines = ['        ' + line for line in text.split('\n')]
+    return '\n' * len(lines) + '\n'.join(lines) + '\n    \n'
+
+
+def _register(parsed_lines):
+    layouts_created = LayoutsCreated()
+    for parsed_line in parsed_lines:
+        if parsed_line.parent == NO_PARENT:
+            layouts_created.register_top_level_object(Thing(),
+                                                      parsed_line.name)
+        else:
+            layouts_created.register_child(Thing(), parsed_line.parent,
+                                           parsed_line.name)
+    return layouts_created
+
+
+def _best_time(run_stage, stage_input):
+    # The best of several runs is the one least disturbed by other work on
+    # the machine.
+    best = None
+    for _ in range(_REPEATS):
+        started = default_timer()
+        run_stage(stage_input)
+        elapsed = default_timer() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return max(best, 1e-6)
+
+
+def _log_log_slope(sizes, seconds):
+    # The least squares fit of log(seconds) against log(size).
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(s) for s in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+_LINE_COUNTS = (1000, 2000, 4000, 8000, 16000)
+_REPEATS = 3
+_MAX_SLOPE = 1.4
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from PySide.QtGui import QApplication, QLabel, QVBoxLayout, QWidget
+
+from qtlayoutbuilder.lib.constructionguard import ConstructionGuard
+
+
+class TestConstructionGuard(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Needs QApplication context.
+        super(TestConstructionGuard, cls).setUpClass()
+        try:
+            QApplication([])
+        except RuntimeError:
+            pass  # Singleton already exists
+
+    def test_suppresses_until_released(self):
+        widget = QWidget()
+        guard = ConstructionGuard()
+        guard.suppress(widget)
+        self.assertFalse(widget.updatesEnabled())
+        self.assertTrue(widget.signalsBlocked())
+        guard.release()
+        self.assertTrue(widget.updatesEnabled())
+        self.assertFalse(widget.signalsBlocked())
+
+    def test_restores_state_widget_was_found_in(self):
+        widget = QWidget()
+        widget.blockSignals(True)
+        guard = ConstructionGuard()
+        guard.suppress(widget)
+        guard.release()
+        self.assertTrue(widget.signalsBlocked())
+
+    def test_ignores_layouts(self):
+        layout = QVBoxLayout()
+        guard = ConstructionGuard()
+        guard.suppress(layout)
+        guard.release()
+        self.assertFalse(layout.signalsBlocked())
+
+    def test_visible_widget_gets_laid_out_on_release(self):
+        widget = QWidget()
+        widget.setLayout(QVBoxLayout())
+        widget.show()
+        guard = ConstructionGuard()
+        guard.suppress(widget)
+        label = QLabel('hello')
+        widget.layout().addWidget(label)
+        guard.release()
+        # Activating the layout has given the new label its geometry.
+        self.assertTrue(label.geometry().isValid())
@@ -0,0 +1,138 @@
+from multiprocessing.pool import ThreadPool
+from unittest import TestCase
+
+from qtlayoutbuilder.lib.inputparser import InputParser, NO_PARENT, \
+    extents_of_positioned_children
+from qtlayoutbuilder.lib_test.test_utils import \
+    raises_layout_error_with_this_message
+
+
+class TestInputParser(TestCase):
+
+    def test_parents_and_depths(self):
+        str_input = """
+            page           QWidget
+              vlayout      QVBoxLayout
+                a          QLabel(hello)
+                # A comment
+                fred       QWidget
+                  hlayout  QHBoxLayout
+                c          QLabel
+            page2          QWidget
+        """
+        parsed_lines = InputParser.parse(str_input, 'unit test provenance')
+        summary = [(p.name, p.depth, p.parent) for p in parsed_lines]
+        self.assertEqual(summary, [
+            ('page', 1, NO_PARENT),
+            ('vlayout', 2, 0),
+            ('a', 3, 1),
+            ('fred', 3, 1),
+            ('hlayout', 4, 3),
+            ('c', 3, 1),
+            ('page2', 1, NO_PARENT),
+        ])
+        self.assertEqual(parsed_lines[2].parenthesised, 'hello')
+        self.assertEqual(parsed_lines[2].type_word, 'QLabel')
+        self.assertEqual(parsed_lines[3].line_number, 5)
+
+    def test_parsing_in_several_threads_at_once_is_deterministic(self):
+        inputs = []
+        for i in range(20):
+            lines = ['page_%d    QWidget' % i, '  layout_%d    QVBoxLayout' % i]
+            lines.extend('    label_%d_%d    QLabel(%d)' % (i, j, j)
+                         for j in range(200))
+            inputs.append('\n'.join(lines))
+        expected = [InputParser.parse(one_input, 'unit test provenance')
+                    for one_input in inputs]
+        pool = ThreadPool(4)
+        try:
+            in_threads = pool.map(
+                lambda one_input: InputParser.parse(
+                    one_input, 'unit test provenance'), inputs)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(in_threads, expected)
+
+    def test_positions(self):
+        str_input = """
+            page           QWidget
+              grid         QGridLayout
+                a          QLabel[0,1](hello)
+                b          QLabel[2,0,1,3]
+                c          QLabel
+        """
+        parsed_lines = InputParser.parse(str_input, 'unit test provenance')
+        self.assertEqual([p.type_word for p in parsed_lines],
+                         ['QWidget', 'QGridLayout', 'QLabel', 'QLabel',
+                          'QLabel'])
+        self.assertEqual([p.position for p in parsed_lines],
+                         [None, None, (0, 1, 1, 1), (2, 0, 1, 3), None])
+        self.assertEqual(extents_of_positioned_children(parsed_lines),
+                         {1: (3, 3)})
+
+    def test_item_lists(self):
+        str_input = """
+            page           QWidget
+              layout       QVBoxLayout
+                a          QComboBox{one|two}
+                b          QListWidget{@data.txt}
+        """
+        parsed_lines = InputParser.parse(str_input, 'unit test provenance')
+        self.assertEqual([(p.type_word, p.items) for p in parsed_lines[2:]],
+                         [('QComboBox', 'one|two'),
+                          ('QListWidget', '@data.txt')])
+
+    def test_error_message_when_position_is_malformed(self):
+        self.assertTrue(raises_layout_error_with_this_message("""
+            The position in square brackets after the type word must
+            look like this: [row,column] or this:
+            [row,column,row_span,column_span]. The row and column
+            count from zero, and the spans must be at least one.
+            (This line: <  a          QLabel[0,1,0,1]>)
+            (Line number: 2, from unit test provenance)
+        """, InputParser.parse, """
+            grid         QGridLayout
+              a          QLabel[0,1,0,1]
+        """, 'unit test provenance'))
+
+    def test_error_message_when_skip_indent_levels(self):
+        str_input = """
+            page        QWidget
+                layout    QVBoxLayout
+        """
+        result = raises_layout_error_with_this_message("""
+            This line is indented too much.
+            It cannot be indented relative to the line
+            above it by more than 2 spaces.
+            (This line: <    layout    QVBoxLayout>)
+            (Line number: 2, from unit test provenance)
+            """, InputParser.parse, str_input, 'unit test provenance')
+        if not result:
+            self.fail()
+
+    def test_error_message_when_first_line_is_indented(self):
+        str_input = """
+            # A comment
+              page        QWidget
+        """
+        result = raises_layout_error_with_this_message("""
+            This line is indented too much.
+            It cannot be indented relative to the line
+            above it by more than 2 spaces.
+            (This line: <  page        QWidget>)
+            (Line number: 2, from unit test provenance)
+            """, InputParser.parse, str_input, 'unit test provenance')
+        if not result:
+            self.fail()
+
+    def test_error_message_when_no_meaningful_input_found(self):
+        str_input = """
+            # Hello
+        """
+        result = raises_layout_error_with_this_message("""
+                This input provided (unit test provenance) contains nothing, or
+                nothing except whitespace and comments.
+            """, InputParser.parse, str_input, 'unit test provenance')
+        if not result:
+            self.fail()
@@ -0,0 +1,63 @@
+import shutil
+import tempfile
+from os import path
+from unittest import TestCase
+
+from qtlayoutbuilder.lib.itemlists import ItemLists
+from qtlayoutbuilder.lib_test.test_utils import \
+    raises_layout_error_with_this_message
+
+
+class TestItemLists(TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._input_path = path.join(self._tmp_dir, 'input.txt')
+        with open(self._input_path, 'w') as input_file:
+            input_file.write('combo    QComboBox{@colours.txt}\n')
+        with open(path.join(self._tmp_dir, 'colours.txt'), 'w') as data_file:
+            data_file.write('red\ndark green\nblue\n')
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_inline_items(self):
+        items = ItemLists('unit test provenance').items(
+            'red|dark green|\\u25c0')
+        self.assertEqual(items, ['red', 'dark green', u'\u25c0'])
+
+    def test_data_file_is_relative_to_input_file_and_read_once(self):
+        item_lists = ItemLists(self._input_path)
+        first = item_lists.items('@colours.txt')
+        self.assertEqual(first, ['red', 'dark green', 'blue'])
+        self.assertIs(item_lists.items('@colours.txt'), first)
+
+    def test_added_in_one_call_with_signals_blocked(self):
+        target = _ItemTarget()
+        ItemLists('unit test provenance').apply('a|b', target)
+        self.assertEqual(target.calls, [(['a', 'b'], True)])
+        self.assertFalse(target.blocked)
+
+    def test_error_message_when_target_takes_no_items(self):
+        self.assertTrue(raises_layout_error_with_this_message("""
+            Cannot do anything with the item list you specified in
+            curly braces, because the object being created has no
+            addItems() method, (nor a setModel() method to take a
+            data file).
+        """, ItemLists('unit test provenance').apply, 'a|b', object()))
+
+
+class _ItemTarget(object):
+    # Stands in for a QComboBox.
+
+    def __init__(self):
+        self.calls = []
+        self.blocked = False
+
+    def blockSignals(self, block):
+        were_blocked = self.blocked
+        self.blocked = block
+        return were_blocked
+
+    def addItems(self, items):
+        self.calls.append((items, self.blocked))
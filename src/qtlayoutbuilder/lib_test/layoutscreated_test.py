@@ -0,0 +1,153 @@
+from unittest import TestCase
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib.layoutscreated import LayoutsCreated
+from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
+from qtlayoutbuilder.lib_test.test_utils import \
+    raises_layout_error_with_this_message, \
+    raises_layout_error_with_this_approximately_this_message
+
+
+class Thing(object):
+    """Stands in for the QLayouts and QWidgets the builder registers."""
+
+    def __init__(self):
+        self.deleted_later = False
+
+    def deleteLater(self):
+        self.deleted_later = True
+
+
+class TestLayoutsCreated(TestCase):
+
+    def _make_tree(self):
+        # page              (node 0)
+        #   layout          (node 1)
+        #     a             (node 2)
+        #     inner         (node 3)
+        #       b           (node 4)
+        #     c             (node 5)
+        layouts_created = LayoutsCreated()
+        layouts_created.register_top_level_object(Thing(), 'page')
+        layouts_created.register_child(Thing(), 0, 'layout')
+        layouts_created.register_child(Thing(), 1, 'a')
+        layouts_created.register_child(Thing(), 1, 'inner')
+        layouts_created.register_child(Thing(), 3, 'b')
+        layouts_created.register_child(Thing(), 1, 'c')
+        return layouts_created
+
+    def test_dump_shows_dotted_paths(self):
+        dumped = MultilineString.normalise(self._make_tree().dump())
+        expected = MultilineString.normalise("""
+            page                    Thing
+            page.layout             Thing
+            page.layout.a           Thing
+            page.layout.inner       Thing
+            page.layout.inner.b     Thing
+            page.layout.c           Thing
+        """)
+        # Column padding is not what we are testing here.
+        self.assertEqual(dumped.split(), expected.split())
+
+    def test_path_and_object_at_node(self):
+        layouts_created = self._make_tree()
+        self.assertEqual(layouts_created.path_of(4), 'page.layout.inner.b')
+        self.assertTrue(layouts_created.object_at(4) is
+                        layouts_created.at('b'))
+
+    def test_error_message_when_name_is_not_unique(self):
+        layouts_created = self._make_tree()
+        result = raises_layout_error_with_this_message("""
+            The name you have given this item (<b>), has already
+            been used.
+        """, layouts_created.register_top_level_object, Thing(), 'b')
+        if not result:
+            self.fail()
+
+    def test_dispose_deletes_top_level_objects_and_forgets_all(self):
+        layouts_created = self._make_tree()
+        page = layouts_created.at('page')
+        layout = layouts_created.at('layout')
+        layouts_created.dispose()
+        layouts_created.dispose()
+        self.assertTrue(page.deleted_later)
+        # Qt deletes the children along with their parents.
+        self.assertFalse(layout.deleted_later)
+        self.assertTrue(layouts_created.is_empty())
+
+    def test_error_message_when_disposed(self):
+        layouts_created = self._make_tree()
+        layouts_created.dispose()
+        result = raises_layout_error_with_this_message("""
+            Cannot find <b>, because the objects built have been
+            disposed of.
+        """, layouts_created.at, 'b')
+        if not result:
+            self.fail()
+
+    def test_weakly_held_top_level_object_is_kept_until_handed_over(self):
+        layouts_created = self._make_tree()
+        layouts_created.hold_weakly()
+        page = layouts_created.at('page')
+        self.assertIsInstance(page, Thing)
+        del page
+        result = raises_layout_error_with_this_message("""
+            The object called <page> has been destroyed. (Qt deletes
+            the objects in a window when it is closed, if it has been
+            told to, and otherwise when nothing refers to it any more.)
+        """, layouts_created.at, 'page')
+        if not result:
+            self.fail()
+
+    def test_weakly_held_children_are_not_kept_alive(self):
+        # Unlike Qt objects, these Things have no parents to keep them alive.
+        layouts_created = self._make_tree()
+        layouts_created.hold_weakly()
+        self.assertIsNone(layouts_created.object_at(4))
+        self.assertIn('(destroyed)', layouts_created.dump())
+
+    def test_dotted_names_must_match_nearest_ancestors(self):
+        layouts_created = self._make_tree()
+        self.assertTrue(layouts_created.at('inner.b') is
+                        layouts_created.object_at(4))
+        self.assertTrue(layouts_created.at('page.layout.inner.b') is
+                        layouts_created.object_at(4))
+        self.assertRaises(LayoutError, layouts_created.at, 'layout.b')
+        self.assertRaises(LayoutError, layouts_created.at, 'x.page')
+
+    def test_at_many(self):
+        layouts_created = self._make_tree()
+        found = layouts_created.at_many(['a', 'inner.b'])
+        self.assertEqual(sorted(found.keys()), ['a', 'inner.b'])
+        self.assertTrue(found['inner.b'] is layouts_created.object_at(4))
+
+    def test_at_many_accepts_any_iterable(self):
+        layouts_created = self._make_tree()
+        found = layouts_created.at_many(name for name in ('a', 'inner.b'))
+        self.assertEqual(sorted(found.keys()), ['a', 'inner.b'])
+
+    def test_error_message_lists_all_names_at_many_cannot_find(self):
+        layouts_created = self._make_tree()
+        # Column padding is not what we are testing here.
+        result = raises_layout_error_with_this_approximately_this_message("""
+            No paths can be found that end with these: <x, layout.b>.
+            These are the paths that do exist:
+
+            page                    Thing
+            page.layout             Thing
+            page.layout.a           Thing
+            page.layout.inner       Thing
+            page.layout.inner.b     Thing
+            page.layout.c           Thing
+        """, layouts_created.at_many, ['a', 'x', 'layout.b'])
+        if not result:
+            self.fail()
+
+    def test_find_by_glob_pattern(self):
+        layouts_created = self._make_tree()
+        self.assertEqual(list(layouts_created.find('[abc]').keys()),
+                         ['a', 'b', 'c'])
+        self.assertEqual(list(layouts_created.find('page.layout.*').keys()),
+                         ['page.layout.a', 'page.layout.inner',
+                          'page.layout.inner.b', 'page.layout.c'])
+        self.assertEqual(len(layouts_created.find('nothing*')), 0)
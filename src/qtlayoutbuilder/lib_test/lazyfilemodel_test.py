@@ -0,0 +1,76 @@
+import shutil
+import tempfile
+from os import path
+from unittest import TestCase
+
+from PySide.QtCore import Qt
+
+from qtlayoutbuilder.lib.lazyfilemodel import LazyFileModel
+from qtlayoutbuilder.lib_test.test_utils import \
+    raises_layout_error_with_this_message
+
+
+class TestLazyFileModel(TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_rows_arrive_in_batches(self):
+        model = LazyFileModel(self._write('lines.txt', 'a\nb\nc\nd\ne'),
+                              batch_size=2)
+        self.assertEqual(model.rowCount(), 0)
+        fetches = 0
+        while model.canFetchMore():
+            model.fetchMore()
+            fetches += 1
+        self.assertEqual(fetches, 3)
+        self.assertEqual(model.rowCount(), 5)
+        self.assertEqual(model.columnCount(), 1)
+        self.assertEqual(self._column(model, 0), ['a', 'b', 'c', 'd', 'e'])
+
+    def test_csv_has_header_and_columns(self):
+        model = LazyFileModel(self._write(
+            'people.csv', 'name,age\r\nann,31\r\n"smith, bob",42\r\n'))
+        model.fetchMore()
+        self.assertFalse(model.canFetchMore())
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.columnCount(), 2)
+        self.assertEqual(model.headerData(1, Qt.Horizontal), 'age')
+        self.assertEqual(model.headerData(0, Qt.Vertical), 1)
+        self.assertEqual(self._column(model, 0), ['ann', 'smith, bob'])
+        self.assertEqual(self._column(model, 1), ['31', '42'])
+
+    def test_only_display_role_has_data(self):
+        model = LazyFileModel(self._write('lines.txt', 'a\n'))
+        model.fetchMore()
+        self.assertIsNone(model.data(model.index(0, 0), Qt.ToolTipRole))
+
+    def test_empty_file(self):
+        model = LazyFileModel(self._write('empty.csv', ''))
+        self.assertFalse(model.canFetchMore())
+        self.assertEqual(model.rowCount(), 0)
+        self.assertEqual(model.columnCount(), 1)
+
+    def test_error_message_when_file_is_missing(self):
+        self.assertTrue(raises_layout_error_with_this_message("""
+            Cannot read this data file: <nosuchfile.txt>.
+            The underlying error reported is:
+            [Errno 2] No such file or directory: 'nosuchfile.txt'.
+        """, LazyFileModel, 'nosuchfile.txt'))
+
+    # -------------------------------------------------------------------------
+    # Private below.
+
+    def _write(self, file_name, content):
+        file_path = path.join(self._tmp_dir, file_name)
+        with open(file_path, 'wb') as data_file:
+            data_file.write(content)
+        return file_path
+
+    @classmethod
+    def _column(cls, model, column):
+        return [model.data(model.index(row, column))
+                for row in range(model.rowCount())]
@@ -27,6 +27,14 @@ class TestLineParser(TestCase):
         self.assertEqual(type_string, 'QLabel')
         self.assertEqual(parenthesised, 'hello')
 
+    def test_item_list_can_contain_spaces_and_parentheses(self):
+        is_a_comment, is_blank, indent, name, type_string, parenthesised = \
+            LineParser.parse_line(
+                '  fred    QComboBox[0,1]{Small (S)|Extra large}(hello)')
+        self.assertEqual(name, 'fred')
+        self.assertEqual(type_string, 'QComboBox[0,1]{Small (S)|Extra large}')
+        self.assertEqual(parenthesised, 'hello')
+
     def test_error_message_when_indent_is_not_multiple_of_two(self):
         result = raises_layout_error_with_this_message("""
                 A line is indented by 3 spaces.
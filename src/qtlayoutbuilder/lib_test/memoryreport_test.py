@@ -0,0 +1,170 @@
+from unittest import TestCase
+
+from qtlayoutbuilder.api.layouterror import LayoutError
+from qtlayoutbuilder.lib import memoryreport
+from qtlayoutbuilder.lib.inputparser import InputParser, NO_PARENT
+from qtlayoutbuilder.lib.layoutscreated import LayoutsCreated
+from qtlayoutbuilder.lib.memoryreport import BuildMemoryReport
+
+
+class Thing(object):
+    """Stands in for the QLayouts and QWidgets the builder registers."""
+    pass
+
+
+def _thing_for(type_word):
+    # A Thing of a subclass named after the given type word, so that it is
+    # counted as one of those.
+    if type_word not in _THING_CLASSES:
+        _THING_CLASSES[type_word] = type(type_word, (Thing,), {})
+    return _THING_CLASSES[type_word]()
+
+
+class _FakeTracemalloc(object):
+    """Stands in for tracemalloc, which Python 2 does not have."""
+
+    def __init__(self):
+        self.tracing = False
+
+    def start(self):
+        self.tracing = True
+
+    def stop(self):
+        self.tracing = False
+
+    def is_tracing(self):
+        return self.tracing
+
+    def get_traced_memory(self):
+        return 0, 0
+
+
+class _LinesRecordingReport(BuildMemoryReport):
+    """Keeps the parser's lines, to check how they were measured."""
+
+    def input_lines_made(self, lines):
+        super(_LinesRecordingReport, self).input_lines_made(lines)
+        self.lines = lines
+
+
+class TestBuildMemoryReport(TestCase):
+
+    def _build(self, memory_report, one_big_string):
+        # Does what the Builder does, but with Things instead of Qt objects.
+        memory_report.parsing_started(one_big_string)
+        parsed_lines = InputParser.parse(one_big_string, 'unit test',
+                                         memory_report)
+        memory_report.parsing_ended(parsed_lines)
+        self._parsed_lines = parsed_lines
+        memory_report.instantiation_started()
+        layouts_created = LayoutsCreated()
+        made = []
+        for parsed_line in parsed_lines:
+            thing = _thing_for(parsed_line.type_word)
+            made.append(thing)
+            if parsed_line.parent == NO_PARENT:
+                layouts_created.register_top_level_object(
+                    thing, parsed_line.name)
+            else:
+                layouts_created.register_child(
+                    thing, parsed_line.parent, parsed_line.name)
+        memory_report.instantiation_ended(layouts_created, made)
+        return layouts_created
+
+    def test_every_stage_of_a_good_build_is_measured(self):
+        memory_report = BuildMemoryReport()
+        self._build(memory_report, _INPUT)
+        kept = memory_report.kept_bytes()
+        self.assertEqual(kept.keys(), [
+            'input copies', 'parsed records', 'LayoutsCreated node table',
+            'error strings'])
+        self.assertGreater(kept['input copies'], 2 * len(_INPUT))
+        self.assertGreater(kept['parsed records'], 0)
+        self.assertGreater(kept['LayoutsCreated node table'], 0)
+        self.assertEqual(kept['error strings'], 0)
+
+    def test_memory_grows_with_the_input(self):
+        small = BuildMemoryReport()
+        self._build(small, _INPUT)
+        big = BuildMemoryReport()
+        self._build(big, _INPUT + _more_labels(100))
+        for category in ('input copies', 'parsed records',
+                         'LayoutsCreated node table'):
+            self.assertGreater(big.kept_bytes()[category],
+                               small.kept_bytes()[category])
+
+    def test_lines_kept_by_parsed_records_are_counted_once(self):
+        one_big_string = _INPUT + '        # A comment\n'
+        memory_report = _LinesRecordingReport()
+        self._build(memory_report, one_big_string)
+        kept = memory_report.kept_bytes()
+        seen = set()
+        expected = memoryreport._size_of(one_big_string, seen) + \
+            memoryreport._size_of(memory_report.lines, seen) + \
+            memoryreport._size_of(self._parsed_lines, seen)
+        self.assertEqual(kept['input copies'] + kept['parsed records'],
+                         expected)
+
+    def test_tracing_is_stopped_when_a_build_is_abandoned(self):
+        tracemalloc = _FakeTracemalloc()
+        memoryreport._TRACEMALLOC[:] = [tracemalloc]
+        try:
+            memory_report = BuildMemoryReport()
+            memory_report.parsing_started(_INPUT)
+            memory_report.parsing_ended(InputParser.parse(_INPUT, 'unit test'))
+            memory_report.instantiation_started()
+            self.assertTrue(tracemalloc.is_tracing())
+            memory_report.build_abandoned()
+        finally:
+            del memoryreport._TRACEMALLOC[:]
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(memory_report.stage_bytes().keys(),
+                         ['parsing', 'instantiation'])
+
+    def test_qt_objects_are_counted_by_class(self):
+        memory_report = BuildMemoryReport()
+        self._build(memory_report, _INPUT + _more_labels(3))
+        self.assertEqual(memory_report.qt_object_counts(), {
+            'QWidget': 1, 'QVBoxLayout': 1, 'QLabel': 5})
+
+    def test_error_string_is_measured_when_parsing_fails(self):
+        memory_report = BuildMemoryReport()
+        one_big_string = """
+            page QWidget
+             layout QVBoxLayout
+        """
+        memory_report.parsing_started(one_big_string)
+        try:
+            InputParser.parse(one_big_string, 'unit test')
+        except LayoutError as e:
+            memory_report.build_failed(e)
+        self.assertGreater(memory_report.kept_bytes()['error strings'],
+                           len('Indentation spaces must be a multiple of 2'))
+
+    def test_report_falls_back_when_there_is_no_tracemalloc(self):
+        memoryreport._TRACEMALLOC[:] = [None]
+        try:
+            memory_report = BuildMemoryReport()
+            self._build(memory_report, _INPUT)
+        finally:
+            del memoryreport._TRACEMALLOC[:]
+        report = memory_report.report()
+        self.assertEqual(memory_report.stage_bytes(), {})
+        self.assertIn('tracemalloc is not available', report)
+        self.assertIn('parsed records', report)
+        self.assertIn('  QLabel       2', report)
+
+
+_THING_CLASSES = {}  # Subclasses of Thing, keyed on the type word.
+
+_INPUT = """
+    page        QWidget
+      layout    QVBoxLayout
+        a       QLabel(a)
+        b       QLabel(b)
+"""
+
+
+def _more_labels(count):
+    return ''.join('        label_%d QLabel(label %d)\n' % (i, i)
+                   for i in range(count))
@@ -1,3 +1,5 @@
+import gc
+import weakref
 from unittest import TestCase
 
 from qtlayoutbuilder.lib.objectfinder import ObjectFinder
@@ -53,3 +55,121 @@ class TestObjectFinder(TestCase):
         finder = ObjectFinder([Banana, ])
         found = finder.find_objects('my_banana')
         self.assertEquals(len(found), 3)
+
+    # noinspection PyUnusedLocal
+    def test_snapshot_is_reused_until_refreshed(self):
+        first_banana = Banana()
+        finder = ObjectFinder([Banana, ])
+        self.assertFalse(finder.has_snapshot())
+        self.assertEquals(len(finder.find_objects('first_banana')), 1)
+        self.assertTrue(finder.has_snapshot())
+
+        # An object made after the snapshot is not seen until refresh().
+        second_banana = Banana()
+        self.assertEquals(len(finder.find_objects('second_banana')), 0)
+        finder.refresh()
+        self.assertEquals(len(finder.find_objects('second_banana')), 1)
+
+    # noinspection PyUnusedLocal
+    def test_catch_up_adds_only_objects_made_since_the_snapshot(self):
+        has_banana = HasABanana()
+        finder = ObjectFinder([Banana, ])
+        self.assertEquals(len(finder.find_objects('my_banana')), 1)
+        self.assertEquals(finder.catch_up(), 0)
+
+        another = HasABanana()
+        self.assertEquals(finder.catch_up(), 1)
+        found = finder.find_objects('my_banana')
+        self.assertEquals(len(found), 2)
+        self.assertTrue(another.my_banana in found)
+
+    def test_snapshot_does_not_keep_objects_alive(self):
+        # Use an attribute rather than a local variable, because the search
+        # itself leaves a snapshot of this frame's locals behind.
+        has_banana = HasABanana()
+        finder = ObjectFinder([Banana, ])
+        self.assertEquals(len(finder.find_objects('my_banana')), 1)
+        banana_ref = weakref.ref(has_banana.my_banana)
+        has_banana.my_banana = None
+        gc.collect()
+        self.assertTrue(banana_ref() is None)
+
+    # noinspection PyUnusedLocal
+    def test_search_without_collecting_garbage(self):
+        # Uncollected garbage from earlier tests would be found otherwise.
+        gc.collect()
+        my_banana = Banana()
+        finder = ObjectFinder([Banana, ], collect_garbage=False)
+        found = finder.find_objects('my_banana')
+        self.assertEquals(len(found), 1)
+
+    # noinspection PyUnusedLocal
+    def test_search_restricted_to_roots(self):
+        near = HasABanana()
+        far = HasABanana()
+        finder = ObjectFinder([Banana, ], roots=(near,))
+        found = finder.find_objects('my_banana')
+        self.assertEquals(len(found), 1)
+        self.assertTrue(found[0] is near.my_banana)
+
+    # noinspection PyUnusedLocal
+    def test_object_referenced_from_many_containers_is_found_once(self):
+        my_banana = Banana()
+        containers = [[my_banana] for _ in range(10)]
+        finder = ObjectFinder([Banana, ])
+        found = finder.find_objects('my_banana')
+        self.assertEquals(len(found), 1)
+
+    # noinspection PyUnusedLocal
+    def test_dead_weak_proxy_on_the_heap_does_not_stop_the_search(self):
+        gone = HasABanana()
+        dead_proxies = [weakref.proxy(gone)]
+        del gone
+        my_banana = Banana()
+        finder = ObjectFinder([Banana, ])
+        found = finder.find_objects('my_banana')
+        self.assertEquals(len(found), 1)
+        self.assertTrue(found[0] is my_banana)
+
+    # noinspection PyUnusedLocal
+    def test_dead_weak_proxy_in_callers_does_not_stop_the_search(self):
+        gone = HasABanana()
+        dead_proxy = weakref.proxy(gone)
+        del gone
+        my_banana = Banana()
+        finder = ObjectFinder([Banana, ])
+        found = _search_in_callers(finder, 'my_banana', depth=2)
+        self.assertEquals(len(found), 1)
+
+    # noinspection PyUnusedLocal
+    def test_search_in_callers_finds_locals_and_their_attributes(self):
+        my_banana = Banana()
+        has_banana = HasABanana()
+        finder = ObjectFinder([Banana, ])
+        found = _search_in_callers(finder, 'my_banana', depth=2)
+        self.assertEquals(len(found), 2)
+        self.assertTrue(found[0] is my_banana)
+        self.assertTrue(found[1] is has_banana.my_banana)
+        self.assertFalse(finder.has_snapshot())
+
+    # noinspection PyUnusedLocal
+    def test_search_in_callers_is_limited_to_depth(self):
+        my_banana = Banana()
+        finder = ObjectFinder([Banana, ])
+        self.assertEquals(
+            len(_search_in_callers(finder, 'my_banana', depth=1)), 0)
+
+    # noinspection PyUnusedLocal
+    def test_search_in_callers_steps_over_skipped_modules(self):
+        my_banana = Banana()
+        finder = ObjectFinder([Banana, ])
+        found = _search_in_callers(finder, 'my_banana', depth=1,
+                                   skip_modules=(__name__,))
+        self.assertEquals(len(found), 0)
+
+
+def _search_in_callers(finder, name, depth, skip_modules=()):
+    # One calling function further away from the test than the search.
+    # noinspection PyUnusedLocal
+    my_banana = 'not a banana'
+    return finder.find_objects_in_callers(name, depth, skip_modules)
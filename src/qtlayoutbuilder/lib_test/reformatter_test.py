@@ -22,3 +22,17 @@ class TestReformatter(TestCase):
                 label      QLabel(hello)
         """)
         self.assertEqual(output_for_comparison, expected)
+
+    def test_positions_and_item_lists_are_kept(self):
+        str_input = """
+            grid         QGridLayout
+              colours QComboBox[0,1]{Red (R)|Dark green}
+        """
+        output = ReFormatter.format(str_input)
+        output_for_comparison = MultilineString.get_as_left_shifted_lines(
+            output)
+        expected = MultilineString.get_as_left_shifted_lines("""
+            grid           QGridLayout
+              colours      QComboBox[0,1]{Red (R)|Dark green}
+        """)
+        self.assertEqual(output_for_comparison, expected)
@@ -0,0 +1,152 @@
+from unittest import TestCase
+from xml.etree import ElementTree
+
+from qtlayoutbuilder.lib.inputparser import InputParser
+from qtlayoutbuilder.lib.uiexporter import UiExporter
+from qtlayoutbuilder.lib_test.test_utils import \
+    raises_layout_error_with_this_message
+
+
+class TestUiExporter(TestCase):
+
+    def test_layouts_widgets_and_spacers(self):
+        ui = _export("""
+            page            QWidget
+              layout        QHBoxLayout
+                label       QLabel(hello)
+                stretch     QSpacerItem
+                box         QGroupBox(title)
+                  inner     QVBoxLayout
+        """)
+        page = ui.find('widget')
+        self.assertEqual(page.get('class'), 'QWidget')
+        layout = page.find('layout')
+        self.assertEqual(layout.get('name'), 'layout')
+        items = [item[0] for item in layout.findall('item')]
+        self.assertEqual([(item.tag, item.get('name')) for item in items],
+                         [('widget', 'label'), ('spacer', 'stretch'),
+                          ('widget', 'box')])
+        self.assertEqual(
+            items[0].find("property[@name='text']/string").text, 'hello')
+        self.assertEqual(
+            items[1].find("property[@name='orientation']/enum").text,
+            'Qt::Horizontal')
+        self.assertEqual(
+            items[2].find("property[@name='title']/string").text, 'title')
+        self.assertEqual(items[2].find('layout').get('name'), 'inner')
+
+    def test_tab_pages_are_titled_like_the_builder_does(self):
+        ui = _export("""
+            tabs         QTabWidget
+              a          QWidget
+              b          QWidget
+        """)
+        titles = [page.find("attribute[@name='title']/string").text
+                  for page in ui.find('widget').findall('widget')]
+        self.assertEqual(titles, ['tab_1', 'tab_2'])
+
+    def test_scroll_area_is_made_widget_resizable(self):
+        ui = _export("""
+            scroller     QScrollArea
+              content    QWidget
+        """)
+        scroller = ui.find('widget')
+        self.assertEqual(
+            scroller.find("property[@name='widgetResizable']/bool").text,
+            'true')
+        self.assertEqual(scroller.find('widget').get('name'), 'content')
+
+    def test_grid_and_form_items_have_positions(self):
+        ui = _export("""
+            page            QWidget
+              layout        QVBoxLayout
+                grid        QGridLayout
+                  a         QLabel[0,0]
+                  b         QLabel[1,0,2,3]
+                form        QFormLayout
+                  c         QLabel[0,1]
+                  d         QLabel[1,0,1,2]
+        """)
+        items = ui.findall(".//layout[@name='grid']/item") + \
+            ui.findall(".//layout[@name='form']/item")
+        self.assertEqual([item.attrib for item in items], [
+            {'row': '0', 'column': '0'},
+            {'row': '1', 'column': '0', 'rowspan': '2', 'colspan': '3'},
+            {'row': '0', 'column': '1'},
+            {'row': '1', 'column': '0', 'colspan': '2'},
+        ])
+
+    def test_item_lists_become_items(self):
+        ui = _export("""
+            page            QWidget
+              layout        QVBoxLayout
+                colours     QComboBox{red|green}
+        """)
+        combo = ui.find(".//widget[@name='colours']")
+        self.assertEqual(
+            [item.find("property[@name='text']/string").text
+             for item in combo.findall('item')], ['red', 'green'])
+
+    def test_items_are_read_as_the_builder_gives_them_to_qt(self):
+        ui = _export("""
+            page            QWidget
+              layout        QVBoxLayout
+                drinks      QComboBox{caf\xe9|tea}
+        """)
+        combo = ui.find(".//widget[@name='drinks']")
+        self.assertEqual(
+            [item.find("property[@name='text']/string").text
+             for item in combo.findall('item')], [u'caf\xe9', u'tea'])
+
+    def test_text_is_read_as_the_builder_gives_it_to_qt(self):
+        # Plain text is Latin-1, as is text with an escape in it.
+        ui = _export("""
+            page            QWidget
+              layout        QVBoxLayout
+                plain       QLabel(caf\xe9)
+                escaped     QLabel(caf\\u00e9)
+        """)
+        for name in ('plain', 'escaped'):
+            label = ui.find(".//widget[@name='%s']" % name)
+            self.assertEqual(
+                label.find("property[@name='text']/string").text, u'caf\xe9')
+
+    def test_error_message_when_grid_item_has_no_position(self):
+        self.assertTrue(raises_layout_error_with_this_message("""
+            The children of a <QGridLayout> must have a position in square
+            brackets, like this: [row,column], to be exported to a .ui
+            file.
+            (This line: <    a       QLabel>)
+            (Line number: 3, from unit test provenance)
+        """, _export, """
+            page      QWidget
+              grid    QGridLayout
+                a       QLabel
+        """))
+
+    def test_error_message_when_more_than_one_top_level_item(self):
+        self.assertTrue(raises_layout_error_with_this_message("""
+            A .ui file can describe only one top level item, so
+            this cannot be exported.
+            (This line: <page2      QWidget>)
+            (Line number: 2, from unit test provenance)
+        """, _export, """
+            page1      QWidget
+            page2      QWidget
+        """))
+
+    def test_error_message_when_existing_objects_are_cited(self):
+        self.assertTrue(raises_layout_error_with_this_message("""
+            Objects cited with ?Type exist only in a running program,
+            so cannot be exported to a .ui file.
+            (This line: <page      ?QWidget>)
+            (Line number: 1, from unit test provenance)
+        """, _export, """
+            page      ?QWidget
+        """))
+
+
+def _export(str_input):
+    parsed_lines = InputParser.parse(str_input, 'unit test provenance')
+    return ElementTree.fromstring(
+        UiExporter.export(parsed_lines, 'unit test provenance'))
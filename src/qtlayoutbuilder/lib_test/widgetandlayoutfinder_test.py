@@ -45,3 +45,43 @@ class TestWidgetAndLayoutFinder(TestCase):
         self.assertEquals(len(found), 1)
         found_object = found[0]
         self.assertEquals(found_object, target_b.fibble)
+
+    # noinspection PyUnusedLocal
+    def test_reused_finder_sees_objects_made_after_first_search(self):
+        target_a = HasLabel()
+        finder = WidgetAndLayoutFinder()
+        self.assertEquals(len(finder.find('QLabel', 'fibble')), 1)
+
+        # The snapshot taken by the first search does not include this one,
+        # so it is added to it before the first search of the next build.
+        later_label = QLabel()
+        finder.build_started()
+        found = finder.find('QLabel', 'later_label')
+        self.assertEquals(len(found), 1)
+        self.assertEquals(found[0], later_label)
+
+    # noinspection PyUnusedLocal
+    def test_object_made_since_the_snapshot_makes_a_hit_ambiguous(self):
+        first = HasLabel()
+        finder = WidgetAndLayoutFinder(caller_depth=0)
+        self.assertEquals(len(finder.find('QLabel', 'fibble')), 1)
+
+        # Found in the snapshot, but the new one must be seen too.
+        second = HasLabel()
+        finder.build_started()
+        found = finder.find('QLabel', 'fibble')
+        self.assertEquals(len(found), 2)
+        self.assertTrue(second.fibble in found)
+
+    # noinspection PyUnusedLocal
+    def test_snapshot_is_caught_up_once_per_build(self):
+        first = HasLabel()
+        finder = WidgetAndLayoutFinder(caller_depth=0)
+        finder.build_started()
+        self.assertEquals(len(finder.find('QLabel', 'fibble')), 1)
+
+        # Not seen until the next build, because catching up scans the heap.
+        second = HasLabel()
+        self.assertEquals(len(finder.find('QLabel', 'fibble')), 1)
+        finder.build_started()
+        self.assertEquals(len(finder.find('QLabel', 'fibble')), 2)
@@ -0,0 +1,254 @@
+"""
+Benchmarks for the performance sensitive parts of the builder.
+
+Each benchmark prints its own timings. They are not unit tests - they make no
+assertions - but running them before and after a change shows whether the
+change helped.
+
+Usage: python benchmarks.py [benchmark_name ...]
+(Runs all the benchmarks when none are named.)
+"""
+import gc
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from qtlayoutbuilder.lib.objectfinder import ObjectFinder
+
+
+def object_finder_scanning_modes():
+    """
+    Compares the time the first ObjectFinder search takes in each of its
+    scanning modes, and a search of only the calling functions, in the
+    presence of a big heap of unrelated objects (like an application that
+    has a lot of numpy or pandas data loaded).
+    """
+    big_heap = _make_big_heap()
+    holder = _Holder()
+    holder.my_target = _Target()
+    modes = (
+        ('full collection and scan', {}),
+        ('no collection', dict(collect_garbage=False)),
+        ('no collection, from roots',
+         dict(collect_garbage=False, roots=(holder,))),
+    )
+    _report('the forced collection alone', _best_of(gc.collect))
+    for description, options in modes:
+        seconds = _best_of(lambda: ObjectFinder(
+            [_Target], **options).find_objects('my_target'))
+        _report(description, seconds)
+    _report('calling functions only (depth 5)', _best_of(
+        lambda: ObjectFinder([_Target]).find_objects_in_callers(
+            'my_target', 5)))
+    del big_heap
+
+
+def text_versus_compiled_input():
+    """
+    Compares the time taken to read and parse a big input file, with the time
+    taken to open its compiled form and decode every record from it. (Both
+    without building anything.)
+    """
+    from qtlayoutbuilder.api.build import compile_file
+    from qtlayoutbuilder.lib import file_utils
+    from qtlayoutbuilder.lib.compiledlayout import CompiledLayout
+    from qtlayoutbuilder.lib.inputparser import InputParser
+    tmp_dir = tempfile.mkdtemp()
+    file_path = os.path.join(tmp_dir, 'form.txt')
+    with open(file_path, 'w') as input_file:
+        input_file.write(_make_form_input('form', 'QWidget', rows=5000))
+    compile_file(file_path)
+
+    def read_and_parse():
+        InputParser.parse(
+            file_utils.get_file_contents_as_a_string(file_path), file_path)
+
+    def open_and_decode():
+        with CompiledLayout.open_if_fresh(file_path) as compiled:
+            for _ in compiled:
+                pass
+
+    _report('read and parse text', _best_of(read_and_parse))
+    _report('open and decode compiled', _best_of(open_and_decode))
+    shutil.rmtree(tmp_dir)
+
+
+def builder_versus_ui_loader():
+    """
+    Compares building a big form with the builder, with loading the same form
+    from its exported .ui document with QUiLoader. (The export is done once,
+    outside of the timing, as it would be in a packaging step.)
+    """
+    from qtlayoutbuilder.api.build import build_from_multi_line_string
+    from qtlayoutbuilder.api.uifile import build_from_ui_string, \
+        export_ui_from_multi_line_string
+    _make_application()
+    form = _make_form_input('form', 'QWidget', rows=2000)
+    ui_document = export_ui_from_multi_line_string(form)
+    _report('build with the builder',
+            _best_of(lambda: build_from_multi_line_string(form)))
+    _report('load .ui with QUiLoader',
+            _best_of(lambda: build_from_ui_string(ui_document)))
+
+
+def time_to_first_show():
+    """
+    Times building a big form and then showing it, including processing the
+    events that the show generates. Both into a new top level widget, and
+    into an existing widget that is already visible (the case that suffers
+    a relayout and repaint for every child added).
+    """
+    from PySide.QtGui import QWidget
+    from qtlayoutbuilder.api.build import build_from_multi_line_string
+    app = _make_application()
+    new_form = _make_form_input('form', 'QWidget')
+
+    def build_and_show():
+        layouts = build_from_multi_line_string(new_form)
+        page = layouts.at('form')
+        page.show()
+        app.processEvents()
+        page.hide()
+
+    _report('build new form, show', _best_of(build_and_show))
+
+    # noinspection PyUnusedLocal
+    def build_into_visible_widget():
+        existing_page = QWidget()
+        existing_page.show()
+        app.processEvents()
+        build_from_multi_line_string(
+            _make_form_input('existing_page', '?QWidget'))
+        app.processEvents()
+        existing_page.hide()
+
+    _report('build into visible widget', _best_of(build_into_visible_widget))
+
+
+def build_and_dispose_soak(cycles=10000, reports=10):
+    """
+    Builds a small dialog and disposes of it, over and over, as an
+    application that reopens a builder-made dialog would, and reports the
+    resident memory of the process as it goes. It should level off quickly,
+    rather than creep up.
+    """
+    from PySide.QtCore import QCoreApplication, QEvent
+    from qtlayoutbuilder.api.build import build_from_multi_line_string
+    _make_application()
+    dialog = _make_form_input('dialog', 'QWidget', rows=10)
+    for cycle in range(1, cycles + 1):
+        with build_from_multi_line_string(dialog) as layouts:
+            layouts.at('dialog')
+        # What the event loop would do on its next iteration.
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        if cycle % (cycles // reports) == 0:
+            gc.collect()
+            print '%-50s %10.1f MB' % ('resident after %d cycles' % cycle,
+                                       _resident_megabytes())
+
+
+def import_time():
+    """
+    Times starting a fresh interpreter that imports parts of the builder,
+    compared with one that imports nothing, and one that imports QtGui. None
+    of the builder's modules should pay for QtGui until a build needs it.
+    """
+    statements = (
+        ('interpreter start up alone', 'pass'),
+        ('import qtlayoutbuilder.api.build',
+         'import qtlayoutbuilder.api.build'),
+        ('import qtlayoutbuilder.lib.reformatter',
+         'import qtlayoutbuilder.lib.reformatter'),
+        ('import PySide.QtGui', 'import PySide.QtGui'),
+    )
+    for description, statement in statements:
+        seconds = _best_of(lambda: subprocess.check_call(
+            [sys.executable, '-c', statement]), repeat=5)
+        _report(description, seconds)
+
+
+# -----------------------------------------------------------------------------
+# Helpers.
+
+class _Target(object):
+    pass
+
+
+class _Holder(object):
+    pass
+
+
+def _make_big_heap():
+    # Many small containers, all of which the garbage collector tracks.
+    return [[i] for i in range(300000)]
+
+
+def _make_application():
+    # No window system is needed where the Qt bindings have the offscreen
+    # platform plugin (Qt 5 onwards). Elsewhere the variable is ignored.
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide.QtGui import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def _make_form_input(top_name, top_type, rows=500):
+    # A top level container holding many rows of label and line edit pairs.
+    lines = [
+        '%s    %s' % (top_name, top_type),
+        '  form_layout    QVBoxLayout',
+    ]
+    for row in range(rows):
+        lines.append('    row_%d    QHBoxLayout' % row)
+        lines.append('      label_%d    QLabel(Label %d)' % (row, row))
+        lines.append('      edit_%d    QLineEdit(Value %d)' % (row, row))
+    return '\n'.join(lines)
+
+
+def _resident_megabytes():
+    # The current resident set size where /proc has it (Linux), and otherwise
+    # the peak, which is the best the resource module can do.
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 1048576.0
+    except EnvironmentError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # In kilobytes, except on Mac OS X, where it is in bytes.
+        if sys.platform == 'darwin':
+            return peak / 1048576.0
+        return peak / 1024.0
+
+
+def _best_of(callable_to_time, repeat=3):
+    # Garbage left over by one repetition is collected before the next
+    # starts (outside of the timing), so that each starts from the same heap.
+    return min(timeit.repeat(callable_to_time, setup=gc.collect, number=1,
+                             repeat=repeat))
+
+
+def _report(description, seconds):
+    print '%-50s %10.1f ms' % (description, seconds * 1000)
+
+
+_BENCHMARKS = (
+    import_time,
+    object_finder_scanning_modes,
+    text_versus_compiled_input,
+    builder_versus_ui_loader,
+    time_to_first_show,
+    build_and_dispose_soak,
+)
+
+
+if __name__ == '__main__':
+    requested = sys.argv[1:]
+    for benchmark in _BENCHMARKS:
+        if requested and benchmark.__name__ not in requested:
+            continue
+        print '\n%s' % benchmark.__name__
+        benchmark()
+        gc.collect()
@@ -0,0 +1,25 @@
+"""
+Compiles the builder's input files into its binary format, (see
+qtlayoutbuilder.api.build.compile_file), for example as a packaging step.
+
+Usage: python compile_layouts.py input_file [input_file ...]
+"""
+import sys
+
+from qtlayoutbuilder.api.build import compile_file
+from qtlayoutbuilder.api.layouterror import LayoutError
+
+
+def main(file_paths):
+    exit_status = 0
+    for file_path in file_paths:
+        try:
+            print 'Compiled: %s' % compile_file(file_path)
+        except LayoutError as e:
+            print 'Failed to compile: %s\n%s' % (file_path, str(e))
+            exit_status = 1
+    return exit_status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
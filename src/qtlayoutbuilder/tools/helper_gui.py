@@ -19,6 +19,7 @@ from qtlayoutbuilder.api.build import build_from_file, \
     build_from_multi_line_string
 from qtlayoutbuilder.api.layouterror import LayoutError
 from qtlayoutbuilder.lib.multiline_string_utils import MultilineString
+from qtlayoutbuilder.lib.widgetandlayoutfinder import WidgetAndLayoutFinder
 
 _ORG = 'PARJI'
 _APP = 'QtLayoutBuilder'
@@ -32,20 +33,21 @@ class HelperGui(QObject):
         self._settings = QSettings(_ORG, _APP)
         self._input_path = self._last_known_input_file()
         self._last_shown_content = None
+        self._last_shown_layouts = None
         self._previous_timestamp = None
         # Client can inject alternatve file chooser.
         self._alt_file_chooser = None
+        # Reused for every build, so that we scan the heap for objects cited
+        # with ?Type only when we have to.
+        self._finder = WidgetAndLayoutFinder()
 
         # Make this GUI
         self._layouts = self._make_gui()
 
         # Capture the GUI items we need to interact with programmatically.
         # (Avoids proliferation of string literals and aids testing).
-        self._main_page = self._layouts.at('main_page')
-        self._format_btn = self._layouts.at('format_btn')
-        self._path_btn = self._layouts.at('path_btn')
-        self._log = self._layouts.at('log')
-        self._path_label = self._layouts.at('path_label')
+        self._layouts.bind_to(self, ('main_page', 'format_btn', 'path_btn',
+                                     'log', 'path_label'))
 
         # Augment this GUI
         self._main_page.setWindowTitle('QtLayoutBuilder Helper GUI')
@@ -109,7 +111,8 @@ class HelperGui(QObject):
 
     def _handle_reformat(self):
         try:
-            build_from_file(self._input_path, auto_format_and_overwrite=True)
+            build_from_file(self._input_path, auto_format_and_overwrite=True,
+                            finder=self._finder)
             # We should provide some confirmation and feedback. The log is
             # not much good because the overwrite stimulates a fresh build
             # which almost immediately replaces any log message we put out
@@ -154,7 +157,8 @@ class HelperGui(QObject):
         try:
             users_layouts = build_from_file(
                     self._input_path,
-                    auto_format_and_overwrite=False)
+                    auto_format_and_overwrite=False,
+                    finder=self._finder)
         except LayoutError as e:
             if 'Cannot read this file' in str(e):
                 self._log.setText(MultilineString.shift_left("""
@@ -169,11 +173,11 @@ class HelperGui(QObject):
         top_item = users_layouts.first_top_level_item()
         # If the top level item in the tree is a widget, we just show it.
         if isinstance(top_item, QWidget):
-            self._show_built_content(top_item)
+            self._show_built_content(top_item, users_layouts)
         # Whereas, if it is a layout we wrap it in a widget so we can show it.
         elif isinstance(top_item, QLayout):
             wrapper = QWidget(top_item)
-            self._show_built_content(wrapper)
+            self._show_built_content(wrapper, users_layouts)
         self._log.setText('Build successful')
 
     def _last_known_input_file(self):
@@ -191,10 +195,16 @@ class HelperGui(QObject):
             self._path_label.setText(
                     '<font color="grey">...%s</font>' % self._input_path[-30:])
 
-    def _show_built_content(self, thing_to_show):
+    def _show_built_content(self, thing_to_show, layouts):
+        # Each build replaces the last, which is destroyed rather than just
+        # hidden, so that rebuilding all day long does not use up memory.
         if self._last_shown_content is not None:
             self._last_shown_content.hide()
+            self._last_shown_layouts.dispose()
+            # In case it is a wrapper, which is not part of the layouts.
+            self._last_shown_content.deleteLater()
         self._last_shown_content = thing_to_show
+        self._last_shown_layouts = layouts
         # Always stick it top left to make it easier for the user to know
         # where to put this gui, such that they can see both this one and the
         # built one.